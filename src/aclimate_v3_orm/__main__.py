@@ -1,13 +1,65 @@
+import argparse
+from typing import List, Optional
 from .database.base import Base, create_tables
-from .database import engine, get_db
-from .models import *
-from .services import *
-from .schemas import *
+from .database import get_db
 from .migrations import upgrade, downgrade, current
+from . import database, models, services, schemas
 
-def main():
+
+def __getattr__(name: str):
+    """engine, models, services and schemas are resolved on first access"""
+    if name == "engine":
+        return database.get_engine()
+    for package in (models, services, schemas):
+        if name in package.__all__:
+            return getattr(package, name)
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog="python -m aclimate_v3_orm")
+    commands = parser.add_subparsers(dest="command")
+    rebuild = commands.add_parser(
+        "rebuild-availability",
+        help="Rebuild climate_data_availability from the daily and monthly tables"
+    )
+    rebuild.add_argument("--temporality", choices=["daily", "monthly"], help="Only this table (default: both)")
+    rebuild.add_argument("--location-id", type=int, action="append", dest="location_ids",
+                         help="Only this location (repeatable)")
+    plans = commands.add_parser(
+        "check-plans",
+        help="Explain the service queries against the configured database and fail on plan regressions"
+    )
+    plans.add_argument("--baseline", required=True, help="JSON file with the expected plans")
+    plans.add_argument("--update-baseline", action="store_true", help="Store the current plans as the baseline")
+    plans.add_argument("--large-table-rows", type=int, default=None,
+                       help="Row count from which a sequential scan fails (default: 10000)")
+    plans.add_argument("--no-analyze", action="store_false", dest="analyze",
+                       help="Plan without running the queries (PostgreSQL)")
+    args = parser.parse_args(argv)
+
+    if args.command == "rebuild-availability":
+        from .enums import Period
+        from .services import ClimateDataAvailabilityService
+        temporality = Period(args.temporality) if args.temporality else None
+        count = ClimateDataAvailabilityService().rebuild(temporality, args.location_ids)
+        print(f"✅ Rebuilt {count} availability series.")
+        return
+    if args.command == "check-plans":
+        from .migrations.plan_check import LARGE_TABLE_ROWS, check_plans
+        with get_db() as session:
+            report = check_plans(
+                session, args.baseline, analyze=args.analyze, update_baseline=args.update_baseline,
+                large_table_rows=args.large_table_rows or LARGE_TABLE_ROWS
+            )
+        for name in report["new_queries"]:
+            print(f"ℹ️ {name}: not in the baseline")
+        for failure in report["failures"]:
+            print(f"❌ {failure}")
+        if report["failures"]:
+            raise SystemExit(1)
+        print(f"✅ Checked {sum(not plan['skipped'] for plan in report['plans'].values())} query plans.")
+        return
     print("ORM Installed")
 
 if __name__ == "__main__":
     main()
-
@@ -0,0 +1,3 @@
+from .ttl_cache import TTLCache
+from .single_flight import SingleFlight, single_flight
+from .result_cache import CacheBackend, LRUBackend, ResultCache, cached_read
@@ -0,0 +1,180 @@
+"""
+Versioned cache of service read results.
+
+Entries are keyed by (table, method, arguments, table generation, location generation).
+A write bumps the generation of the locations it touched, so their old entries are never
+read again and age out of the backend; nothing has to be found and deleted. Values are
+pickled, which gives every caller its own copy and lets backends store plain bytes.
+"""
+import functools
+import inspect
+import pickle
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional
+
+_MISSING = object()
+
+
+class CacheBackend(ABC):
+    """
+    Storage of a ResultCache. Implement it over Redis, memcached, etc. to share results
+    between processes; LRUBackend is the in-process implementation.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """Stored value, or None"""
+
+    @abstractmethod
+    def set(self, key: str, value: bytes):
+        """Store a value; the backend may evict it at any time"""
+
+    @abstractmethod
+    def counter(self, key: str) -> int:
+        """Current value of a counter (0 if never incremented)"""
+
+    @abstractmethod
+    def incr(self, key: str) -> int:
+        """Atomically increment a counter and return its new value. Counters must not be evicted."""
+
+    @abstractmethod
+    def clear(self):
+        """Drop every value and counter"""
+
+
+class LRUBackend(CacheBackend):
+    """
+    In-process backend that evicts the least recently used values once their total
+    size (keys plus pickled values) exceeds max_bytes. Counters are kept apart and never evicted.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._values: "OrderedDict[str, bytes]" = OrderedDict()
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            value = self._values.get(key)
+            if value is not None:
+                self._values.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes):
+        entry_size = len(key) + len(value)
+        with self._lock:
+            old = self._values.pop(key, None)
+            if old is not None:
+                self.size -= len(key) + len(old)
+            if entry_size > self.max_bytes:
+                return
+            while self._values and self.size + entry_size > self.max_bytes:
+                evicted_key, evicted = self._values.popitem(last=False)
+                self.size -= len(evicted_key) + len(evicted)
+            self._values[key] = value
+            self.size += entry_size
+
+    def counter(self, key: str) -> int:
+        with self._lock:
+            return self._counters.get(key, 0)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+            self._counters.clear()
+            self.size = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._values)
+
+
+class ResultCache:
+    """
+    Read results versioned by table and location generations.
+
+    Example:
+        cache = ResultCache(LRUBackend(max_bytes=128 * 1024 * 1024))
+        value = cache.get_or_load("climate_historical_daily", "get_by_location_id", (1,), 1, load)
+        cache.invalidate("climate_historical_daily", [1])   # next call runs load() again
+    """
+
+    def __init__(self, backend: Optional[CacheBackend] = None, namespace: str = "aclimate"):
+        self.backend = backend or LRUBackend()
+        self.namespace = namespace
+        self.hits = 0
+        self.misses = 0
+
+    def _generation_key(self, table: str, location_id: Any = None) -> str:
+        suffix = "" if location_id is None else f":{location_id}"
+        return f"{self.namespace}:generation:{table}{suffix}"
+
+    def key(self, table: str, method: str, arguments: Any, location_id: Any = None) -> str:
+        """Backend key of a call under the current generations"""
+        generation = self.backend.counter(self._generation_key(table))
+        location_generation = self.backend.counter(self._generation_key(table, location_id)) if location_id is not None else 0
+        return f"{self.namespace}:{table}:{method}:{arguments!r}:{generation}:{location_generation}"
+
+    def get_or_load(self, table: str, method: str, arguments: Any, location_id: Any, loader: Callable[[], Any]) -> Any:
+        """Cached result of a call, calling loader() and storing its result on a miss"""
+        key = self.key(table, method, arguments, location_id)
+        stored = self.backend.get(key)
+        if stored is not None:
+            self.hits += 1
+            return pickle.loads(stored)
+        self.misses += 1
+        value = loader()
+        self.backend.set(key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        return value
+
+    def invalidate(self, table: str, location_ids: Optional[Iterable[Any]] = None):
+        """Make the entries of some locations of a table (or, without location_ids, of the whole table) stale"""
+        if location_ids is None:
+            self.backend.incr(self._generation_key(table))
+            return
+        for location_id in set(location_ids):
+            if location_id is not None:
+                self.backend.incr(self._generation_key(table, location_id))
+
+    def clear(self):
+        self.backend.clear()
+        self.hits = self.misses = 0
+
+
+def cached_read(method: Callable) -> Callable:
+    """
+    Decorator for service reads of one location: results are served from the service's
+    result_cache, keyed by the call's arguments and the generation of its location_id argument.
+
+    Calls made with a db session bypass the cache, since they may see uncommitted data of
+    their own transaction; so do services whose result_cache is None.
+    """
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        cache = self.result_cache
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        arguments = dict(bound.arguments)
+        del arguments["self"]
+        if cache is None or arguments.pop("db", None) is not None:
+            return method(self, *args, **kwargs)
+
+        return cache.get_or_load(
+            self.model.__tablename__, method.__name__, tuple(arguments.items()),
+            arguments.get("location_id"), lambda: method(self, *args, **kwargs)
+        )
+
+    return wrapper
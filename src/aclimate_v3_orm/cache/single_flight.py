@@ -0,0 +1,121 @@
+"""
+Single-flight calls: concurrent identical calls share one execution and its result.
+"""
+import copy
+import functools
+import inspect
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+from .ttl_cache import TTLCache
+
+_MISSING = object()
+
+
+class _Call:
+    """One execution in flight, awaited by the callers that arrived while it ran"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time. Callers arriving while the call for their key
+    is running wait for it and receive its result (or its exception) instead of running again.
+    Nothing is kept once the call returns; pair it with a TTLCache to reuse results.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Result of fn(), shared with every concurrent caller of the same key"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def in_flight(self) -> int:
+        """Number of keys with a running call"""
+        with self._lock:
+            return len(self._calls)
+
+
+def single_flight(ttl: Optional[float] = None, maxsize: Optional[int] = 1024, copy_result: bool = True):
+    """
+    Decorator for service read methods: concurrent calls with the same arguments run one query.
+
+    Calls made with a db session are never shared, since they may see uncommitted data of
+    their own transaction. Calls with unhashable arguments run normally.
+
+    Args:
+        ttl: Also keep results for ttl seconds in a TTLCache (None: only share in-flight calls)
+        maxsize: Entries of the TTL cache
+        copy_result: Give each caller a deep copy, so callers cannot change each other's result
+
+    The wrapper exposes .flight (SingleFlight) and .cache (TTLCache or None), e.g. to clear the
+    cache after a write:
+
+        @single_flight(ttl=30)
+        def get_by_country_id(self, country_id, enabled=True, db=None): ...
+
+        MngLocationService.get_by_country_id.cache.clear()
+    """
+    def decorate(method: Callable) -> Callable:
+        signature = inspect.signature(method)
+        flight = SingleFlight()
+        cache = TTLCache(ttl=ttl, maxsize=maxsize) if ttl else None
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            del arguments["self"]
+            if arguments.pop("db", None) is not None:
+                return method(self, *args, **kwargs)
+
+            key = (type(self), tuple(arguments.items()))
+            try:
+                hash(key)
+            except TypeError:
+                return method(self, *args, **kwargs)
+
+            def load():
+                # Stored before the flight ends, so late callers find the result in the cache
+                value = method(self, *args, **kwargs)
+                if cache is not None:
+                    cache.set(key, value)
+                return value
+
+            result = cache.get(key, _MISSING) if cache is not None else _MISSING
+            if result is _MISSING:
+                result = flight.do(key, load)
+            return copy.deepcopy(result) if copy_result else result
+
+        wrapper.flight = flight
+        wrapper.cache = cache
+        return wrapper
+
+    return decorate
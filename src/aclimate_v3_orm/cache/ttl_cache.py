@@ -0,0 +1,83 @@
+"""
+Thread-safe in-process cache with per-entry time to live.
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Dict-like cache whose entries expire ttl seconds after being stored.
+
+    When maxsize is reached the oldest entry is evicted. All operations take a lock,
+    so one instance can be shared by the threads of a service. invalidate() and clear()
+    bump a generation, so a get_or_set() load that started before them is not stored.
+    """
+
+    def __init__(self, ttl: float = 300.0, maxsize: Optional[int] = None, timer: Callable[[], float] = time.monotonic):
+        if ttl <= 0:
+            raise ValueError("ttl must be positive")
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._timer = timer
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._generation = 0
+        self._lock = threading.RLock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Value stored for key, or default when missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= self._timer():
+                del self._entries[key]
+                return default
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        """Store a value (None included) for ttl seconds"""
+        with self._lock:
+            self._entries.pop(key, None)
+            if self.maxsize is not None and len(self._entries) >= self.maxsize:
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (self._timer() + self.ttl, value)
+
+    def get_or_set(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Cached value for key, calling loader() and storing its result on a miss.
+        The result is returned but not stored when the cache was invalidated during the load.
+        """
+        with self._lock:
+            value = self.get(key, _MISSING)
+            generation = self._generation
+        if value is _MISSING:
+            value = loader()
+            with self._lock:
+                if generation == self._generation:
+                    self.set(key, value)
+        return value
+
+    def invalidate(self, key: Hashable):
+        """Drop one entry"""
+        with self._lock:
+            self._entries.pop(key, None)
+            self._generation += 1
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        with self._lock:
+            now = self._timer()
+            return sum(1 for expires_at, _ in self._entries.values() if expires_at > now)
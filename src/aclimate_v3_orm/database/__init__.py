@@ -1,24 +1,55 @@
 import os
+import threading
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, Session
-from dotenv import load_dotenv
 from typing import Generator
 from sqlalchemy.exc import SQLAlchemyError
 from contextlib import contextmanager
 
-# Load environment variables
-load_dotenv()
+# Engine and session factory, created on first use so importing the package stays cheap
+_engine = None
+_session_factory = None
+_lock = threading.Lock()
 
-# Database configuration
-DATABASE_URL = os.getenv("DATABASE_URL")
-if not DATABASE_URL:
-    raise ValueError("DATABASE_URL not found in environment variables")
 
-# Create SQLAlchemy engine
-engine = create_engine(DATABASE_URL)
+def get_engine() -> Engine:
+    """
+    SQLAlchemy engine for DATABASE_URL (read from the environment or a .env file).
+    The engine and the SessionLocal factory are created the first time they are needed.
+    """
+    global _engine, _session_factory
+    if _engine is None:
+        with _lock:
+            if _engine is None:
+                from dotenv import load_dotenv
+
+                # Load environment variables
+                load_dotenv()
+
+                # Database configuration
+                database_url = os.getenv("DATABASE_URL")
+                if not database_url:
+                    raise ValueError("DATABASE_URL not found in environment variables")
+
+                # Create SQLAlchemy engine and configure local session factory
+                engine = create_engine(database_url)
+                _session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+                _engine = engine
+    return _engine
+
+
+def __getattr__(name: str):
+    """engine, SessionLocal and DATABASE_URL are resolved on first access"""
+    if name == "engine":
+        return get_engine()
+    if name == "SessionLocal":
+        get_engine()
+        return _session_factory
+    if name == "DATABASE_URL":
+        return get_engine().url.render_as_string(hide_password=False)
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
 
-# Configure local session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 @contextmanager
 def get_db() -> Generator[Session, None, None]:
@@ -32,7 +63,8 @@ def get_db() -> Generator[Session, None, None]:
         with get_db() as db:
             # Your database operations
     """
-    db = SessionLocal()
+    get_engine()
+    db = _session_factory()
     try:
         yield db
         db.commit()
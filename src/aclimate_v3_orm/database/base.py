@@ -1,5 +1,5 @@
 from sqlalchemy.orm import declarative_base
-from . import engine
+from . import get_engine
 
 Base = declarative_base()
 
@@ -12,7 +12,9 @@ def create_tables():
         Exception: If table creation fails, the original exception is re-raised.
     """
     try:
-        Base.metadata.create_all(bind=engine)
+        from .. import models
+        models.import_all()
+        Base.metadata.create_all(bind=get_engine())
         print("✅ Tables created successfully.")
     except Exception as e:
         print(f"❌ Error creating tables: {e}")
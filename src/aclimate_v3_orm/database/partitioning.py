@@ -0,0 +1,146 @@
+"""
+Yearly range partitioning helpers for the large historical tables.
+
+On PostgreSQL, climate_historical_daily and climate_historical_monthly are declared
+PARTITION BY RANGE (date) with one partition per calendar year plus a DEFAULT
+partition that catches rows outside the created years. Queries filtering on date
+only touch the partitions of the requested years (partition pruning).
+On any other dialect these helpers are no-ops and the tables stay regular tables.
+"""
+from datetime import date
+from typing import Iterable, List, Optional
+from sqlalchemy import DDL, PrimaryKeyConstraint, Sequence, Table, event, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.compiler import compiles
+
+PARTITIONED_TABLES = ("climate_historical_daily", "climate_historical_monthly")
+
+
+def partition_name(table_name: str, year: int) -> str:
+    """Name of the partition holding one year of a table"""
+    return f"{table_name}_y{year}"
+
+
+def default_partition_name(table_name: str) -> str:
+    """Name of the partition holding rows outside the yearly partitions"""
+    return f"{table_name}_default"
+
+
+@compiles(PrimaryKeyConstraint, "postgresql")
+def _primary_key_with_partition_key(constraint: PrimaryKeyConstraint, compiler, **kw) -> str:
+    """Append the partition key, which PostgreSQL requires in every unique constraint of a partitioned table"""
+    ddl = compiler.visit_primary_key_constraint(constraint, **kw)
+    partition_key = constraint.table.info.get("partition_key")
+    if not partition_key or partition_key in constraint.columns:
+        return ddl
+    columns = ", ".join(compiler.preparer.quote(column.name) for column in constraint.columns)
+    return ddl.replace(f"({columns})", f"({columns}, {compiler.preparer.quote(partition_key)})", 1)
+
+
+def register_partitioned_table(table: Table, partition_key: str = "date"):
+    """
+    Attach a DEFAULT partition to a partitioned table when it is created through
+    metadata.create_all(), so inserts never fail for years without a partition.
+
+    The model's primary key stays (id), so ids auto-increment on MySQL and SQLite and the
+    ORM identifies rows by id; only the PostgreSQL DDL renders PRIMARY KEY (id, date).
+
+    The id sequence also becomes the server default of id, as in the migrations, so
+    COPY and raw inserts that omit id work on tables created either way. It is set after
+    creation because SQLite (used by the tests) cannot render a sequence default.
+    """
+    table.info["partition_key"] = partition_key
+    event.listen(
+        table,
+        "after_create",
+        DDL(
+            f"CREATE TABLE IF NOT EXISTS {default_partition_name(table.name)} "
+            f"PARTITION OF {table.name} DEFAULT"
+        ).execute_if(dialect="postgresql")
+    )
+    sequence = table.c.id.default
+    if isinstance(sequence, Sequence):
+        event.listen(
+            table,
+            "after_create",
+            DDL(
+                f"ALTER TABLE {table.name} ALTER COLUMN id SET DEFAULT nextval('{sequence.name}')"
+            ).execute_if(dialect="postgresql")
+        )
+
+
+def _existing_partitions(connection: Connection, table_name: str) -> set:
+    rows = connection.execute(text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE parent.relname = :table_name"
+    ), {"table_name": table_name})
+    return {row[0] for row in rows}
+
+
+def create_yearly_partitions(connection: Connection,
+                             start_year: int,
+                             end_year: int,
+                             tables: Iterable[str] = PARTITIONED_TABLES) -> List[str]:
+    """
+    Create the yearly partitions between start_year and end_year (inclusive).
+
+    Rows of those years already stored in the DEFAULT partition are moved into
+    the new partition, since PostgreSQL refuses to attach a range that overlaps
+    rows in the default partition.
+
+    Args:
+        connection: Open connection (the caller controls the transaction)
+        start_year: First year to create
+        end_year: Last year to create
+        tables: Partitioned tables to extend
+
+    Returns:
+        Names of the partitions created (existing ones are skipped)
+    """
+    if connection.dialect.name != "postgresql":
+        return []
+
+    created = []
+    for table_name in tables:
+        existing = _existing_partitions(connection, table_name)
+        default = default_partition_name(table_name)
+        for year in range(start_year, end_year + 1):
+            name = partition_name(table_name, year)
+            if name in existing:
+                continue
+            bounds = {"lower": date(year, 1, 1), "upper": date(year + 1, 1, 1)}
+            pending = 0
+            if default in existing:
+                pending = connection.execute(text(
+                    f"SELECT count(*) FROM {default} WHERE date >= :lower AND date < :upper"
+                ), bounds).scalar()
+
+            if pending:
+                connection.execute(text(f"CREATE TABLE {name} (LIKE {table_name} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+                connection.execute(text(f"INSERT INTO {name} SELECT * FROM {default} WHERE date >= :lower AND date < :upper"), bounds)
+                connection.execute(text(f"DELETE FROM {default} WHERE date >= :lower AND date < :upper"), bounds)
+                connection.execute(text(
+                    f"ALTER TABLE {table_name} ATTACH PARTITION {name} "
+                    f"FOR VALUES FROM ('{bounds['lower']}') TO ('{bounds['upper']}')"
+                ))
+            else:
+                connection.execute(text(
+                    f"CREATE TABLE {name} PARTITION OF {table_name} "
+                    f"FOR VALUES FROM ('{bounds['lower']}') TO ('{bounds['upper']}')"
+                ))
+            created.append(name)
+    return created
+
+
+def ensure_future_partitions(connection: Connection,
+                             years_ahead: int = 1,
+                             from_year: Optional[int] = None,
+                             tables: Iterable[str] = PARTITIONED_TABLES) -> List[str]:
+    """
+    Make sure partitions exist from from_year (default: current year) up to years_ahead years later.
+    Meant to be run periodically (e.g. yearly cron or service startup).
+    """
+    first_year = from_year or date.today().year
+    return create_yearly_partitions(connection, first_year, first_year + years_ahead, tables)
@@ -0,0 +1,4 @@
+from .registry import IndicatorDefinition, IndicatorRegistry, DEFAULT_REGISTRY
+from .engine import IndicatorEngine, SUPPORTED_PERIODS
+from . import kernels
+from .agroclimatic import AgroclimaticEngine, StageWindow, stage_windows
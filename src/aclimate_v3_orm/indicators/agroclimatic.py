@@ -0,0 +1,282 @@
+"""
+Batch computation of agroclimatic indicators per phenological stage.
+
+Each enabled season is expanded into one date window per phenological stage of its
+crop: stages are chained in order_stage order from the planting date, each lasting
+duration_avg_day days. Indicators are evaluated over the daily data of all pending
+windows of a chunk of locations at once and inserted into historical_agroclimatic_indicator.
+
+The computation is incremental: a window is identified by (indicator, location, stage,
+start_date, end_date), so only windows without a stored value are computed. When a
+season's planting date or a stage duration changes, the new windows are computed and
+the rows of the old windows that overlap the season are removed.
+"""
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from ..database import get_db
+from ..models import HistoricalAgroclimaticIndicator, MngPhenologicalStage, MngSeason
+from ..schemas import HistoricalAgroclimaticIndicatorCreate
+from ..services import ClimateHistoricalDailyService, HistoricalAgroclimaticIndicatorService
+from .engine import load_cube, resolve_ids
+from .registry import DEFAULT_REGISTRY, IndicatorDefinition, IndicatorRegistry
+
+StageWindow = namedtuple("StageWindow", ["season_id", "location_id", "stage_id", "start_date", "end_date"])
+
+
+def stage_windows(season_id: int,
+                  location_id: int,
+                  planting_date: date,
+                  stages: Sequence[Tuple[int, Optional[int]]]) -> List[StageWindow]:
+    """
+    Chain stage windows from the planting date.
+
+    Args:
+        stages: (stage_id, duration_avg_day) pairs ordered by order_stage; expansion
+            stops at the first stage without a duration, since later stages cannot be placed
+
+    Returns:
+        One StageWindow per placed stage
+    """
+    windows = []
+    start = planting_date
+    for stage_id, duration in stages:
+        if not duration or duration < 1:
+            break
+        end = start + timedelta(days=duration - 1)
+        windows.append(StageWindow(season_id, location_id, stage_id, start, end))
+        start = end + timedelta(days=1)
+    return windows
+
+
+class AgroclimaticEngine:
+    """
+    Compute registered indicators over the phenological stage windows of seasons.
+
+    Windows are grouped by location in chunks; without an explicit session each chunk
+    runs in a worker thread with its own session.
+    """
+
+    def __init__(self,
+                 registry: Optional[IndicatorRegistry] = None,
+                 chunk_size: int = 100,
+                 max_workers: int = 4):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        self.registry = registry or DEFAULT_REGISTRY
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.daily_service = ClimateHistoricalDailyService()
+        self.agroclimatic_service = HistoricalAgroclimaticIndicatorService()
+
+    @staticmethod
+    def _session(db: Optional[Session]):
+        return nullcontext(db) if db else get_db()
+
+    def run(self,
+            indicators: List[str],
+            season_ids: Optional[List[int]] = None,
+            location_ids: Optional[List[int]] = None,
+            crop_id: Optional[int] = None,
+            force: bool = False,
+            min_coverage: float = 0.0,
+            db: Optional[Session] = None) -> int:
+        """
+        Compute indicators for the stage windows of the selected enabled seasons.
+
+        Args:
+            indicators: Short names of registered indicators (must exist in mng_indicators)
+            season_ids: Optional seasons to process
+            location_ids: Optional locations whose seasons are processed
+            crop_id: Optional crop whose seasons are processed
+            force: Recompute windows that already have a value (e.g. after daily data was corrected)
+            min_coverage: Minimum fraction of days with data for a value to be stored
+            db: Optional database session; when given, chunks run sequentially in it
+
+        Returns:
+            Number of indicator values written
+        """
+        definitions = [self.registry.get(name) for name in indicators]
+
+        with self._session(db) as session:
+            indicator_ids, measure_ids = resolve_ids(definitions, session)
+            windows = self._expand_seasons(session, season_ids, location_ids, crop_id)
+
+        by_location: Dict[int, List[StageWindow]] = {}
+        for window in windows:
+            by_location.setdefault(window.location_id, []).append(window)
+        locations = sorted(by_location)
+        chunks = [
+            [window for location_id in locations[i:i + self.chunk_size] for window in by_location[location_id]]
+            for i in range(0, len(locations), self.chunk_size)
+        ]
+
+        def run_chunk(chunk: List[StageWindow]) -> int:
+            return self._run_chunk(chunk, definitions, indicator_ids, measure_ids, force, min_coverage, db)
+
+        if db is not None or self.max_workers <= 1 or len(chunks) <= 1:
+            return sum(run_chunk(chunk) for chunk in chunks)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return sum(pool.map(run_chunk, chunks))
+
+    @staticmethod
+    def _expand_seasons(session: Session,
+                        season_ids: Optional[List[int]],
+                        location_ids: Optional[List[int]],
+                        crop_id: Optional[int]) -> List[StageWindow]:
+        """Stage windows of the selected enabled seasons"""
+        query = select(MngSeason.id, MngSeason.location_id, MngSeason.crop_id, MngSeason.planting_start).where(MngSeason.enable == True)
+        if season_ids is not None:
+            query = query.where(MngSeason.id.in_(season_ids))
+        if location_ids is not None:
+            query = query.where(MngSeason.location_id.in_(location_ids))
+        if crop_id is not None:
+            query = query.where(MngSeason.crop_id == crop_id)
+        seasons = session.execute(query).all()
+
+        stages: Dict[int, List[Tuple[int, Optional[int]]]] = {}
+        for stage_id, stage_crop_id, duration in session.execute(
+            select(MngPhenologicalStage.id, MngPhenologicalStage.crop_id, MngPhenologicalStage.duration_avg_day)
+            .where(
+                MngPhenologicalStage.crop_id.in_({season.crop_id for season in seasons}),
+                MngPhenologicalStage.enable == True
+            )
+            .order_by(MngPhenologicalStage.crop_id, MngPhenologicalStage.order_stage)
+        ):
+            stages.setdefault(stage_crop_id, []).append((stage_id, duration))
+
+        windows = []
+        for season_id, season_location_id, season_crop_id, planting_start in seasons:
+            windows.extend(stage_windows(season_id, season_location_id, planting_start, stages.get(season_crop_id, [])))
+        return windows
+
+    def _plan(self,
+              session: Session,
+              windows: List[StageWindow],
+              indicator_ids: List[int],
+              force: bool) -> Tuple[Dict[int, List[StageWindow]], List[int]]:
+        """
+        Compare the windows with the stored rows.
+
+        Returns:
+            Pending windows per indicator ID, and IDs of rows to delete: rows of the same
+            location and stage that overlap a processed season but no longer match its window
+            (or every matching row when force)
+        """
+        seasons: Dict[int, Tuple[date, date]] = {}
+        for window in windows:
+            span = seasons.get(window.season_id, (window.start_date, window.end_date))
+            seasons[window.season_id] = (min(span[0], window.start_date), max(span[1], window.end_date))
+        targets: Dict[Tuple[int, int], List[Tuple[date, date, date, date]]] = {}
+        for window in windows:
+            span_start, span_end = seasons[window.season_id]
+            targets.setdefault((window.location_id, window.stage_id), []).append(
+                (span_start, span_end, window.start_date, window.end_date)
+            )
+
+        model = HistoricalAgroclimaticIndicator
+        stored = session.execute(
+            select(model.id, model.indicator_id, model.location_id, model.phenological_id, model.start_date, model.end_date)
+            .where(
+                model.location_id.in_({window.location_id for window in windows}),
+                model.phenological_id.in_({window.stage_id for window in windows}),
+                model.indicator_id.in_(indicator_ids)
+            )
+        ).all()
+
+        done, stale = set(), []
+        for row_id, indicator_id, location_id, stage_id, start_date, end_date in stored:
+            entries = targets.get((location_id, stage_id), [])
+            if any((start_date, end_date) == (window_start, window_end) for _, _, window_start, window_end in entries):
+                if force:
+                    stale.append(row_id)
+                else:
+                    done.add((indicator_id, location_id, stage_id, start_date, end_date))
+            elif any(start_date <= span_end and end_date >= span_start for span_start, span_end, _, _ in entries):
+                stale.append(row_id)
+
+        pending = {
+            indicator_id: [
+                window for window in windows
+                if (indicator_id, window.location_id, window.stage_id, window.start_date, window.end_date) not in done
+            ]
+            for indicator_id in indicator_ids
+        }
+        return pending, stale
+
+    def _run_chunk(self,
+                   windows: List[StageWindow],
+                   definitions: List[IndicatorDefinition],
+                   indicator_ids: Dict[str, int],
+                   measure_ids: Dict[str, int],
+                   force: bool,
+                   min_coverage: float,
+                   db: Optional[Session]) -> int:
+        with self._session(db) as session:
+            pending, stale = self._plan(session, windows, list(indicator_ids.values()), force)
+            todo = {window for group in pending.values() for window in group}
+
+            records = []
+            if todo:
+                origin = min(window.start_date for window in todo)
+                last = max(window.end_date for window in todo)
+                locations = sorted({window.location_id for window in todo})
+                cube = load_cube(self.daily_service, locations, measure_ids, origin, last, session)
+
+                for definition in definitions:
+                    indicator_id = indicator_ids[definition.short_name]
+                    group = pending[indicator_id]
+                    if not group:
+                        continue
+                    inputs, covered = self._gather(cube, definition.measures, group, locations, origin)
+                    values = definition.compute(*inputs)
+                    for window, value, coverage in zip(group, values, covered):
+                        if coverage == 0 or coverage < min_coverage or np.isnan(value):
+                            continue
+                        records.append(HistoricalAgroclimaticIndicatorCreate(
+                            indicator_id=indicator_id,
+                            location_id=window.location_id,
+                            phenological_id=window.stage_id,
+                            value=float(value),
+                            start_date=window.start_date,
+                            end_date=window.end_date
+                        ))
+
+            if stale:
+                session.query(HistoricalAgroclimaticIndicator).filter(
+                    HistoricalAgroclimaticIndicator.id.in_(stale)
+                ).delete(synchronize_session=False)
+            if not records:
+                session.commit()
+                return 0
+            return self.agroclimatic_service.bulk_create(records, db=session)
+
+    @staticmethod
+    def _gather(cube: Dict[str, np.ndarray],
+                measures: Sequence[str],
+                windows: List[StageWindow],
+                locations: List[int],
+                origin: date) -> Tuple[List[np.ndarray], np.ndarray]:
+        """
+        Cut the windows out of the cube as (window x day) arrays padded with NaN to the
+        longest window, plus the fraction of each window's days where every measure has data.
+        """
+        offsets = np.array([(window.start_date - origin).days for window in windows])
+        lengths = np.array([(window.end_date - window.start_date).days + 1 for window in windows])
+        rows = np.searchsorted(np.asarray(locations), [window.location_id for window in windows])
+        width = int(lengths.max())
+        valid = np.arange(width) < lengths[:, None]
+
+        inputs = []
+        observed = valid.copy()
+        for name in measures:
+            days = np.minimum(offsets[:, None] + np.arange(width), cube[name].shape[1] - 1)
+            values = np.where(valid, cube[name][rows[:, None], days], np.nan)
+            observed &= ~np.isnan(values)
+            inputs.append(values)
+        return inputs, observed.sum(axis=1) / lengths
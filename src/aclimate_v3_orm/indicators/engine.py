@@ -0,0 +1,204 @@
+"""
+Batch computation of climate indicators from the daily historical data.
+
+For each chunk of locations the engine loads the daily series of every measure the
+requested indicators need in one column-oriented query, lays them out as dense
+(location x day) NumPy arrays, reduces each period with the indicator kernels and
+writes the results with ClimateHistoricalIndicatorService.bulk_upsert().
+"""
+import calendar
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from ..database import get_db
+from ..enums import Period
+from ..models import MngClimateMeasure, MngIndicator
+from ..schemas import ClimateHistoricalIndicatorCreate
+from ..services import ClimateHistoricalDailyService, ClimateHistoricalIndicatorService
+from .registry import DEFAULT_REGISTRY, IndicatorDefinition, IndicatorRegistry
+
+# Periods the engine can aggregate daily data into
+SUPPORTED_PERIODS = (Period.ANNUAL, Period.MONTHLY)
+
+
+def period_bounds(start_date: date, end_date: date, period: Period) -> Tuple[date, date]:
+    """Widen a date range to whole periods (calendar years or months)"""
+    if period == Period.ANNUAL:
+        return date(start_date.year, 1, 1), date(end_date.year, 12, 31)
+    last_day = calendar.monthrange(end_date.year, end_date.month)[1]
+    return start_date.replace(day=1), end_date.replace(day=last_day)
+
+
+def period_buckets(start_date: date, end_date: date, period: Period) -> List[Tuple[date, date, slice]]:
+    """
+    Split a range of whole periods into (period start, period end, day slice) tuples,
+    where the slice selects the period's days on an axis starting at start_date.
+    """
+    buckets = []
+    bucket_start = start_date
+    while bucket_start <= end_date:
+        if period == Period.ANNUAL:
+            bucket_end = date(bucket_start.year, 12, 31)
+            next_start = date(bucket_start.year + 1, 1, 1)
+        else:
+            bucket_end = bucket_start.replace(day=calendar.monthrange(bucket_start.year, bucket_start.month)[1])
+            next_start = date(bucket_start.year + bucket_start.month // 12, bucket_start.month % 12 + 1, 1)
+        first = (bucket_start - start_date).days
+        buckets.append((bucket_start, bucket_end, slice(first, first + (bucket_end - bucket_start).days + 1)))
+        bucket_start = next_start
+    return buckets
+
+
+def resolve_ids(definitions: List[IndicatorDefinition], session: Session) -> Tuple[Dict[str, int], Dict[str, int]]:
+    """Map the indicator and measure short names used by the definitions to their IDs"""
+    indicator_names = {definition.short_name for definition in definitions}
+    measure_names = {name for definition in definitions for name in definition.measures}
+
+    indicator_ids = dict(session.execute(
+        select(MngIndicator.short_name, MngIndicator.id).where(MngIndicator.short_name.in_(indicator_names))
+    ).all())
+    missing = indicator_names - indicator_ids.keys()
+    if missing:
+        raise ValueError(f"No indicator found with short name {', '.join(sorted(missing))}")
+
+    measure_ids = dict(session.execute(
+        select(MngClimateMeasure.short_name, MngClimateMeasure.id).where(MngClimateMeasure.short_name.in_(measure_names))
+    ).all())
+    missing = measure_names - measure_ids.keys()
+    if missing:
+        raise ValueError(f"No climate measure found with short name {', '.join(sorted(missing))}")
+    return indicator_ids, measure_ids
+
+
+def load_cube(daily_service: ClimateHistoricalDailyService,
+              location_ids: List[int],
+              measure_ids: Dict[str, int],
+              start_date: date,
+              end_date: date,
+              session: Session) -> Dict[str, np.ndarray]:
+    """
+    Daily values per measure short name as (location x day) arrays starting at start_date,
+    NaN where there is no data. location_ids must be sorted.
+    """
+    series = daily_service.get_series(location_ids, list(measure_ids.values()), start_date, end_date, as_numpy=True, db=session)
+    location_axis = np.asarray(location_ids, dtype=np.int64)
+    days = (end_date - start_date).days + 1
+    rows = np.searchsorted(location_axis, series["location_id"])
+    columns = (series["date"].astype("datetime64[D]") - np.datetime64(start_date, "D")).astype(np.int64)
+
+    cube = {}
+    for name, measure_id in measure_ids.items():
+        selected = series["measure_id"] == measure_id
+        values = np.full((len(location_axis), days), np.nan)
+        values[rows[selected], columns[selected]] = series["value"][selected]
+        cube[name] = values
+    return cube
+
+
+class IndicatorEngine:
+    """
+    Compute registered indicators for many locations and store them.
+
+    Locations are processed in chunks; without an explicit session each chunk runs in a
+    worker thread with its own session, so database reads and NumPy reductions overlap.
+    """
+
+    def __init__(self,
+                 registry: Optional[IndicatorRegistry] = None,
+                 chunk_size: int = 100,
+                 max_workers: int = 4):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        self.registry = registry or DEFAULT_REGISTRY
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.daily_service = ClimateHistoricalDailyService()
+        self.indicator_service = ClimateHistoricalIndicatorService()
+
+    @staticmethod
+    def _session(db: Optional[Session]):
+        return nullcontext(db) if db else get_db()
+
+    def run(self,
+            location_ids: List[int],
+            indicators: List[str],
+            start_date: date,
+            end_date: date,
+            period: Period = Period.ANNUAL,
+            min_coverage: float = 0.0,
+            db: Optional[Session] = None) -> int:
+        """
+        Compute indicators for the given locations and upsert the results.
+
+        Args:
+            location_ids: Locations to process
+            indicators: Short names of registered indicators (must exist in mng_indicators)
+            start_date: First day to process (widened to the start of its period)
+            end_date: Last day to process (widened to the end of its period)
+            period: Period.ANNUAL or Period.MONTHLY
+            min_coverage: Minimum fraction of days with data for a value to be stored
+            db: Optional database session; when given, chunks run sequentially in it
+
+        Returns:
+            Number of indicator values written
+        """
+        if period not in SUPPORTED_PERIODS:
+            raise ValueError(f"Unsupported period '{period}', expected one of {', '.join(p.value for p in SUPPORTED_PERIODS)}")
+        if start_date > end_date:
+            raise ValueError("Start date cannot be after end date")
+
+        definitions = [self.registry.get(name) for name in indicators]
+        start_date, end_date = period_bounds(start_date, end_date, period)
+        location_ids = sorted(set(location_ids))
+        chunks = [location_ids[i:i + self.chunk_size] for i in range(0, len(location_ids), self.chunk_size)]
+
+        with self._session(db) as session:
+            indicator_ids, measure_ids = resolve_ids(definitions, session)
+
+        def run_chunk(chunk: List[int]) -> int:
+            return self._run_chunk(chunk, definitions, indicator_ids, measure_ids,
+                                   start_date, end_date, period, min_coverage, db)
+
+        if db is not None or self.max_workers <= 1 or len(chunks) <= 1:
+            return sum(run_chunk(chunk) for chunk in chunks)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return sum(pool.map(run_chunk, chunks))
+
+    def _run_chunk(self,
+                   location_ids: List[int],
+                   definitions: List[IndicatorDefinition],
+                   indicator_ids: Dict[str, int],
+                   measure_ids: Dict[str, int],
+                   start_date: date,
+                   end_date: date,
+                   period: Period,
+                   min_coverage: float,
+                   db: Optional[Session]) -> int:
+        with self._session(db) as session:
+            cube = load_cube(self.daily_service, location_ids, measure_ids, start_date, end_date, session)
+            records = []
+            for definition in definitions:
+                inputs = [cube[name] for name in definition.measures]
+                for bucket_start, bucket_end, days in period_buckets(start_date, end_date, period):
+                    window = [values[:, days] for values in inputs]
+                    # Fraction of days where every input measure has data
+                    coverage = np.mean(~np.any(np.isnan(np.stack(window)), axis=0), axis=-1)
+                    results = definition.compute(*window)
+                    for location_id, value, covered in zip(location_ids, results, coverage):
+                        if covered == 0 or covered < min_coverage or np.isnan(value):
+                            continue
+                        records.append(ClimateHistoricalIndicatorCreate(
+                            indicator_id=indicator_ids[definition.short_name],
+                            location_id=location_id,
+                            value=float(value),
+                            period=period,
+                            start_date=bucket_start,
+                            end_date=bucket_end
+                        ))
+            if not records:
+                return 0
+            return self.indicator_service.bulk_upsert(records, db=session)
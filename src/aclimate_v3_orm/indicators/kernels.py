@@ -0,0 +1,75 @@
+"""
+NumPy kernels for climate indicators.
+
+Every kernel receives 2D float arrays shaped (series, days), one row per location,
+with NaN for missing days, and reduces the day axis to one value per row.
+Missing days never count as matching a condition and break consecutive runs.
+"""
+from typing import Optional
+import numpy as np
+
+
+def total(values: np.ndarray) -> np.ndarray:
+    """Sum of the observed values (e.g. total precipitation)"""
+    return np.nansum(values, axis=-1)
+
+
+def mean(values: np.ndarray) -> np.ndarray:
+    """Mean of the observed values"""
+    observed = np.sum(~np.isnan(values), axis=-1)
+    return np.where(observed > 0, np.nansum(values, axis=-1) / np.maximum(observed, 1), np.nan)
+
+
+def maximum(values: np.ndarray) -> np.ndarray:
+    """Highest observed value (NaN when no day was observed)"""
+    return np.fmax.reduce(values, axis=-1)
+
+
+def minimum(values: np.ndarray) -> np.ndarray:
+    """Lowest observed value (NaN when no day was observed)"""
+    return np.fmin.reduce(values, axis=-1)
+
+
+def count_above(values: np.ndarray, threshold: float, inclusive: bool = False) -> np.ndarray:
+    """Number of days above (or at, when inclusive) a threshold"""
+    mask = values >= threshold if inclusive else values > threshold
+    return np.sum(mask, axis=-1).astype(np.float64)
+
+
+def count_below(values: np.ndarray, threshold: float, inclusive: bool = False) -> np.ndarray:
+    """Number of days below (or at, when inclusive) a threshold"""
+    mask = values <= threshold if inclusive else values < threshold
+    return np.sum(mask, axis=-1).astype(np.float64)
+
+
+def max_consecutive(mask: np.ndarray) -> np.ndarray:
+    """Longest run of True values along the day axis"""
+    mask = np.asarray(mask, dtype=bool)
+    counts = np.cumsum(mask, axis=-1)
+    # Count reached at the last False day before each position
+    resets = np.maximum.accumulate(np.where(mask, 0, counts), axis=-1)
+    return (counts - resets).max(axis=-1, initial=0).astype(np.float64)
+
+
+def max_consecutive_below(values: np.ndarray, threshold: float) -> np.ndarray:
+    """Longest run of days below a threshold (e.g. consecutive dry days)"""
+    return max_consecutive(values < threshold)
+
+
+def max_consecutive_above(values: np.ndarray, threshold: float, inclusive: bool = True) -> np.ndarray:
+    """Longest run of days above (or at, when inclusive) a threshold (e.g. consecutive wet days)"""
+    return max_consecutive(values >= threshold if inclusive else values > threshold)
+
+
+def growing_degree_days(tmax: np.ndarray,
+                        tmin: np.ndarray,
+                        base: float = 10.0,
+                        cap: Optional[float] = None) -> np.ndarray:
+    """
+    Growing degree days: sum of max(0, (tmax + tmin) / 2 - base).
+    When cap is given, temperatures above it are set to the cap first.
+    """
+    if cap is not None:
+        tmax = np.minimum(tmax, cap)
+        tmin = np.minimum(tmin, cap)
+    return np.nansum(np.maximum((tmax + tmin) / 2 - base, 0), axis=-1)
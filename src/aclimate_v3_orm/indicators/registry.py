@@ -0,0 +1,64 @@
+"""
+Registry of indicator definitions computed by the IndicatorEngine.
+
+A definition links an indicator (MngIndicator.short_name) with the daily measures
+it reads (MngClimateMeasure.short_name) and the kernel that reduces them.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Tuple
+import numpy as np
+from . import kernels
+
+
+@dataclass(frozen=True)
+class IndicatorDefinition:
+    """How to compute one indicator from daily data"""
+    short_name: str
+    measures: Tuple[str, ...]
+    kernel: Callable[..., np.ndarray]
+    params: Dict[str, Any] = field(default_factory=dict)
+
+    def compute(self, *arrays: np.ndarray) -> np.ndarray:
+        """Apply the kernel to one (series, days) array per measure, in the order of measures"""
+        return self.kernel(*arrays, **self.params)
+
+
+class IndicatorRegistry:
+    """Indicator definitions indexed by short name"""
+
+    def __init__(self, definitions: List[IndicatorDefinition] = ()):
+        self._definitions: Dict[str, IndicatorDefinition] = {}
+        for definition in definitions:
+            self.register(definition)
+
+    def register(self, definition: IndicatorDefinition) -> IndicatorDefinition:
+        """Add or replace a definition"""
+        if not definition.measures:
+            raise ValueError(f"Indicator '{definition.short_name}' must read at least one measure")
+        self._definitions[definition.short_name] = definition
+        return definition
+
+    def get(self, short_name: str) -> IndicatorDefinition:
+        """Get a definition by short name"""
+        if short_name not in self._definitions:
+            raise ValueError(f"No indicator definition registered for '{short_name}'")
+        return self._definitions[short_name]
+
+    def names(self) -> List[str]:
+        """Short names of the registered indicators"""
+        return list(self._definitions)
+
+    def __contains__(self, short_name: str) -> bool:
+        return short_name in self._definitions
+
+
+DEFAULT_REGISTRY = IndicatorRegistry([
+    IndicatorDefinition("PRCPTOT", ("prec",), kernels.total),
+    IndicatorDefinition("CDD", ("prec",), kernels.max_consecutive_below, {"threshold": 1.0}),
+    IndicatorDefinition("CWD", ("prec",), kernels.max_consecutive_above, {"threshold": 1.0}),
+    IndicatorDefinition("R10mm", ("prec",), kernels.count_above, {"threshold": 10.0, "inclusive": True}),
+    IndicatorDefinition("SU", ("tmax",), kernels.count_above, {"threshold": 25.0}),
+    IndicatorDefinition("TXx", ("tmax",), kernels.maximum),
+    IndicatorDefinition("TNn", ("tmin",), kernels.minimum),
+    IndicatorDefinition("GDD", ("tmax", "tmin"), kernels.growing_degree_days, {"base": 10.0}),
+])
@@ -0,0 +1,37 @@
+"""
+Lazy re-exports for the package __init__ modules.
+
+Importing a package only binds the names; each submodule is imported the first time one
+of its names is accessed, so short-lived scripts pay only for what they use.
+"""
+import sys
+from importlib import import_module
+from typing import Callable, Dict, Iterable, Tuple
+
+
+def lazy_exports(package: str, submodules: Dict[str, Iterable[str]]) -> Tuple[Callable, Callable]:
+    """
+    Module-level __getattr__ and __dir__ for a package.
+
+    Args:
+        package: __name__ of the package
+        submodules: Exported names by submodule (relative to the package)
+
+    Example:
+        __getattr__, __dir__ = lazy_exports(__name__, {"forecast": ("Forecast",)})
+    """
+    exports = {name: submodule for submodule, names in submodules.items() for name in names}
+    namespace = sys.modules[package].__dict__
+
+    def __getattr__(name: str):
+        submodule = exports.get(name)
+        if submodule is None:
+            raise AttributeError(f"module '{package}' has no attribute '{name}'")
+        value = getattr(import_module(f".{submodule}", package), name)
+        namespace[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(namespace) | set(exports))
+
+    return __getattr__, __dir__
@@ -2,15 +2,16 @@
 Alembic migrations for AClimate V3 ORM
 
 This module provides helpers to execute database migrations programmatically.
+Alembic is imported when a helper runs, not when the package is imported.
 """
 import os
 from pathlib import Path
-from alembic import command
-from alembic.config import Config
 
 
 def get_alembic_config():
     """Get Alembic configuration object"""
+    from alembic.config import Config
+
     migrations_dir = Path(__file__).parent
     alembic_ini = migrations_dir.parent / "alembic.ini"
     
@@ -38,6 +39,8 @@ def upgrade(revision: str = "head"):
         from aclimate_v3_orm.migrations import upgrade
         upgrade()  # Upgrade to latest
     """
+    from alembic import command
+
     config = get_alembic_config()
     command.upgrade(config, revision)
     print(f"✅ Migrations upgraded to: {revision}")
@@ -54,6 +57,8 @@ def downgrade(revision: str):
         from aclimate_v3_orm.migrations import downgrade
         downgrade("-1")  # Rollback one migration
     """
+    from alembic import command
+
     config = get_alembic_config()
     command.downgrade(config, revision)
     print(f"✅ Migrations downgraded to: {revision}")
@@ -67,6 +72,8 @@ def current():
         from aclimate_v3_orm.migrations import current
         current()
     """
+    from alembic import command
+
     config = get_alembic_config()
     command.current(config)
 
@@ -79,6 +86,8 @@ def history():
         from aclimate_v3_orm.migrations import history
         history()
     """
+    from alembic import command
+
     config = get_alembic_config()
     command.history(config)
 
@@ -95,6 +104,31 @@ def stamp(revision: str = "head"):
         from aclimate_v3_orm.migrations import stamp
         stamp()  # Mark as current
     """
+    from alembic import command
+
     config = get_alembic_config()
     command.stamp(config, revision)
     print(f"✅ Database stamped at revision: {revision}")
+
+
+def create_partitions(years_ahead: int = 1, from_year: int = None):
+    """
+    Create the yearly partitions of the historical daily/monthly tables
+    from the current year (or from_year) up to years_ahead years later.
+    Only acts on PostgreSQL; rows already in the default partition are moved.
+
+    Args:
+        years_ahead: Number of future years to prepare (default: 1)
+        from_year: First year to create (default: current year)
+
+    Example:
+        from aclimate_v3_orm.migrations import create_partitions
+        create_partitions(years_ahead=2)
+    """
+    from ..database import engine
+    from ..database.partitioning import ensure_future_partitions
+
+    with engine.begin() as connection:
+        created = ensure_future_partitions(connection, years_ahead=years_ahead, from_year=from_year)
+    print(f"✅ Partitions created: {', '.join(created) if created else 'none needed'}")
+    return created
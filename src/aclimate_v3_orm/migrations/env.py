@@ -15,8 +15,9 @@ sys.path.insert(0, str(src_dir))
 
 # Import Base and all models for autogenerate support
 from aclimate_v3_orm.database.base import Base
-import aclimate_v3_orm.models  # noqa: F401
-# This imports all models so Alembic can detect them
+import aclimate_v3_orm.models
+# Models are loaded lazily; import all of them so Alembic can detect them
+aclimate_v3_orm.models.import_all()
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,453 @@
+"""
+Index audit for the historical tables.
+
+Reads the index definitions from the SQLAlchemy metadata and, on PostgreSQL, the live
+usage statistics (pg_stat_user_indexes) to report redundant and unused indexes with
+their on-disk size. The report can be turned into a plan that drops left-prefix
+duplicates and swaps date B-trees for BRIN (optionally widening the surviving unique
+index with INCLUDE columns), rendered as an Alembic migration and benchmarked.
+
+Example:
+    from aclimate_v3_orm.database import engine
+    from aclimate_v3_orm.migrations.index_audit import audit_indexes, plan_index_changes, write_migration
+
+    with engine.connect() as connection:
+        report = audit_indexes(connection)
+    plan = plan_index_changes(report)
+    write_migration(plan, "Prune redundant historical indexes")
+"""
+import time
+from datetime import timedelta
+from typing import Any, Dict, Iterable, List, Optional
+from sqlalchemy import Index, MetaData, func, select, text
+from sqlalchemy.engine import Connection
+
+HISTORICAL_TABLES = (
+    "climate_historical_daily",
+    "climate_historical_monthly",
+    "climate_historical_climatology",
+)
+
+
+def _default_metadata() -> MetaData:
+    from ..database.base import Base
+    from .. import models
+    models.import_all()  # registers every table in the metadata
+    return Base.metadata
+
+
+def _index_definition(table, index: Optional[Index] = None) -> Dict[str, Any]:
+    """Normalized description of an index (or of the primary key when index is None)"""
+    if index is None:
+        return {
+            "table": table.name,
+            "name": f"{table.name}_pkey",
+            "columns": [column.name for column in table.primary_key.columns],
+            "unique": True,
+            "primary": True,
+            "using": "btree",
+            "include": [],
+        }
+    options = index.dialect_options["postgresql"]
+    return {
+        "table": table.name,
+        "name": index.name,
+        "columns": [column.name for column in index.columns],
+        "unique": bool(index.unique),
+        "primary": False,
+        "using": (options.get("using") or "btree").lower(),
+        "include": list(options.get("include") or []),
+    }
+
+
+def get_index_definitions(metadata: Optional[MetaData] = None,
+                          tables: Iterable[str] = HISTORICAL_TABLES) -> List[Dict[str, Any]]:
+    """Index definitions (primary keys included) of the given tables as declared in the models"""
+    metadata = metadata if metadata is not None else _default_metadata()
+    definitions = []
+    for table_name in tables:
+        table = metadata.tables[table_name]
+        definitions.append(_index_definition(table))
+        definitions.extend(
+            _index_definition(table, index)
+            for index in sorted(table.indexes, key=lambda index: index.name)
+        )
+    return definitions
+
+
+def find_redundant_indexes(definitions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Find B-tree indexes made redundant by another index of the same table.
+
+    An index is redundant when its columns are a left prefix of another B-tree index
+    (which can serve the same lookups and orderings). Unique and primary key indexes
+    are never reported since they enforce constraints. Indexes sharing only the
+    leading column are reported as overlaps, for review rather than removal.
+    """
+    redundant, overlaps = [], []
+    for index in definitions:
+        if index["unique"] or index["using"] != "btree":
+            continue
+        columns = index["columns"]
+        candidates = [
+            other for other in definitions
+            if other is not index
+            and other["table"] == index["table"]
+            and other["using"] == "btree"
+            and other["columns"][:len(columns)] == columns
+            and (len(other["columns"]) > len(columns) or other["unique"] or other["name"] < index["name"])
+        ]
+        if candidates:
+            covered_by = max(candidates, key=lambda other: (other["unique"], len(other["columns"])))
+            redundant.append({
+                "table": index["table"],
+                "index": index["name"],
+                "columns": columns,
+                "kind": "redundant",
+                "covered_by": covered_by["name"],
+                "reason": f"left prefix of {covered_by['name']} ({', '.join(covered_by['columns'])})",
+            })
+            continue
+        overlaps.append(index)
+
+    dropped = {finding["index"] for finding in redundant}
+    findings = list(redundant)
+    for index in overlaps:
+        overlapping = [
+            other for other in definitions
+            if other is not index
+            and other["name"] not in dropped
+            and other["table"] == index["table"]
+            and other["using"] == "btree"
+            and len(index["columns"]) > 1
+            and other["columns"][0] == index["columns"][0]
+        ]
+        if overlapping:
+            findings.append({
+                "table": index["table"],
+                "index": index["name"],
+                "columns": index["columns"],
+                "kind": "overlap",
+                "covered_by": None,
+                "reason": "shares leading column with " + ", ".join(other["name"] for other in overlapping),
+            })
+    return findings
+
+
+def collect_index_usage(connection: Connection, tables: Iterable[str] = HISTORICAL_TABLES) -> Dict[str, Dict[str, Any]]:
+    """
+    Live scans and size of every index of the given tables (PostgreSQL only).
+    Indexes of partitioned tables aggregate the statistics of all their partitions.
+
+    Returns:
+        Dict index name -> {"table", "scans", "size_bytes", "unique", "primary"};
+        empty on other dialects
+    """
+    if connection.dialect.name != "postgresql":
+        return {}
+    rows = connection.execute(text("""
+        WITH idx AS (
+            SELECT i.oid, i.relname AS index_name, t.relname AS table_name,
+                   x.indisunique AS is_unique, x.indisprimary AS is_primary
+            FROM pg_index x
+            JOIN pg_class i ON i.oid = x.indexrelid
+            JOIN pg_class t ON t.oid = x.indrelid
+            JOIN pg_namespace n ON n.oid = t.relnamespace
+            WHERE t.relname = ANY(:tables) AND n.nspname = current_schema()
+        ),
+        members AS (
+            SELECT idx.oid AS root, tree.relid FROM idx, LATERAL pg_partition_tree(idx.oid) tree
+            UNION
+            SELECT idx.oid, idx.oid FROM idx
+        )
+        SELECT idx.index_name, idx.table_name, idx.is_unique, idx.is_primary,
+               coalesce(sum(stats.idx_scan), 0) AS scans,
+               coalesce(sum(pg_relation_size(members.relid)), 0) AS size_bytes
+        FROM idx
+        JOIN members ON members.root = idx.oid
+        LEFT JOIN pg_stat_user_indexes stats ON stats.indexrelid = members.relid
+        GROUP BY idx.index_name, idx.table_name, idx.is_unique, idx.is_primary
+    """), {"tables": list(tables)})
+    return {
+        row.index_name: {
+            "table": row.table_name,
+            "scans": int(row.scans),
+            "size_bytes": int(row.size_bytes),
+            "unique": row.is_unique,
+            "primary": row.is_primary,
+        }
+        for row in rows
+    }
+
+
+def audit_indexes(connection: Optional[Connection] = None,
+                  metadata: Optional[MetaData] = None,
+                  tables: Iterable[str] = HISTORICAL_TABLES,
+                  unused_max_scans: int = 0) -> Dict[str, Any]:
+    """
+    Report redundant, overlapping and unused indexes of the historical tables.
+
+    Args:
+        connection: Live connection used to read usage statistics (optional)
+        metadata: Metadata with the model definitions (default: the ORM metadata)
+        tables: Tables to audit
+        unused_max_scans: Non-unique indexes with this many scans or fewer are reported as unused
+
+    Returns:
+        Dict with "indexes" (definitions enriched with scans/size_bytes when available),
+        "redundant", "overlaps", "unused" and "reclaimable_bytes" (size of redundant + unused)
+    """
+    tables = list(tables)
+    definitions = get_index_definitions(metadata, tables)
+    usage = collect_index_usage(connection, tables) if connection is not None else {}
+    for definition in definitions:
+        stats = usage.get(definition["name"], {})
+        definition["scans"] = stats.get("scans")
+        definition["size_bytes"] = stats.get("size_bytes")
+
+    findings = find_redundant_indexes(definitions)
+    for finding in findings:
+        finding["size_bytes"] = usage.get(finding["index"], {}).get("size_bytes")
+
+    unused = [
+        {"table": stats["table"], "index": name, "scans": stats["scans"], "size_bytes": stats["size_bytes"]}
+        for name, stats in sorted(usage.items())
+        if not stats["unique"] and not stats["primary"] and stats["scans"] <= unused_max_scans
+    ]
+    redundant = [finding for finding in findings if finding["kind"] == "redundant"]
+    reclaimable = {item["index"]: item["size_bytes"] or 0 for item in redundant + unused}
+    return {
+        "indexes": definitions,
+        "redundant": redundant,
+        "overlaps": [finding for finding in findings if finding["kind"] == "overlap"],
+        "unused": unused,
+        "reclaimable_bytes": sum(reclaimable.values()),
+    }
+
+
+def plan_index_changes(report: Dict[str, Any],
+                       brin_columns: Iterable[str] = ("date",),
+                       include: Optional[List[str]] = None,
+                       drop_unused: bool = False) -> List[Dict[str, Any]]:
+    """
+    Turn an audit report into index operations.
+
+    - Redundant (left-prefix) indexes are dropped.
+    - Single-column B-trees on a brin_columns column are replaced by a BRIN index of the same name.
+    - With include, the unique indexes absorbing dropped ones are rebuilt as covering indexes.
+    - With drop_unused, indexes without scans are dropped too.
+
+    Returns:
+        Ordered list of operations: {"op": "drop_index" | "create_index", "name", "table",
+        "columns", "unique", "using", "include", "previous"} where "previous" keeps the
+        replaced definition so the change can be reverted
+    """
+    definitions = {definition["name"]: definition for definition in report["indexes"]}
+    brin_columns = set(brin_columns)
+    operations = []
+
+    def _drop(definition):
+        operations.append({"op": "drop_index", **_op_fields(definition), "previous": definition})
+
+    def _create(definition, previous):
+        operations.append({"op": "create_index", **_op_fields(definition), "previous": previous})
+
+    dropped = set()
+    for finding in report["redundant"]:
+        _drop(definitions[finding["index"]])
+        dropped.add(finding["index"])
+    if drop_unused:
+        for item in report["unused"]:
+            if item["index"] in definitions and item["index"] not in dropped:
+                _drop(definitions[item["index"]])
+                dropped.add(item["index"])
+
+    for definition in report["indexes"]:
+        if definition["name"] in dropped or definition["primary"]:
+            continue
+        if definition["using"] == "btree" and len(definition["columns"]) == 1 and definition["columns"][0] in brin_columns:
+            _drop(definition)
+            _create({**definition, "using": "brin", "unique": False}, definition)
+
+    if include:
+        absorbing = {finding["covered_by"] for finding in report["redundant"]}
+        for name in sorted(absorbing):
+            definition = definitions[name]
+            if definition["primary"] or not definition["unique"] or set(include) <= set(definition["include"]):
+                continue
+            _drop(definition)
+            _create({**definition, "include": sorted(set(definition["include"]) | set(include))}, definition)
+    return operations
+
+
+def _op_fields(definition: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "name": definition["name"],
+        "table": definition["table"],
+        "columns": list(definition["columns"]),
+        "unique": definition["unique"],
+        "using": definition["using"],
+        "include": list(definition["include"]),
+    }
+
+
+def _render_create(fields: Dict[str, Any]) -> str:
+    options = [f"unique={fields['unique']!r}"]
+    if fields["using"] != "btree":
+        options.append(f"postgresql_using={fields['using']!r}")
+    if fields["include"]:
+        options.append(f"postgresql_include={fields['include']!r}")
+    return f"op.create_index({fields['name']!r}, {fields['table']!r}, {fields['columns']!r}, {', '.join(options)})"
+
+
+def _render_drop(fields: Dict[str, Any]) -> str:
+    return f"op.drop_index({fields['name']!r}, table_name={fields['table']!r})"
+
+
+def render_operations(operations: List[Dict[str, Any]]) -> Dict[str, str]:
+    """Alembic upgrade/downgrade bodies for a list of planned operations"""
+    upgrades, downgrades = [], []
+    for operation in operations:
+        if operation["op"] == "drop_index":
+            upgrades.append(_render_drop(operation))
+            downgrades.append(_render_create(operation["previous"]))
+        else:
+            upgrades.append(_render_create(operation))
+            downgrades.append(_render_drop(operation))
+    return {
+        "upgrades": "\n    ".join(upgrades),
+        "downgrades": "\n    ".join(reversed(downgrades)),
+    }
+
+
+def write_migration(operations: List[Dict[str, Any]], message: str, rev_id: Optional[str] = None) -> str:
+    """
+    Write the planned operations as a new migration on top of the current head.
+
+    Returns:
+        Path of the generated migration script
+    """
+    import uuid
+    from alembic.script import ScriptDirectory
+    from . import get_alembic_config
+
+    script_directory = ScriptDirectory.from_config(get_alembic_config())
+    script = script_directory.generate_revision(
+        rev_id or uuid.uuid4().hex[-12:],
+        message,
+        head="head",
+        **render_operations(operations)
+    )
+    return script.path
+
+
+def apply_operations(connection: Connection, operations: List[Dict[str, Any]], metadata: Optional[MetaData] = None):
+    """Execute planned operations on a connection (inside the caller's transaction)"""
+    metadata = metadata if metadata is not None else _default_metadata()
+    for operation in operations:
+        # Work on a detached copy so the ORM tables do not collect the new Index objects
+        table = metadata.tables[operation["table"]].to_metadata(MetaData())
+        if operation["op"] == "drop_index":
+            connection.execute(text(f"DROP INDEX {operation['name']}"))
+            continue
+        kwargs = {"unique": operation["unique"]}
+        if operation["using"] != "btree":
+            kwargs["postgresql_using"] = operation["using"]
+        if operation["include"]:
+            kwargs["postgresql_include"] = operation["include"]
+        Index(operation["name"], *[table.c[column] for column in operation["columns"]], **kwargs).create(connection)
+
+
+def benchmark_index_changes(connection: Connection,
+                            operations: List[Dict[str, Any]],
+                            table_name: str = "climate_historical_daily",
+                            rows: int = 5000,
+                            reads: int = 50,
+                            metadata: Optional[MetaData] = None) -> Dict[str, Any]:
+    """
+    Compare ingest and read speed before and after applying the planned operations.
+
+    Everything runs in one transaction that is rolled back at the end, so the synthetic
+    rows and the index changes never persist. PostgreSQL DDL is transactional; on other
+    databases run this against a scratch copy.
+
+    Args:
+        connection: Connection to a database with some data in table_name
+        operations: Output of plan_index_changes()
+        table_name: Historical table to exercise (must have location_id/measure_id/date/value)
+        rows: Synthetic rows inserted per phase
+        reads: Series and date-range reads per phase
+
+    Returns:
+        Dict with "before" and "after" timings (ingest_seconds, series_read_seconds,
+        date_read_seconds) and the "speedup" ratio (before / after) of each timing
+    """
+    metadata = metadata if metadata is not None else _default_metadata()
+    table = metadata.tables[table_name]
+    transaction = connection.begin() if not connection.in_transaction() else connection.begin_nested()
+    try:
+        # The busiest series, so reads hit a realistic number of rows
+        sample = connection.execute(
+            select(
+                table.c.location_id,
+                table.c.measure_id,
+                func.max(table.c.date).label("last_date"),
+                select(func.max(table.c.id)).scalar_subquery().label("last_id")
+            )
+            .group_by(table.c.location_id, table.c.measure_id)
+            .order_by(func.count().desc())
+            .limit(1)
+        ).one()
+
+        def _measure(phase: int) -> Dict[str, float]:
+            offset = phase * rows
+            batch = [
+                {
+                    "id": sample.last_id + offset + position + 1,
+                    "location_id": sample.location_id,
+                    "measure_id": sample.measure_id,
+                    "date": sample.last_date + timedelta(days=offset + position + 1),
+                    "value": float(position),
+                }
+                for position in range(rows)
+            ]
+            started = time.perf_counter()
+            connection.execute(table.insert(), batch)
+            ingest = time.perf_counter() - started
+
+            started = time.perf_counter()
+            for _ in range(reads):
+                connection.execute(
+                    select(table.c.date, table.c.value).where(
+                        table.c.location_id == sample.location_id,
+                        table.c.measure_id == sample.measure_id,
+                        table.c.date > sample.last_date - timedelta(days=365),
+                        table.c.date <= sample.last_date
+                    )
+                ).fetchall()
+            series_read = time.perf_counter() - started
+
+            started = time.perf_counter()
+            for _ in range(reads):
+                connection.execute(
+                    table.select().where(
+                        table.c.date > sample.last_date - timedelta(days=7),
+                        table.c.date <= sample.last_date
+                    )
+                ).fetchall()
+            date_read = time.perf_counter() - started
+            return {"ingest_seconds": ingest, "series_read_seconds": series_read, "date_read_seconds": date_read}
+
+        before = _measure(0)
+        apply_operations(connection, operations, metadata)
+        after = _measure(1)
+    finally:
+        transaction.rollback()
+
+    return {
+        "rows": rows,
+        "reads": reads,
+        "before": before,
+        "after": after,
+        "speedup": {key: (before[key] / after[key] if after[key] else None) for key in before},
+    }
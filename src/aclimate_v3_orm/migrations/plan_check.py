@@ -0,0 +1,299 @@
+"""
+Query plan checks for the service reads.
+
+Runs each registered service query against a seeded database, captures the SQL it
+emits and explains every SELECT: EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) on PostgreSQL,
+EXPLAIN QUERY PLAN on SQLite. The report lists the indexes each statement uses and
+flags sequential scans on large tables; compared against a stored baseline it also
+flags plans that changed, so index or query regressions fail CI.
+
+Example:
+    from aclimate_v3_orm.database import get_db
+    from aclimate_v3_orm.migrations.plan_check import check_plans
+
+    with get_db() as session:
+        report = check_plans(session, baseline="plans.json")
+    assert not report["failures"], report["failures"]
+"""
+import json
+import re
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+from sqlalchemy import event, literal_column, select, table, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+# Tables with at least this many rows are large: scanning them sequentially is a regression
+LARGE_TABLE_ROWS = 10_000
+
+# call(db=session, **arguments) is run when arguments(session) finds sample data
+PlanQuery = namedtuple("PlanQuery", ["name", "call", "arguments", "allow_seq_scan"])
+
+REGISTERED_QUERIES: Dict[str, PlanQuery] = {}
+
+# Service reads checked by default: name, service, method, sampled table and arguments built from its first row
+_DEFAULT_QUERIES = (
+    ("daily.get_by_location_id", "ClimateHistoricalDailyService", "get_by_location_id", "climate_historical_daily",
+     lambda row: {"location_id": row["location_id"]}),
+    ("daily.get_series", "ClimateHistoricalDailyService", "get_series", "climate_historical_daily",
+     lambda row: {"location_ids": [row["location_id"]], "measure_ids": [row["measure_id"]]}),
+    ("daily.get_date_range_by_location_id", "ClimateHistoricalDailyService", "get_date_range_by_location_id",
+     "climate_historical_daily", lambda row: {"location_id": row["location_id"]}),
+    ("daily.get_max_min_by_location_id", "ClimateHistoricalDailyService", "get_max_min_by_location_id",
+     "climate_historical_daily", lambda row: {"location_id": row["location_id"]}),
+    ("daily.get_latest_by_location", "ClimateHistoricalDailyService", "get_latest_by_location",
+     "climate_historical_daily", lambda row: {"location_id": row["location_id"], "days": 0}),
+    ("monthly.get_by_location_id", "ClimateHistoricalMonthlyService", "get_by_location_id", "climate_historical_monthly",
+     lambda row: {"location_id": row["location_id"]}),
+    ("monthly.get_series", "ClimateHistoricalMonthlyService", "get_series", "climate_historical_monthly",
+     lambda row: {"location_ids": [row["location_id"]], "measure_ids": [row["measure_id"]]}),
+    ("monthly.get_date_range_by_location_id", "ClimateHistoricalMonthlyService", "get_date_range_by_location_id",
+     "climate_historical_monthly", lambda row: {"location_id": row["location_id"]}),
+    ("climatology.get_by_location_id", "ClimateHistoricalClimatologyService", "get_by_location_id",
+     "climate_historical_climatology", lambda row: {"location_id": row["location_id"]}),
+    ("climatology.get_max_min_by_location_id", "ClimateHistoricalClimatologyService", "get_max_min_by_location_id",
+     "climate_historical_climatology", lambda row: {"location_id": row["location_id"]}),
+    ("indicator.get_by_location_id", "ClimateHistoricalIndicatorService", "get_by_location_id",
+     "climate_historical_indicator", lambda row: {"location_id": row["location_id"]}),
+    ("indicator.get_by_indicator_and_location", "ClimateHistoricalIndicatorService", "get_by_indicator_and_location",
+     "climate_historical_indicator", lambda row: {"indicator_id": row["indicator_id"], "location_id": row["location_id"]}),
+    ("availability.get_by_location_id", "ClimateDataAvailabilityService", "get_by_location_id",
+     "climate_data_availability", lambda row: {"location_id": row["location_id"]}),
+)
+
+# EXPLAIN QUERY PLAN details of table accesses, e.g. "SEARCH t USING INDEX ix (a=?)" or "SCAN TABLE t"
+_SQLITE_ACCESS = re.compile(
+    r"^(?P<operation>SCAN|SEARCH) (?:TABLE )?(?P<table>\S+)(?: AS \S+)?"
+    r"(?: USING (?:(?:COVERING )?INDEX (?P<index>\S+)|(?P<rowid>(?:INTEGER )?PRIMARY KEY)))?"
+)
+
+
+def register_query(name: str,
+                   call: Callable[..., Any],
+                   arguments: Optional[Callable[[Session], Optional[Dict[str, Any]]]] = None,
+                   allow_seq_scan: bool = False):
+    """
+    Register a query to check.
+
+    Args:
+        name: Key of the query in reports and baselines
+        call: Service read, called as call(db=session, **arguments(session))
+        arguments: Sample arguments taken from the seeded database, or None to skip the query
+        allow_seq_scan: The query scans a whole table on purpose
+    """
+    REGISTERED_QUERIES[name] = PlanQuery(name, call, arguments or (lambda session: {}), allow_seq_scan)
+
+
+def _sample_row(table_name: str, build: Callable[[Dict[str, Any]], Dict[str, Any]]):
+    """Arguments built from the first row of a table, or None when it is empty"""
+    def arguments(session: Session) -> Optional[Dict[str, Any]]:
+        row = session.execute(select(literal_column("*")).select_from(table(table_name)).limit(1)).mappings().first()
+        return None if row is None else build(dict(row))
+    return arguments
+
+
+def default_queries() -> Dict[str, PlanQuery]:
+    """The default service reads plus the ones registered with register_query()"""
+    from .. import services
+    queries = {}
+    for name, service_name, method, table_name, build in _DEFAULT_QUERIES:
+        service = getattr(services, service_name)()
+        queries[name] = PlanQuery(name, getattr(service, method), _sample_row(table_name, build), False)
+    queries.update(REGISTERED_QUERIES)
+    return queries
+
+
+@contextmanager
+def _capture_statements(bind):
+    """Collect the SELECT statements (with their DBAPI parameters) this thread sends through bind"""
+    statements = []
+    thread = threading.get_ident()
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and threading.get_ident() == thread \
+                and statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            statements.append((statement, parameters))
+
+    event.listen(bind, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(bind, "before_cursor_execute", record)
+
+
+def _postgresql_nodes(plan: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Flatten an EXPLAIN (FORMAT JSON) plan tree, depth first"""
+    nodes = [{
+        "operation": plan["Node Type"],
+        "table": plan.get("Relation Name"),
+        "index": plan.get("Index Name"),
+        "seq_scan": plan["Node Type"] == "Seq Scan",
+        "rows": plan.get("Actual Rows", plan.get("Plan Rows")),
+        "buffers": plan.get("Shared Hit Blocks", 0) + plan.get("Shared Read Blocks", 0),
+    }]
+    for child in plan.get("Plans", []):
+        nodes.extend(_postgresql_nodes(child))
+    return nodes
+
+
+def _sqlite_node(detail: str) -> Dict[str, Any]:
+    """Normalize one EXPLAIN QUERY PLAN row"""
+    match = _SQLITE_ACCESS.match(detail)
+    if match is None:
+        return {"operation": detail, "table": None, "index": None, "seq_scan": False}
+    operation, index = match.group("operation"), match.group("index")
+    return {
+        "operation": operation if index or match.group("rowid") is None else f"{operation} PRIMARY KEY",
+        "table": match.group("table"),
+        "index": index,
+        "seq_scan": operation == "SCAN" and index is None and match.group("rowid") is None,
+    }
+
+
+def explain(connection: Connection, statement: str, parameters: Any = None, analyze: bool = True) -> List[Dict[str, Any]]:
+    """
+    Plan of one SQL statement as a flat list of nodes (operation, table, index, seq_scan).
+
+    On PostgreSQL analyze runs the statement (EXPLAIN ANALYZE, BUFFERS) and adds the
+    actual rows and buffers of each node; SQLite only reports the chosen plan.
+    """
+    dialect = connection.dialect.name
+    if dialect == "postgresql":
+        options = "ANALYZE, BUFFERS, FORMAT JSON" if analyze else "FORMAT JSON"
+        result = connection.exec_driver_sql(f"EXPLAIN ({options}) {statement}", parameters or {}).scalar()
+        if isinstance(result, str):
+            result = json.loads(result)
+        return _postgresql_nodes(result[0]["Plan"])
+    if dialect == "sqlite":
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters or ()).all()
+        return [_sqlite_node(row[-1]) for row in rows]
+    raise ValueError(f"Plan checks support PostgreSQL and SQLite, not {dialect}")
+
+
+def _table_rows(connection: Connection, table_name: str) -> int:
+    """Row count of a table: the planner estimate on PostgreSQL, an exact count elsewhere"""
+    if connection.dialect.name == "postgresql":
+        rows = connection.execute(
+            text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:name)"), {"name": table_name}
+        ).scalar()
+        return max(int(rows or 0), 0)
+    return connection.execute(select(literal_column("COUNT(*)")).select_from(table(table_name))).scalar()
+
+
+def plan_signature(nodes: List[Dict[str, Any]]) -> List[str]:
+    """Plan shape compared against the baseline: operations, tables and indexes, without costs or rows"""
+    return [" ".join(part for part in (node["operation"], node["table"], node["index"]) if part) for node in nodes]
+
+
+def collect_plans(session: Session,
+                  queries: Optional[Dict[str, PlanQuery]] = None,
+                  analyze: bool = True,
+                  large_table_rows: int = LARGE_TABLE_ROWS) -> Dict[str, Dict[str, Any]]:
+    """
+    Run and explain every query. Each query reports its distinct statements with their
+    nodes, signature, indexes used and the large tables scanned sequentially; queries
+    without sample data are marked as skipped.
+    """
+    queries = default_queries() if queries is None else queries
+    bind = session.get_bind()
+    table_rows = {}
+    plans = {}
+    for name, query in queries.items():
+        arguments = query.arguments(session)
+        if arguments is None:
+            plans[name] = {"skipped": True, "statements": []}
+            continue
+        with _capture_statements(bind) as captured:
+            query.call(db=session, **arguments)
+
+        connection = session.connection()
+        statements, seen = [], set()
+        for statement, parameters in captured:
+            if statement in seen:  # the same statement with other parameters, e.g. one per measure
+                continue
+            seen.add(statement)
+            nodes = explain(connection, statement, parameters, analyze)
+            scanned = []
+            for node in nodes:
+                if node["seq_scan"] and not query.allow_seq_scan:
+                    if node["table"] not in table_rows:
+                        table_rows[node["table"]] = _table_rows(connection, node["table"])
+                    if table_rows[node["table"]] >= large_table_rows:
+                        scanned.append(node["table"])
+            statements.append({
+                "sql": statement,
+                "nodes": nodes,
+                "signature": plan_signature(nodes),
+                "indexes": sorted({node["index"] for node in nodes if node["index"]}),
+                "large_seq_scans": scanned,
+            })
+        plans[name] = {"skipped": False, "statements": statements}
+    return plans
+
+
+def load_baseline(path: str) -> Dict[str, List[List[str]]]:
+    """Stored signatures per query; empty when the file does not exist yet"""
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(plans: Dict[str, Dict[str, Any]], path: str):
+    """Store the signatures of the queries that ran as the new baseline"""
+    baseline = {
+        name: [statement["signature"] for statement in plan["statements"]]
+        for name, plan in sorted(plans.items()) if not plan["skipped"]
+    }
+    with open(path, "w") as file:
+        json.dump(baseline, file, indent=2)
+        file.write("\n")
+
+
+def compare_plans(plans: Dict[str, Dict[str, Any]], baseline: Dict[str, List[List[str]]]) -> List[str]:
+    """Failures: sequential scans on large tables and plans that differ from the baseline"""
+    failures = []
+    for name, plan in plans.items():
+        if plan["skipped"]:
+            continue
+        for statement in plan["statements"]:
+            for table_name in statement["large_seq_scans"]:
+                failures.append(f"{name}: sequential scan on large table {table_name}")
+        if name not in baseline:
+            continue
+        signatures = [statement["signature"] for statement in plan["statements"]]
+        if signatures != baseline[name]:
+            failures.append(f"{name}: plan changed from {baseline[name]} to {signatures}")
+    return failures
+
+
+def check_plans(session: Session,
+                baseline: Optional[str] = None,
+                queries: Optional[Dict[str, PlanQuery]] = None,
+                analyze: bool = True,
+                large_table_rows: int = LARGE_TABLE_ROWS,
+                update_baseline: bool = False) -> Dict[str, Any]:
+    """
+    Explain the service queries and check them against a baseline file.
+
+    The session is rolled back afterwards. With update_baseline the current plans
+    replace the stored ones and only sequential scans are reported.
+
+    Returns:
+        Dict with plans, failures and new_queries (queries missing from the baseline)
+    """
+    try:
+        plans = collect_plans(session, queries, analyze, large_table_rows)
+    finally:
+        session.rollback()
+    stored = load_baseline(baseline) if baseline and not update_baseline else {}
+    if baseline and update_baseline:
+        save_baseline(plans, baseline)
+    return {
+        "plans": plans,
+        "failures": compare_plans(plans, stored),
+        "new_queries": sorted(name for name, plan in plans.items() if not plan["skipped"] and name not in stored),
+    }
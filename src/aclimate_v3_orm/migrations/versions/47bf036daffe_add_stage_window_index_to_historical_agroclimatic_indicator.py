@@ -0,0 +1,32 @@
+"""Add stage window lookup index to historical_agroclimatic_indicator
+
+Revision ID: 47bf036daffe
+Revises: 6f24fbe1dc18
+Create Date: 2026-10-19 20:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '47bf036daffe'
+down_revision: Union[str, Sequence[str], None] = '6f24fbe1dc18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_agroclimatic_location_stage_indicator_start',
+        'historical_agroclimatic_indicator',
+        ['location_id', 'phenological_id', 'indicator_id', 'start_date']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_agroclimatic_location_stage_indicator_start', table_name='historical_agroclimatic_indicator')
@@ -0,0 +1,50 @@
+"""Add unique key and lookup index to climate_historical_indicator
+
+Revision ID: 6f24fbe1dc18
+Revises: f7c36cfe3500
+Create Date: 2026-10-19 19:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6f24fbe1dc18'
+down_revision: Union[str, Sequence[str], None] = 'f7c36cfe3500'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keep only the most recent row of each key so the unique index can be built
+    op.execute("""
+        DELETE FROM climate_historical_indicator
+        WHERE id NOT IN (
+            SELECT keep_id FROM (
+                SELECT max(id) AS keep_id
+                FROM climate_historical_indicator
+                GROUP BY indicator_id, location_id, period, start_date
+            ) AS latest
+        )
+    """)
+    op.create_index(
+        'ix_indicator_indicator_location_period_start',
+        'climate_historical_indicator',
+        ['indicator_id', 'location_id', 'period', 'start_date'],
+        unique=True
+    )
+    op.create_index(
+        'ix_indicator_location_period_start',
+        'climate_historical_indicator',
+        ['location_id', 'period', 'start_date']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_indicator_location_period_start', table_name='climate_historical_indicator')
+    op.drop_index('ix_indicator_indicator_location_period_start', table_name='climate_historical_indicator')
@@ -0,0 +1,106 @@
+"""Partition climate_historical_daily and climate_historical_monthly by year
+
+Revision ID: 8973bc9e5ce9
+Revises: 05bb54cc2198
+Create Date: 2026-10-19 09:12:00.000000
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8973bc9e5ce9'
+down_revision: Union[str, Sequence[str], None] = '05bb54cc2198'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# table name -> index prefix used by the models
+TABLES = {
+    'climate_historical_daily': 'daily',
+    'climate_historical_monthly': 'monthly',
+}
+
+
+def _indexes(prefix: str):
+    return [
+        (f'ix_{prefix}_location', ['location_id'], False),
+        (f'ix_{prefix}_location_date', ['location_id', 'date'], False),
+        (f'ix_{prefix}_location_measure', ['location_id', 'measure_id'], False),
+        (f'ix_{prefix}_location_measure_date', ['location_id', 'measure_id', 'date'], True),
+        (f'ix_{prefix}_date', ['date'], False),
+    ]
+
+
+def _swap_table(table: str, prefix: str, partitioned: bool) -> None:
+    """Rebuild a table as partitioned (or back to a plain table), keeping ids and its sequence"""
+    connection = op.get_bind()
+    legacy = f'{table}_legacy'
+
+    # Step 1: Move the current table out of the way, freeing its index names
+    op.execute(f'ALTER TABLE {table} RENAME TO {legacy}')
+    op.execute(f'ALTER INDEX {table}_pkey RENAME TO {legacy}_pkey')
+    for name, _, _ in _indexes(prefix):
+        op.drop_index(name, table_name=legacy)
+
+    # Step 2: Create the new table reusing the existing id sequence
+    primary_key = 'PRIMARY KEY (id, date)' if partitioned else 'PRIMARY KEY (id)'
+    partition_clause = ' PARTITION BY RANGE (date)' if partitioned else ''
+    op.execute(f"""
+        CREATE TABLE {table} (
+            id BIGINT NOT NULL DEFAULT nextval('{table}_id_seq'),
+            location_id BIGINT NOT NULL REFERENCES mng_location (id),
+            measure_id INTEGER NOT NULL REFERENCES mng_climate_measure (id),
+            date DATE NOT NULL,
+            value DOUBLE PRECISION NOT NULL,
+            {primary_key}
+        ){partition_clause}
+    """)
+
+    # Step 3: One partition per year with data, up to next year, plus a catch-all default
+    if partitioned:
+        first_year, last_year = connection.execute(text(
+            f'SELECT EXTRACT(YEAR FROM min(date))::int, EXTRACT(YEAR FROM max(date))::int FROM {legacy}'
+        )).one()
+        current_year = date.today().year
+        first_year = first_year or current_year
+        last_year = max(last_year or current_year, current_year) + 1
+        for year in range(first_year, last_year + 1):
+            op.execute(
+                f"CREATE TABLE {table}_y{year} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')"
+            )
+        op.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+
+    # Step 4: Copy rows, hand the sequence over and drop the old table (and its partitions)
+    op.execute(f"""
+        INSERT INTO {table} (id, location_id, measure_id, date, value)
+        SELECT id, location_id, measure_id, date, value FROM {legacy}
+    """)
+    op.execute(f'ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id')
+    op.execute(f'DROP TABLE {legacy}')
+
+    # Step 5: Recreate the indexes (propagated to every partition)
+    for name, columns, unique in _indexes(prefix):
+        op.create_index(name, table, columns, unique=unique)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Declarative partitioning is PostgreSQL only; other databases keep plain tables
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table, prefix in TABLES.items():
+        _swap_table(table, prefix, partitioned=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table, prefix in TABLES.items():
+        _swap_table(table, prefix, partitioned=False)
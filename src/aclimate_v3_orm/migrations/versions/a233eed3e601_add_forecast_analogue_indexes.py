@@ -0,0 +1,34 @@
+"""Add forecast_analogue lookup indexes
+
+Revision ID: a233eed3e601
+Revises: 47bf036daffe
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a233eed3e601'
+down_revision: Union[str, Sequence[str], None] = '47bf036daffe'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_forecast_analogue_forecast_location_rank',
+        'forecast_analogue',
+        ['forecast_id', 'location_id', 'rank']
+    )
+    op.create_index('ix_forecast_analogue_location', 'forecast_analogue', ['location_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_forecast_analogue_location', table_name='forecast_analogue')
+    op.drop_index('ix_forecast_analogue_forecast_location_rank', table_name='forecast_analogue')
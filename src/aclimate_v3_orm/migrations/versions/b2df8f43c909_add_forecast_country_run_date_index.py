@@ -0,0 +1,28 @@
+"""Add (country_id, run_date) index to forecast
+
+Revision ID: b2df8f43c909
+Revises: a233eed3e601
+Create Date: 2026-10-19 21:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2df8f43c909'
+down_revision: Union[str, Sequence[str], None] = 'a233eed3e601'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_forecast_country_run_date', 'forecast', ['country_id', 'run_date'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_forecast_country_run_date', table_name='forecast')
@@ -0,0 +1,42 @@
+"""Prune redundant historical indexes and use BRIN on date
+
+Revision ID: c9297504ada9
+Revises: 8973bc9e5ce9
+Create Date: 2026-10-19 18:52:23.780067
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9297504ada9'
+down_revision: Union[str, Sequence[str], None] = '8973bc9e5ce9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index('ix_daily_location', table_name='climate_historical_daily')
+    op.drop_index('ix_daily_location_measure', table_name='climate_historical_daily')
+    op.drop_index('ix_monthly_location', table_name='climate_historical_monthly')
+    op.drop_index('ix_monthly_location_measure', table_name='climate_historical_monthly')
+    op.drop_index('ix_daily_date', table_name='climate_historical_daily')
+    op.create_index('ix_daily_date', 'climate_historical_daily', ['date'], unique=False, postgresql_using='brin')
+    op.drop_index('ix_monthly_date', table_name='climate_historical_monthly')
+    op.create_index('ix_monthly_date', 'climate_historical_monthly', ['date'], unique=False, postgresql_using='brin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_monthly_date', table_name='climate_historical_monthly')
+    op.create_index('ix_monthly_date', 'climate_historical_monthly', ['date'], unique=False)
+    op.drop_index('ix_daily_date', table_name='climate_historical_daily')
+    op.create_index('ix_daily_date', 'climate_historical_daily', ['date'], unique=False)
+    op.create_index('ix_monthly_location_measure', 'climate_historical_monthly', ['location_id', 'measure_id'], unique=False)
+    op.create_index('ix_monthly_location', 'climate_historical_monthly', ['location_id'], unique=False)
+    op.create_index('ix_daily_location_measure', 'climate_historical_daily', ['location_id', 'measure_id'], unique=False)
+    op.create_index('ix_daily_location', 'climate_historical_daily', ['location_id'], unique=False)
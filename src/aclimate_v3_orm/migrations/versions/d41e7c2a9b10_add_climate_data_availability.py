@@ -0,0 +1,57 @@
+"""Add climate_data_availability summary table
+
+Revision ID: d41e7c2a9b10
+Revises: b2df8f43c909
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41e7c2a9b10'
+down_revision: Union[str, Sequence[str], None] = 'b2df8f43c909'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Summarized tables and their temporality
+SOURCES = (("DAILY", "climate_historical_daily"), ("MONTHLY", "climate_historical_monthly"))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'climate_data_availability',
+        sa.Column('id', sa.BigInteger(), primary_key=True),
+        sa.Column('temporality', postgresql.ENUM(name='period', create_type=False), nullable=False),
+        sa.Column('location_id', sa.BigInteger(), sa.ForeignKey('mng_location.id'), nullable=False),
+        sa.Column('measure_id', sa.Integer(), sa.ForeignKey('mng_climate_measure.id'), nullable=False),
+        sa.Column('min_date', sa.Date(), nullable=False),
+        sa.Column('max_date', sa.Date(), nullable=False),
+        sa.Column('count', sa.BigInteger(), nullable=False),
+        sa.Column('last_ingest', sa.DateTime(timezone=True)),
+    )
+    op.create_index(
+        'ix_availability_temporality_location_measure',
+        'climate_data_availability',
+        ['temporality', 'location_id', 'measure_id'],
+        unique=True
+    )
+    # Initial build; afterwards the services keep it up to date
+    for temporality, table in SOURCES:
+        op.execute(f"""
+            INSERT INTO climate_data_availability (temporality, location_id, measure_id, min_date, max_date, count, last_ingest)
+            SELECT '{temporality}', location_id, measure_id, MIN(date), MAX(date), COUNT(*), now()
+            FROM {table}
+            GROUP BY location_id, measure_id
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_availability_temporality_location_measure', table_name='climate_data_availability')
+    op.drop_table('climate_data_availability')
@@ -0,0 +1,43 @@
+"""Cover value in the historical daily and monthly unique indexes
+
+Revision ID: f7c36cfe3500
+Revises: c9297504ada9
+Create Date: 2026-10-19 19:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7c36cfe3500'
+down_revision: Union[str, Sequence[str], None] = 'c9297504ada9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = {
+    'ix_daily_location_measure_date': 'climate_historical_daily',
+    'ix_monthly_location_measure_date': 'climate_historical_monthly',
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # INCLUDE columns are PostgreSQL only; other databases keep the same index
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for name, table in INDEXES.items():
+        op.drop_index(name, table_name=table)
+        op.create_index(name, table, ['location_id', 'measure_id', 'date'], unique=True, postgresql_include=['value'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for name, table in INDEXES.items():
+        op.drop_index(name, table_name=table)
+        op.create_index(name, table, ['location_id', 'measure_id', 'date'], unique=True)
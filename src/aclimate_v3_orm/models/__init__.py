@@ -1,31 +1,54 @@
-from .climate_historical_climatology import ClimateHistoricalClimatology
-from .climate_historical_daily import ClimateHistoricalDaily
-from .climate_historical_monthly import ClimateHistoricalMonthly
-from .climate_historical_indicator import ClimateHistoricalIndicator
-from .mng_admin_1 import MngAdmin1
-from .mng_admin_2 import MngAdmin2
-from .mng_climate_measure import MngClimateMeasure
-from .mng_indicators import MngIndicator
-from .mng_country import MngCountry
-from .mng_location import MngLocation
-from .mng_source import MngSource
-from .mng_cultivar import MngCultivar
-from .mng_soil import MngSoil
-from .mng_data_source import MngDataSource
-from .mng_phenological_stage import MngPhenologicalStage
-from .mng_stress import MngStress
-from .mng_crop import MngCrop
-from .mng_setup import MngSetup
-from .mng_configuration_file import MngConfigurationFile
-from .mng_season import MngSeason
-from .forecast import Forecast
-from .forecast_analogue import ForecastAnalogue
-from .historical_agroclimatic_indicator import HistoricalAgroclimaticIndicator
-from .phenological_stage_stress import PhenologicalStageStress
-from .role import Role
-from .user import User
-from .user_access import UserAccess
-from .mng_country_indicator import MngCountryIndicator
-from .mng_indicator_category import MngIndicatorCategory
-from .mng_indicators_features import MngIndicatorsFeatures
-from .mng_country_climate_measure import MngCountryClimateMeasure
+"""SQLAlchemy models, imported on first access"""
+from sqlalchemy import event
+from sqlalchemy.orm import Mapper
+from ..lazy import lazy_exports
+
+_SUBMODULES = {
+    "climate_historical_climatology": ("ClimateHistoricalClimatology",),
+    "climate_historical_daily": ("ClimateHistoricalDaily",),
+    "climate_historical_monthly": ("ClimateHistoricalMonthly",),
+    "climate_historical_indicator": ("ClimateHistoricalIndicator",),
+    "climate_data_availability": ("ClimateDataAvailability",),
+    "mng_admin_1": ("MngAdmin1",),
+    "mng_admin_2": ("MngAdmin2",),
+    "mng_climate_measure": ("MngClimateMeasure",),
+    "mng_indicators": ("MngIndicator",),
+    "mng_country": ("MngCountry",),
+    "mng_location": ("MngLocation",),
+    "mng_source": ("MngSource",),
+    "mng_cultivar": ("MngCultivar",),
+    "mng_soil": ("MngSoil",),
+    "mng_data_source": ("MngDataSource",),
+    "mng_phenological_stage": ("MngPhenologicalStage",),
+    "mng_stress": ("MngStress",),
+    "mng_crop": ("MngCrop",),
+    "mng_setup": ("MngSetup",),
+    "mng_configuration_file": ("MngConfigurationFile",),
+    "mng_season": ("MngSeason",),
+    "forecast": ("Forecast",),
+    "forecast_analogue": ("ForecastAnalogue",),
+    "historical_agroclimatic_indicator": ("HistoricalAgroclimaticIndicator",),
+    "phenological_stage_stress": ("PhenologicalStageStress",),
+    "role": ("Role",),
+    "user": ("User",),
+    "user_access": ("UserAccess",),
+    "mng_country_indicator": ("MngCountryIndicator",),
+    "mng_indicator_category": ("MngIndicatorCategory",),
+    "mng_indicators_features": ("MngIndicatorsFeatures",),
+    "mng_country_climate_measure": ("MngCountryClimateMeasure",),
+}
+
+__all__ = [name for names in _SUBMODULES.values() for name in names]
+__getattr__, __dir__ = lazy_exports(__name__, _SUBMODULES)
+
+
+def import_all():
+    """Import every model, registering all tables in Base.metadata"""
+    for name in __all__:
+        __getattr__(name)
+
+
+@event.listens_for(Mapper, "before_configured")
+def _import_before_configure():
+    """Relationships refer to other models by name, so all of them must exist before mappers are configured"""
+    import_all()
@@ -0,0 +1,30 @@
+from sqlalchemy import Column, BigInteger, Integer, Date, DateTime, Enum, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from datetime import datetime, timezone
+from ..database.base import Base
+from ..enums import Period
+
+class ClimateDataAvailability(Base):
+    """
+    Span and row count of every (location, measure) series of climate_historical_daily
+    (temporality DAILY) and climate_historical_monthly (MONTHLY), maintained by the writes of
+    their services and pipelines so date-range and availability reads need no scan of the data.
+    """
+    __tablename__ = 'climate_data_availability'
+
+    id = Column(BigInteger, primary_key=True)
+    temporality = Column(Enum(Period), nullable=False)
+    location_id = Column(BigInteger, ForeignKey("mng_location.id"), nullable=False)
+    measure_id = Column(Integer, ForeignKey("mng_climate_measure.id"), nullable=False)
+    min_date = Column(Date, nullable=False)
+    max_date = Column(Date, nullable=False)
+    count = Column(BigInteger, nullable=False)
+    last_ingest = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (
+        # One row per series; also serves the lookups by (temporality, location)
+        Index('ix_availability_temporality_location_measure', temporality, location_id, measure_id, unique=True),
+    )
+
+    location = relationship("MngLocation")
+    measure = relationship("MngClimateMeasure")
@@ -1,23 +1,29 @@
-from sqlalchemy import Column, BigInteger, Integer, Date, Float, ForeignKey, Index
+from sqlalchemy import Column, BigInteger, Integer, Date, Float, ForeignKey, Index, Sequence
 from sqlalchemy.orm import relationship
 from ..database.base import Base
+from ..database.partitioning import register_partitioned_table
 
 class ClimateHistoricalDaily(Base):
     __tablename__ = 'climate_historical_daily'
 
-    id = Column(BigInteger, primary_key=True)
+    id = Column(BigInteger, Sequence('climate_historical_daily_id_seq'), primary_key=True)
     location_id = Column(BigInteger, ForeignKey("mng_location.id"), nullable=False)
     measure_id = Column(Integer, ForeignKey("mng_climate_measure.id"), nullable=False)
+    # Partition key on PostgreSQL, where it is appended to the primary key (see register_partitioned_table)
     date = Column(Date, nullable=False)
     value = Column(Float, nullable=False)
 
     __table_args__ = (
-        Index('ix_daily_location', location_id),
+        # Lookups by location or (location, measure) use the leading columns of the unique index
         Index('ix_daily_location_date', location_id, date),
-        Index('ix_daily_location_measure', location_id, measure_id),
-        Index('ix_daily_location_measure_date', location_id, measure_id, date, unique=True),
-        Index('ix_daily_date', date),
+        # Covering (INCLUDE value) so series reads are answered by index-only scans
+        Index('ix_daily_location_measure_date', location_id, measure_id, date, unique=True, postgresql_include=['value']),
+        # Rows arrive roughly in date order, so a BRIN index is enough for date-range scans
+        Index('ix_daily_date', date, postgresql_using='brin'),
+        {"postgresql_partition_by": "RANGE (date)"},
     )
 
     location = relationship("MngLocation", back_populates="daily_measurements")
-    measure = relationship("MngClimateMeasure", back_populates="daily_measurements")
\ No newline at end of file
+    measure = relationship("MngClimateMeasure", back_populates="daily_measurements")
+
+register_partitioned_table(ClimateHistoricalDaily.__table__)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, BigInteger, Integer, Float, Date, Enum, ForeignKey
+from sqlalchemy import Column, BigInteger, Integer, Float, Date, Enum, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import date
 from ..database.base import Base
@@ -17,6 +17,11 @@ class ClimateHistoricalIndicator(Base):
     start_date = Column(Date, nullable=False)
     end_date = Column(Date)
 
+    __table_args__ = (
+        # One value per indicator, location, period and start date (upsert key)
+        Index('ix_indicator_indicator_location_period_start', indicator_id, location_id, period, start_date, unique=True),
+        Index('ix_indicator_location_period_start', location_id, period, start_date),
+    )
 
     indicator = relationship("MngIndicator", back_populates="climate_historical_indicators")
     location = relationship("MngLocation", back_populates="climate_historical_indicators")
\ No newline at end of file
@@ -1,23 +1,29 @@
-from sqlalchemy import Column, BigInteger, Integer, Date, Float, ForeignKey, Index
+from sqlalchemy import Column, BigInteger, Integer, Date, Float, ForeignKey, Index, Sequence
 from sqlalchemy.orm import relationship
 from ..database.base import Base
+from ..database.partitioning import register_partitioned_table
 
 class ClimateHistoricalMonthly(Base):
     __tablename__ = 'climate_historical_monthly'
 
-    id = Column(BigInteger, primary_key=True)
+    id = Column(BigInteger, Sequence('climate_historical_monthly_id_seq'), primary_key=True)
     location_id = Column(BigInteger, ForeignKey("mng_location.id"), nullable=False)
     measure_id = Column(Integer, ForeignKey("mng_climate_measure.id"), nullable=False)
+    # Partition key on PostgreSQL, where it is appended to the primary key (see register_partitioned_table)
     date = Column(Date, nullable=False)
     value = Column(Float, nullable=False)
 
     __table_args__ = (
-        Index('ix_monthly_location', location_id),
+        # Lookups by location or (location, measure) use the leading columns of the unique index
         Index('ix_monthly_location_date', location_id, date),
-        Index('ix_monthly_location_measure', location_id, measure_id),
-        Index('ix_monthly_location_measure_date', location_id, measure_id, date, unique=True),
-        Index('ix_monthly_date', date),
+        # Covering (INCLUDE value) so series reads are answered by index-only scans
+        Index('ix_monthly_location_measure_date', location_id, measure_id, date, unique=True, postgresql_include=['value']),
+        # Rows arrive roughly in date order, so a BRIN index is enough for date-range scans
+        Index('ix_monthly_date', date, postgresql_using='brin'),
+        {"postgresql_partition_by": "RANGE (date)"},
     )
 
     location = relationship("MngLocation", back_populates="monthly_measurements")
-    measure = relationship("MngClimateMeasure", back_populates="monthly_measurements")
\ No newline at end of file
+    measure = relationship("MngClimateMeasure", back_populates="monthly_measurements")
+
+register_partitioned_table(ClimateHistoricalMonthly.__table__)
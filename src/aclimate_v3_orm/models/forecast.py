@@ -1,4 +1,4 @@
-from sqlalchemy import Column, BigInteger, Boolean, DateTime, Date, Integer, ForeignKey
+from sqlalchemy import Column, BigInteger, Boolean, DateTime, Date, Integer, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from ..database.base import Base
 from datetime import datetime, timezone
@@ -13,6 +13,11 @@ class Forecast(Base):
     register = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
     updated = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
 
+    __table_args__ = (
+        # Latest forecast per country
+        Index('ix_forecast_country_run_date', country_id, run_date),
+    )
+
     # Relationships
     analogues = relationship("ForecastAnalogue", back_populates="forecast")
     
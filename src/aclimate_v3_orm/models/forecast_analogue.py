@@ -1,5 +1,5 @@
 # forecast_analogue.py
-from sqlalchemy import Column, BigInteger, String, Integer, Float, ForeignKey
+from sqlalchemy import Column, BigInteger, String, Integer, Float, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from ..database.base import Base
 
@@ -14,4 +14,10 @@ class ForecastAnalogue(Base):
     indices_used = Column(String(255))
     year = Column(Integer, nullable=False)
     similarity_score = Column(Float, nullable=False)
-    rank = Column(Integer, nullable=False)
\ No newline at end of file
+    rank = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        # Per-forecast, per-location analogues in rank order (top-k and get_by_forecast)
+        Index('ix_forecast_analogue_forecast_location_rank', forecast_id, location_id, rank),
+        Index('ix_forecast_analogue_location', location_id),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, BigInteger, Integer, Float, Date, ForeignKey
+from sqlalchemy import Column, BigInteger, Integer, Float, Date, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from ..database.base import Base
 
@@ -13,6 +13,11 @@ class HistoricalAgroclimaticIndicator(Base):
     start_date = Column(Date, nullable=False)
     end_date = Column(Date, nullable=False)
 
+    __table_args__ = (
+        # Stage window lookups of the agroclimatic engine
+        Index('ix_agroclimatic_location_stage_indicator_start', location_id, phenological_id, indicator_id, start_date),
+    )
+
     indicator = relationship("MngIndicator", back_populates="historical_agroclimatic_indicators")
     location = relationship("MngLocation", back_populates="historical_agroclimatic_indicators")
     phenological_stage = relationship("MngPhenologicalStage", back_populates="historical_agroclimatic_indicators")
\ No newline at end of file
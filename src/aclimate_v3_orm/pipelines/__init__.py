@@ -0,0 +1,4 @@
+from .parquet_export import ParquetExporter, EXPORT_TABLES, MANIFEST_NAME, read_manifest
+from .file_import import ClimateFileImporter, IMPORT_TABLES
+from .bulk_write import write_columns
+from .ingest import IngestOrchestrator, IngestShard, INGEST_TABLES
@@ -0,0 +1,52 @@
+"""
+Column-oriented bulk inserts that skip ORM objects and pydantic schemas.
+
+Rows already validated as arrays are written with the fastest path of the session's
+database: COPY FROM STDIN on PostgreSQL with psycopg2, a multi-row INSERT elsewhere.
+"""
+import csv
+import io
+from typing import Dict
+import numpy as np
+from sqlalchemy import Sequence, insert, text
+from sqlalchemy.orm import Session
+
+
+def write_columns(session: Session, model, columns: Dict[str, np.ndarray]) -> int:
+    """
+    Insert parallel columns into the table of model, in the session's transaction.
+    Columns left out take their server defaults; a left-out id backed by a sequence is
+    drawn from it for COPY, so the load does not depend on the column's DEFAULT.
+
+    Returns:
+        Number of rows written
+    """
+    names = list(columns)
+    values = [np.asarray(columns[name]).tolist() for name in names]
+    count = len(values[0]) if values else 0
+    if not count:
+        return 0
+
+    connection = session.connection()
+    if connection.dialect.name == "postgresql" and connection.dialect.driver == "psycopg2":
+        sequence = model.__table__.c.id.default if "id" in model.__table__.c else None
+        if "id" not in names and isinstance(sequence, Sequence):
+            ids = connection.execute(
+                text("SELECT nextval(:sequence) FROM generate_series(1, :count)"),
+                {"sequence": sequence.name, "count": count}
+            ).scalars().all()
+            names.insert(0, "id")
+            values.insert(0, ids)
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(zip(*values))
+        buffer.seek(0)
+        cursor = connection.connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {model.__table__.name} ({', '.join(names)}) FROM STDIN WITH (FORMAT csv)", buffer
+            )
+        finally:
+            cursor.close()
+    else:
+        session.execute(insert(model.__table__), [dict(zip(names, row)) for row in zip(*values)])
+    return count
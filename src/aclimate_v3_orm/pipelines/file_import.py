@@ -0,0 +1,250 @@
+"""
+Import of CSV and Parquet files into the historical daily and monthly tables.
+
+Files are read in record batches. Location and measure names are mapped to ids through
+lookups cached by the importer, each batch is checked column by column (no per-row
+pydantic objects) and written with write_columns(), committing once per batch. An
+optional checkpoint file records the batches already committed, so an interrupted import
+resumes where it stopped without reading them again. Every batch leaves out the rows
+already stored, so re-importing a file (with or without a checkpoint, including a batch
+committed by a run that stopped before recording it) or a file overlapping stored data
+only adds the missing rows instead of failing on the unique index partway through.
+"""
+import json
+import os
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Union
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from ..database import get_db
+from ..models import ClimateHistoricalDaily, ClimateHistoricalMonthly, MngClimateMeasure, MngLocation
+from ..enums import Period
+from ..services.base_service import BaseService
+from ..services.climate_data_availability_service import ClimateDataAvailabilityService
+from ..validations import BatchValidation, BatchValidator
+from .bulk_write import write_columns
+
+# Importable tables by name
+IMPORT_TABLES = {
+    "daily": ClimateHistoricalDaily,
+    "monthly": ClimateHistoricalMonthly,
+}
+
+# MngLocation columns a file can identify locations by
+LOCATION_KEYS = ("id", "ext_id", "machine_name")
+
+ERROR_MODES = ("raise", "skip")
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.csv
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError("File import requires pyarrow, install aclimate_v3_orm[arrow]") from e
+    return pa
+
+
+class ClimateFileImporter:
+    """
+    Loads files with one row per (location, measure, date, value) into a historical table.
+
+    The location column is "location_id" when location_key is "id" and "location" otherwise;
+    measures come from "measure_id" or, when that column is missing, from "measure"
+    short names. Dates are ISO dates (first day of the month for monthly data).
+
+    Args:
+        table: "daily" or "monthly"
+        batch_size: Rows per record batch; CSV files are read in blocks of batch_size * 64 bytes
+        location_key: MngLocation column the location values refer to
+        on_error: "raise" on the first batch with invalid rows, or "skip" them and count them as rejected
+        progress: Called after every committed batch with the running totals
+    """
+
+    def __init__(self,
+                 table: str = "daily",
+                 batch_size: int = 50_000,
+                 location_key: str = "machine_name",
+                 on_error: str = "raise",
+                 progress: Optional[Callable[[Dict[str, Any]], None]] = None):
+        if table not in IMPORT_TABLES:
+            raise ValueError(f"Invalid table '{table}', expected one of {', '.join(IMPORT_TABLES)}")
+        if location_key not in LOCATION_KEYS:
+            raise ValueError(f"Invalid location_key '{location_key}', expected one of {', '.join(LOCATION_KEYS)}")
+        if on_error not in ERROR_MODES:
+            raise ValueError(f"Invalid on_error '{on_error}', expected one of {', '.join(ERROR_MODES)}")
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.table = table
+        self.model = IMPORT_TABLES[table]
+        self.batch_size = batch_size
+        self.location_key = location_key
+        self.on_error = on_error
+        self.progress = progress
+        # name -> id lookups shared by every file this importer loads
+        self.location_ids: Dict[Any, int] = {}
+        self.measure_ids: Dict[str, int] = {}
+
+    def import_file(self,
+                    path: Union[str, Path],
+                    checkpoint: Optional[Union[str, Path]] = None,
+                    db: Optional[Session] = None) -> Dict[str, Any]:
+        """
+        Import a .csv or .parquet file.
+
+        Args:
+            path: File to import
+            checkpoint: JSON file tracking the committed batches. An existing checkpoint of the
+                same file (same size, modification time and batch size) skips the batches it lists.
+            db: Optional database session; committed after every batch
+
+        Returns:
+            Dict with the "rows" written (rows already stored are not counted), the "rejected"
+            rows and the "batches" committed
+        """
+        path = Path(path)
+        identity = {
+            "path": str(path.resolve()),
+            "size": path.stat().st_size,
+            "mtime_ns": path.stat().st_mtime_ns,
+            "batch_size": self.batch_size,
+        }
+        state = {"batches": 0, "rows": 0, "rejected": 0}
+        if checkpoint and Path(checkpoint).exists():
+            with open(checkpoint) as file:
+                saved = json.load(file)
+            if all(saved.get(key) == value for key, value in identity.items()):
+                state = {key: saved[key] for key in state}
+
+        with nullcontext(db) if db else get_db() as session:
+            for number, batch in enumerate(self._batches(path)):
+                if number < state["batches"]:
+                    continue
+                columns, rejected = self._prepare(batch, number, session)
+                columns = self._drop_existing(session, columns)
+                state["rows"] += write_columns(session, self.model, columns)
+                ClimateDataAvailabilityService().add_rows(
+                    session, Period(self.table), columns["location_id"], columns["measure_id"], columns["date"]
+                )
+                state["rejected"] += rejected
+                state["batches"] = number + 1
+                session.commit()
+                if BaseService.result_cache is not None:
+                    BaseService.result_cache.invalidate(self.model.__tablename__, np.unique(columns["location_id"]).tolist())
+
+                if checkpoint:
+                    self._save_checkpoint(Path(checkpoint), {**identity, **state})
+                if self.progress:
+                    self.progress({"file": str(path), **state})
+        return state
+
+    def _batches(self, path: Path) -> Iterator[Any]:
+        """Record batches of the file"""
+        pa = _require_pyarrow()
+        suffix = path.suffix.lower()
+        if suffix == ".parquet":
+            yield from pa.parquet.ParquetFile(path).iter_batches(batch_size=self.batch_size)
+        elif suffix == ".csv":
+            reader = pa.csv.open_csv(
+                path,
+                read_options=pa.csv.ReadOptions(block_size=max(self.batch_size * 64, 1 << 16)),
+                convert_options=pa.csv.ConvertOptions(column_types={"date": pa.date32(), "value": pa.float64()})
+            )
+            yield from reader
+        else:
+            raise ValueError(f"Unsupported file type '{path.suffix}', expected .csv or .parquet")
+
+    def _prepare(self, batch, number: int, session: Session):
+        """Map and check the columns of a record batch; returns the columns to write and the rejected count"""
+        pa = _require_pyarrow()
+        names = batch.schema.names
+        location_column = "location_id" if self.location_key == "id" else "location"
+        measure_column = "measure_id" if "measure_id" in names else "measure"
+        missing = {location_column, measure_column, "date", "value"} - set(names)
+        if missing:
+            raise ValueError(f"Missing columns {', '.join(sorted(missing))}")
+
+        def column(name, type_=None):
+            array = batch.column(names.index(name))
+            return (array.cast(type_) if type_ is not None else array).to_numpy(zero_copy_only=False)
+
+        dates = column("date", pa.date32()).astype("datetime64[D]")
+        values = column("value", pa.float64())
+        if self.location_key == "id":
+            location_ids = column("location_id", pa.int64())
+            self._lookup(session, MngLocation.id, self.location_ids, np.unique(location_ids).tolist())
+        else:
+            location_ids = self._map(session, getattr(MngLocation, self.location_key), self.location_ids, column("location"))
+        if measure_column == "measure_id":
+            measure_ids = column("measure_id", pa.int64())
+            self._lookup(session, MngClimateMeasure.id, self.measure_ids, np.unique(measure_ids).tolist())
+        else:
+            measure_ids = self._map(session, MngClimateMeasure.short_name, self.measure_ids, column("measure"))
+
+        result = BatchValidation(len(values))
+        result.flag("unknown location", ~np.isin(location_ids, list(self.location_ids.values())))
+        result.flag("unknown measure", ~np.isin(measure_ids, list(self.measure_ids.values())))
+        BatchValidator.check_dates_not_future(result, dates)
+        BatchValidator.check_numeric(result, values)
+        if self.model is ClimateHistoricalMonthly:
+            result.flag("date not on the first of the month", ~np.isnat(dates) & (dates != dates.astype("datetime64[M]").astype("datetime64[D]")))
+        if self.on_error == "raise":
+            result.raise_if_invalid(f"Batch {number}")
+
+        keep = result.valid
+        return {
+            "location_id": location_ids[keep],
+            "measure_id": measure_ids[keep],
+            "date": dates[keep],
+            "value": values[keep],
+        }, int(np.count_nonzero(result.invalid))
+
+    def _drop_existing(self, session: Session, columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Leave out the rows whose (location, measure, date) is already in the table"""
+        if not len(columns["date"]):
+            return columns
+        stored = {tuple(row) for row in session.execute(
+            select(self.model.location_id, self.model.measure_id, self.model.date).where(
+                self.model.location_id.in_(np.unique(columns["location_id"]).tolist()),
+                self.model.date >= columns["date"].min().tolist(),
+                self.model.date <= columns["date"].max().tolist()
+            )
+        )}
+        if not stored:
+            return columns
+        keep = np.array([
+            key not in stored
+            for key in zip(columns["location_id"].tolist(), columns["measure_id"].tolist(), columns["date"].tolist())
+        ], dtype=bool)
+        return {name: column[keep] for name, column in columns.items()}
+
+    @staticmethod
+    def _lookup(session: Session, key_column, cache: Dict[Any, int], keys):
+        """Add the ids of keys not cached yet, with one query"""
+        pending = [key for key in keys if key not in cache and key is not None]
+        if not pending:
+            return
+        model_id = key_column.class_.id
+        found: Dict[Any, int] = {}
+        for key, id in session.execute(select(key_column, model_id).where(key_column.in_(pending))):
+            if key in found and found[key] != id:
+                raise ValueError(f"'{key}' matches more than one {key_column.class_.__name__} by {key_column.key}")
+            found[key] = id
+        cache.update(found)
+
+    def _map(self, session: Session, key_column, cache: Dict[Any, int], keys: np.ndarray) -> np.ndarray:
+        """Ids of the keys of a column (-1 when unknown), looking up each distinct key once"""
+        unique, inverse = np.unique(keys.astype(str), return_inverse=True)
+        self._lookup(session, key_column, cache, unique.tolist())
+        return np.array([cache.get(key, -1) for key in unique.tolist()], dtype=np.int64)[inverse.reshape(-1)]
+
+    @staticmethod
+    def _save_checkpoint(path: Path, state: Dict[str, Any]):
+        """Replace the checkpoint atomically"""
+        temporary = path.with_name(f"{path.name}.tmp")
+        with open(temporary, "w") as file:
+            json.dump(state, file)
+        os.replace(temporary, path)
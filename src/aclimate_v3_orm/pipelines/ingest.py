@@ -0,0 +1,212 @@
+"""
+Parallel backfills of the historical daily and monthly tables.
+
+Work is split into (location, year) shards. Each shard is loaded, checked with
+BatchValidator and written in its own transaction by a worker process with its own
+NullPool engine, created in the worker after it starts. The transaction also updates the
+location's rows of the availability summary, which every year of the location shares, so
+shards of one location are never in flight at the same time. Shards of different
+locations share no rows of the table or the summary, so workers never wait on each other.
+Failed shards are retried; since a shard is one transaction (and, with replace, deletes
+its rows first) a retry never duplicates data.
+"""
+import time
+from collections import deque, namedtuple
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, Optional
+import numpy as np
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+from ..models import ClimateHistoricalDaily, ClimateHistoricalMonthly
+from ..enums import Period
+from ..services.base_service import BaseService
+from ..services.climate_data_availability_service import ClimateDataAvailabilityService
+from ..validations import BatchValidator
+from .bulk_write import write_columns
+
+# Tables a backfill can write by name
+INGEST_TABLES = {
+    "daily": ClimateHistoricalDaily,
+    "monthly": ClimateHistoricalMonthly,
+}
+
+IngestShard = namedtuple("IngestShard", ["location_id", "year"])
+
+# Engine of the current worker process
+_worker_engine = None
+
+
+def _init_worker(database_url: str):
+    """Process pool initializer: one engine per worker, without pooled connections inherited from the parent"""
+    global _worker_engine
+    _worker_engine = create_engine(database_url, poolclass=NullPool)
+
+
+def _ingest_shard(table: str, shard: IngestShard, loader: Callable, replace: bool) -> Dict[str, Any]:
+    """Load, check and write one shard in a single transaction"""
+    model = INGEST_TABLES[table]
+    columns = loader(shard.location_id, shard.year)
+    dates = np.asarray(columns["date"]).astype("datetime64[D]")
+    location_ids = np.full(len(dates), shard.location_id, dtype=np.int64)
+
+    result = BatchValidator.validate_historical({
+        "location_id": location_ids,
+        "measure_id": columns["measure_id"],
+        "date": dates,
+        "value": columns["value"],
+    })
+    # Rows of another year would break the shard's isolation
+    result.flag("date outside the shard year", ~np.isnat(dates) & (dates.astype("datetime64[Y]").astype(np.int64) + 1970 != shard.year))
+    keep = result.valid
+
+    with Session(_worker_engine) as session, session.begin():
+        if replace:
+            session.execute(delete(model).where(
+                model.location_id == shard.location_id,
+                model.date >= date(shard.year, 1, 1),
+                model.date <= date(shard.year, 12, 31)
+            ))
+        rows = {
+            "location_id": location_ids[keep],
+            "measure_id": np.asarray(columns["measure_id"])[keep],
+            "date": dates[keep],
+            "value": np.asarray(columns["value"], dtype=np.float64)[keep],
+        }
+        written = write_columns(session, model, rows)
+        # Replaced rows cannot be subtracted from the summary, so the location's series are recomputed
+        if replace:
+            ClimateDataAvailabilityService().refresh(session, Period(table), [shard.location_id])
+        else:
+            ClimateDataAvailabilityService().add_rows(session, Period(table), rows["location_id"], rows["measure_id"], rows["date"])
+    return {"rows": written, "rejected": result.counts()}
+
+
+def _next_shard(queue: deque, busy: set) -> Optional[IngestShard]:
+    """Take the first queued shard whose location has no shard in flight"""
+    for index, shard in enumerate(queue):
+        if shard.location_id not in busy:
+            del queue[index]
+            return shard
+    return None
+
+
+class _InlineExecutor:
+    """Runs submitted calls immediately in the calling process, for the deterministic mode"""
+
+    def __init__(self, initializer: Callable, initargs: tuple):
+        initializer(*initargs)
+
+    def submit(self, fn: Callable, *args) -> Future:
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        global _worker_engine
+        _worker_engine.dispose()
+        _worker_engine = None
+
+
+class IngestOrchestrator:
+    """
+    Backfills a historical table from a loader, one (location, year) shard per task.
+
+    Args:
+        table: "daily" or "monthly"
+        database_url: Database for the workers (default: the package's DATABASE_URL)
+        max_workers: Worker processes
+        max_in_flight: Shards submitted but not finished (default: 2 * max_workers)
+        retries: Extra attempts for a failed shard
+        replace: Delete the existing rows of a shard before writing it
+        deterministic: Run the shards one by one, in order, in the calling process
+            (for tests against SQLite files)
+    """
+
+    def __init__(self,
+                 table: str = "daily",
+                 database_url: Optional[str] = None,
+                 max_workers: int = 4,
+                 max_in_flight: Optional[int] = None,
+                 retries: int = 2,
+                 replace: bool = False,
+                 deterministic: bool = False):
+        if table not in INGEST_TABLES:
+            raise ValueError(f"Invalid table '{table}', expected one of {', '.join(INGEST_TABLES)}")
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        if retries < 0:
+            raise ValueError("retries cannot be negative")
+        if database_url is None:
+            from ..database import get_engine
+            database_url = get_engine().url.render_as_string(hide_password=False)
+        self.table = table
+        self.database_url = database_url
+        self.max_workers = max_workers
+        self.max_in_flight = max_in_flight or 2 * max_workers
+        self.retries = retries
+        self.replace = replace
+        self.deterministic = deterministic
+
+    def run(self, shards: Iterable[IngestShard], loader: Callable[[int, int], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Ingest every shard.
+
+        Args:
+            shards: (location_id, year) pairs; duplicates are ignored. They run year by year,
+                so consecutive shards belong to different locations
+            loader: Picklable module-level function (location_id, year) -> dict with
+                "measure_id", "date" and "value" columns
+
+        Returns:
+            Metrics: "shards", "completed", "rows", "rejected" (rows per reason), "attempts",
+            "failed" (shard, error) pairs after the last retry, "seconds" and "rows_per_second"
+        """
+        queue = deque(sorted({IngestShard(*shard) for shard in shards}, key=lambda shard: (shard.year, shard.location_id)))
+        metrics = {"shards": len(queue), "completed": 0, "rows": 0, "rejected": {}, "attempts": 0, "failed": []}
+        attempts = {shard: 0 for shard in queue}
+        start = time.perf_counter()
+
+        if self.deterministic:
+            executor = _InlineExecutor(_init_worker, (self.database_url,))
+        else:
+            executor = ProcessPoolExecutor(self.max_workers, initializer=_init_worker, initargs=(self.database_url,))
+        with executor:
+            running: Dict[Future, IngestShard] = {}
+            while queue or running:
+                while len(running) < self.max_in_flight:
+                    shard = _next_shard(queue, {shard.location_id for shard in running.values()})
+                    if shard is None:
+                        break
+                    attempts[shard] += 1
+                    metrics["attempts"] += 1
+                    running[executor.submit(_ingest_shard, self.table, shard, loader, self.replace)] = shard
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    shard = running.pop(future)
+                    try:
+                        outcome = future.result()
+                    except Exception as e:
+                        if attempts[shard] <= self.retries:
+                            queue.append(shard)
+                        else:
+                            metrics["failed"].append((shard, str(e)))
+                        continue
+                    metrics["completed"] += 1
+                    if BaseService.result_cache is not None:
+                        BaseService.result_cache.invalidate(INGEST_TABLES[self.table].__tablename__, [shard.location_id])
+                    metrics["rows"] += outcome["rows"]
+                    for reason, count in outcome["rejected"].items():
+                        metrics["rejected"][reason] = metrics["rejected"].get(reason, 0) + count
+
+        metrics["seconds"] = time.perf_counter() - start
+        metrics["rows_per_second"] = metrics["rows"] / metrics["seconds"] if metrics["seconds"] else 0.0
+        return metrics
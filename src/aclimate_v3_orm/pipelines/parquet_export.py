@@ -0,0 +1,287 @@
+"""
+Export of the historical climate tables to partitioned Parquet datasets.
+
+Rows are streamed from the database in chunks and split by partition (hive style
+country_id=/year=/measure_id= directories; climatology has no year level). Each piece is
+written as its own file by a pool of writer threads, with a bounded number of pending
+writes, so memory stays proportional to the chunk size. A manifest at the dataset root
+records the highest id and date exported per partition and the files holding them, and
+later runs only export rows with a higher id.
+
+Files are written under hidden temporary names (ignored by Parquet readers) and renamed
+once the manifest listing them is in place. A run interrupted before that leaves nothing
+visible, and the next run finishes or discards whatever an interrupted run left behind.
+"""
+import json
+import os
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from ..database import get_db
+from ..models import (
+    ClimateHistoricalClimatology,
+    ClimateHistoricalDaily,
+    ClimateHistoricalMonthly,
+    MngAdmin1,
+    MngAdmin2,
+    MngLocation
+)
+
+# Exportable tables by name
+EXPORT_TABLES = {
+    "daily": ClimateHistoricalDaily,
+    "monthly": ClimateHistoricalMonthly,
+    "climatology": ClimateHistoricalClimatology,
+}
+
+# File at the dataset root with the export watermarks
+MANIFEST_NAME = "_manifest.json"
+
+# Suffix of the part files of a run whose manifest is not written yet
+PENDING_SUFFIX = ".tmp"
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet export requires pyarrow, install aclimate_v3_orm[arrow]") from e
+    return pa, pq
+
+
+def read_manifest(root: Union[str, Path]) -> Optional[Dict[str, Any]]:
+    """Manifest of a dataset, or None when nothing was exported to root yet"""
+    path = Path(root) / MANIFEST_NAME
+    if not path.exists():
+        return None
+    with open(path) as file:
+        return json.load(file)
+
+
+class ParquetExporter:
+    """
+    Streams climate_historical_daily, monthly or climatology into a Parquet dataset.
+
+    Args:
+        chunk_size: Rows fetched from the database per chunk
+        float32: Store values as float32 instead of float64
+        max_workers: Writer threads; at most twice as many pieces wait to be written
+        compression: Parquet compression codec
+    """
+
+    def __init__(self, chunk_size: int = 100_000, float32: bool = False, max_workers: int = 4, compression: str = "snappy"):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.chunk_size = chunk_size
+        self.float32 = float32
+        self.max_workers = max_workers
+        self.compression = compression
+
+    def export(self,
+               table: str,
+               root: Union[str, Path],
+               country_ids: Optional[Iterable[int]] = None,
+               measure_ids: Optional[Iterable[int]] = None,
+               start_date: Optional[date] = None,
+               end_date: Optional[date] = None,
+               incremental: bool = True,
+               db: Optional[Session] = None) -> Dict[str, Any]:
+        """
+        Export a table to root.
+
+        Args:
+            table: "daily", "monthly" or "climatology"
+            root: Dataset directory
+            country_ids, measure_ids, start_date, end_date: Optional filters (dates not for climatology)
+            incremental: Only export rows above the manifest watermarks. With False the files of the
+                partitions in the existing manifest are removed and everything is exported again.
+
+        Returns:
+            Dict with the exported "rows", the "files" written and the "partitions" touched.
+            Values updated in place keep their id, so only a full export picks them up. The
+            manifest is written before the files become visible: rows of an interrupted run are
+            exported again by the next one, and its files are discarded.
+        """
+        if table not in EXPORT_TABLES:
+            raise ValueError(f"Invalid table '{table}', expected one of {', '.join(EXPORT_TABLES)}")
+        model = EXPORT_TABLES[table]
+        dated = table != "climatology"
+        if not dated and (start_date or end_date):
+            raise ValueError("climatology has no dates to filter by")
+        _require_pyarrow()
+
+        root = Path(root)
+        scope = {
+            "country_ids": sorted(country_ids) if country_ids else None,
+            "measure_ids": sorted(measure_ids) if measure_ids else None,
+            "start_date": start_date.isoformat() if start_date else None,
+            "end_date": end_date.isoformat() if end_date else None,
+        }
+        manifest = read_manifest(root)
+        if manifest and manifest["table"] != table:
+            raise ValueError(f"{root} holds an export of '{manifest['table']}', not '{table}'")
+        self._recover(root, manifest)
+        if manifest and not incremental:
+            self._remove_files(root, manifest)
+            manifest = None
+        partitions = manifest["partitions"] if manifest else {}
+
+        query = self._query(model, dated, scope["country_ids"], scope["measure_ids"], start_date, end_date)
+        if manifest and manifest["scope"] == scope and manifest["max_id"] is not None:
+            # Everything up to the watermark was exported by a run with the same filters
+            query = query.where(model.id > manifest["max_id"])
+
+        run = uuid.uuid4().hex[:8]
+        touched = set()
+        written = []
+        rows = files = 0
+        with nullcontext(db) if db else get_db() as session, ThreadPoolExecutor(self.max_workers) as pool:
+            pending = set()
+            result = session.execute(query.execution_options(yield_per=self.chunk_size))
+            for chunk_number, chunk in enumerate(result.partitions()):
+                for key, piece in self._split(chunk, dated, partitions):
+                    stats = partitions.setdefault(key, {"max_id": None, "max_date": None, "rows": 0, "files": 0, "paths": []})
+                    stats["max_id"] = max(int(piece["id"].max()), stats["max_id"] or 0)
+                    if dated:
+                        last = str(piece["date"].max())
+                        stats["max_date"] = max(last, stats["max_date"] or last)
+                    stats["rows"] += len(piece["id"])
+                    stats["files"] += 1
+                    touched.add(key)
+                    rows += len(piece["id"])
+                    files += 1
+
+                    name = f"part-{run}-{chunk_number:06d}.parquet"
+                    stats.setdefault("paths", []).append(name)
+                    written.append(root / key / name)
+                    pending.add(pool.submit(self._write, self._pending_path(root / key / name), piece))
+                    if len(pending) >= 2 * self.max_workers:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            future.result()
+            for future in pending:
+                future.result()
+
+        self._write_manifest(root, {
+            "table": table,
+            "scope": scope,
+            "max_id": max((stats["max_id"] for stats in partitions.values()), default=None),
+            "exported_at": datetime.now(timezone.utc).isoformat(),
+            "partitions": partitions,
+        })
+        for path in written:
+            os.replace(self._pending_path(path), path)
+        return {"rows": rows, "files": files, "partitions": sorted(touched)}
+
+    @staticmethod
+    def _query(model, dated: bool, country_ids, measure_ids, start_date, end_date):
+        """Rows of the table with the country of their location"""
+        query = select(
+            model.id, model.location_id, model.measure_id, model.date if dated else model.month,
+            model.value, MngAdmin1.country_id
+        ).join(
+            MngLocation, MngLocation.id == model.location_id
+        ).join(
+            MngAdmin2, MngAdmin2.id == MngLocation.admin_2_id
+        ).join(
+            MngAdmin1, MngAdmin1.id == MngAdmin2.admin_1_id
+        )
+        if country_ids:
+            query = query.where(MngAdmin1.country_id.in_(country_ids))
+        if measure_ids:
+            query = query.where(model.measure_id.in_(measure_ids))
+        if start_date:
+            query = query.where(model.date >= start_date)
+        if end_date:
+            query = query.where(model.date <= end_date)
+        return query
+
+    @staticmethod
+    def _split(chunk: List[Any], dated: bool, partitions: Dict[str, Dict[str, Any]]):
+        """Yield (partition path, columns) for the rows of a chunk above their partition's watermark"""
+        ids, location_ids, measure_ids, times, values, country_ids = zip(*chunk)
+        columns = {
+            "id": np.array(ids, dtype=np.int64),
+            "location_id": np.array(location_ids, dtype=np.int64),
+            "date" if dated else "month": np.array(times, dtype="datetime64[D]" if dated else np.int8),
+            "value": np.array(values, dtype=np.float64),
+        }
+        keys = [np.array(country_ids, dtype=np.int64), np.array(measure_ids, dtype=np.int64)]
+        if dated:
+            keys.insert(1, columns["date"].astype("datetime64[Y]").astype(np.int64) + 1970)
+        unique, inverse = np.unique(np.stack(keys, axis=1), axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+
+        for number, key in enumerate(unique):
+            if dated:
+                path = f"country_id={key[0]}/year={key[1]}/measure_id={key[2]}"
+            else:
+                path = f"country_id={key[0]}/measure_id={key[1]}"
+            mask = inverse == number
+            watermark = partitions.get(path, {}).get("max_id")
+            if watermark is not None:
+                mask &= columns["id"] > watermark
+            if mask.any():
+                yield path, {name: column[mask] for name, column in columns.items()}
+
+    def _write(self, path: Path, columns: Dict[str, np.ndarray]):
+        """Write one piece; only the low-cardinality columns (location ids, dates) are dictionary-encoded"""
+        pa, pq = _require_pyarrow()
+        columns = dict(columns, value=columns["value"].astype(np.float32 if self.float32 else np.float64))
+        table = pa.table({name: pa.array(column) for name, column in columns.items()})
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        dictionary = ["location_id", "date" if "date" in columns else "month"]
+        pq.write_table(table, path, compression=self.compression, use_dictionary=dictionary)
+
+    @staticmethod
+    def _pending_path(path: Path) -> Path:
+        """Hidden name of a part file until the manifest listing it is written"""
+        return path.with_name(f".{path.name}{PENDING_SUFFIX}")
+
+    @staticmethod
+    def _recover(root: Path, manifest: Optional[Dict[str, Any]]):
+        """
+        Clean up after an interrupted run: rename the pending files the manifest lists (the run
+        stopped after writing it), and delete pending or part files it does not list.
+        """
+        partitions = manifest["partitions"] if manifest else {}
+        for path in root.glob(f"**/.part-*.parquet{PENDING_SUFFIX}"):
+            final = path.with_name(path.name[1:-len(PENDING_SUFFIX)])
+            key = final.parent.relative_to(root).as_posix()
+            if final.name in partitions.get(key, {}).get("paths", []):
+                os.replace(path, final)
+            else:
+                path.unlink()
+        for key, stats in partitions.items():
+            if "paths" not in stats:  # manifest written before files were listed
+                continue
+            for path in (root / key).glob("part-*.parquet"):
+                if path.name not in stats["paths"]:
+                    path.unlink()
+
+    @staticmethod
+    def _remove_files(root: Path, manifest: Dict[str, Any]):
+        """Delete the files written by earlier exports"""
+        for key in manifest["partitions"]:
+            for path in (root / key).glob("part-*.parquet"):
+                path.unlink()
+        (root / MANIFEST_NAME).unlink()
+
+    @staticmethod
+    def _write_manifest(root: Path, manifest: Dict[str, Any]):
+        """Replace the manifest atomically, so an interrupted export keeps the previous watermarks"""
+        root.mkdir(parents=True, exist_ok=True)
+        temporary = root / f"{MANIFEST_NAME}.tmp"
+        with open(temporary, "w") as file:
+            json.dump(manifest, file, indent=2, sort_keys=True)
+        os.replace(temporary, root / MANIFEST_NAME)
@@ -1,31 +1,40 @@
-from .mng_admin_1_schema import Admin1Read, Admin1Create, Admin1Update
-from .mng_admin_2_schema import Admin2Read, Admin2Create, Admin2Update
-from .mng_country_schema import CountryCreate, CountryRead, CountryUpdate
-from .mng_location_schema import LocationCreate, LocationRead, LocationUpdate
-from .mng_climate_measure_schema import ClimateMeasureRead, ClimateMeasureCreate, ClimateMeasureUpdate
-from .mng_indicators_schema import IndicatorCreate, IndicatorRead, IndicatorUpdate
-from .climate_historical_climatology_schema import ClimateHistoricalClimatologyRead, ClimateHistoricalClimatologyCreate, ClimateHistoricalClimatologyUpdate
-from .climate_historical_daily_schema import ClimateHistoricalDailyCreate, ClimateHistoricalDailyUpdate, ClimateHistoricalDailyRead
-from .climate_historical_monthly_schema import ClimateHistoricalMonthlyCreate, ClimateHistoricalMonthlyRead, ClimateHistoricalMonthlyUpdate
-from .climate_historical_indicator_schema import ClimateHistoricalIndicatorCreate, ClimateHistoricalIndicatorRead, ClimateHistoricalIndicatorUpdate
-from .mng_source_schema import SourceCreate, SourceRead, SourceUpdate
-from .mng_cultivar_schema import CultivarCreate, CultivarRead, CultivarUpdate
-from .mng_soil_schema import SoilCreate, SoilRead, SoilUpdate
-from .mng_data_source_schema import DataSourceCreate, DataSourceRead, DataSourceUpdate
-from .mng_phenological_stage_schema import PhenologicalStageCreate, PhenologicalStageRead, PhenologicalStageUpdate
-from .mng_stress_schema import StressCreate, StressRead, StressUpdate
-from .mng_crop_schema import CropCreate, CropRead, CropUpdate
-from .mng_setup_schema import SetupCreate, SetupRead, SetupUpdate
-from .mng_configuration_file_schema import ConfigurationFileCreate, ConfigurationFileRead, ConfigurationFileUpdate
-from .mng_season_schema import SeasonCreate, SeasonRead, SeasonUpdate
-from .forecast_schema import ForecastCreate, ForecastRead, ForecastUpdate
-from .forecast_analogue_schema import ForecastAnalogueCreate, ForecastAnalogueRead, ForecastAnalogueUpdate
-from .historical_agroclimatic_indicator_schema import HistoricalAgroclimaticIndicatorCreate, HistoricalAgroclimaticIndicatorRead, HistoricalAgroclimaticIndicatorUpdate
-from .phenological_stage_stress_schema import PhenologicalStageStressCreate, PhenologicalStageStressRead, PhenologicalStageStressUpdate
-from .role_schema import RoleCreate, RoleRead, RoleUpdate
-from .user_schema import UserCreate, UserRead, UserUpdate
-from .user_access_schema import UserAccessCreate, UserAccessRead, UserAccessUpdate
-from .mng_country_indicator_schema import CountryIndicatorCreate, CountryIndicatorRead, CountryIndicatorUpdate
-from .mng_indicator_category_schema import IndicatorCategoryCreate, IndicatorCategoryRead, IndicatorCategoryUpdate
-from .mng_indicators_features_schema import IndicatorFeatureCreate, IndicatorFeatureRead, IndicatorFeatureUpdate
-from .mng_country_climate_measure_schema import CountryClimateMeasureCreate, CountryClimateMeasureRead, CountryClimateMeasureUpdate
+"""Pydantic schemas, imported on first access"""
+from ..lazy import lazy_exports
+
+_SUBMODULES = {
+    "mng_admin_1_schema": ("Admin1Read", "Admin1Create", "Admin1Update"),
+    "mng_admin_2_schema": ("Admin2Read", "Admin2Create", "Admin2Update"),
+    "mng_country_schema": ("CountryCreate", "CountryRead", "CountryUpdate"),
+    "mng_location_schema": ("LocationCreate", "LocationRead", "LocationUpdate"),
+    "mng_climate_measure_schema": ("ClimateMeasureRead", "ClimateMeasureCreate", "ClimateMeasureUpdate"),
+    "mng_indicators_schema": ("IndicatorCreate", "IndicatorRead", "IndicatorUpdate"),
+    "climate_historical_climatology_schema": ("ClimateHistoricalClimatologyRead", "ClimateHistoricalClimatologyCreate", "ClimateHistoricalClimatologyUpdate"),
+    "climate_historical_daily_schema": ("ClimateHistoricalDailyCreate", "ClimateHistoricalDailyUpdate", "ClimateHistoricalDailyRead"),
+    "climate_historical_monthly_schema": ("ClimateHistoricalMonthlyCreate", "ClimateHistoricalMonthlyRead", "ClimateHistoricalMonthlyUpdate"),
+    "climate_data_availability_schema": ("ClimateDataAvailabilityCreate", "ClimateDataAvailabilityRead", "ClimateDataAvailabilityUpdate"),
+    "climate_historical_indicator_schema": ("ClimateHistoricalIndicatorCreate", "ClimateHistoricalIndicatorRead", "ClimateHistoricalIndicatorUpdate"),
+    "mng_source_schema": ("SourceCreate", "SourceRead", "SourceUpdate"),
+    "mng_cultivar_schema": ("CultivarCreate", "CultivarRead", "CultivarUpdate"),
+    "mng_soil_schema": ("SoilCreate", "SoilRead", "SoilUpdate"),
+    "mng_data_source_schema": ("DataSourceCreate", "DataSourceRead", "DataSourceUpdate"),
+    "mng_phenological_stage_schema": ("PhenologicalStageCreate", "PhenologicalStageRead", "PhenologicalStageUpdate"),
+    "mng_stress_schema": ("StressCreate", "StressRead", "StressUpdate"),
+    "mng_crop_schema": ("CropCreate", "CropRead", "CropUpdate"),
+    "mng_setup_schema": ("SetupCreate", "SetupRead", "SetupUpdate"),
+    "mng_configuration_file_schema": ("ConfigurationFileCreate", "ConfigurationFileRead", "ConfigurationFileUpdate"),
+    "mng_season_schema": ("SeasonCreate", "SeasonRead", "SeasonUpdate"),
+    "forecast_schema": ("ForecastCreate", "ForecastRead", "ForecastUpdate"),
+    "forecast_analogue_schema": ("ForecastAnalogueCreate", "ForecastAnalogueRead", "ForecastAnalogueUpdate"),
+    "historical_agroclimatic_indicator_schema": ("HistoricalAgroclimaticIndicatorCreate", "HistoricalAgroclimaticIndicatorRead", "HistoricalAgroclimaticIndicatorUpdate"),
+    "phenological_stage_stress_schema": ("PhenologicalStageStressCreate", "PhenologicalStageStressRead", "PhenologicalStageStressUpdate"),
+    "role_schema": ("RoleCreate", "RoleRead", "RoleUpdate"),
+    "user_schema": ("UserCreate", "UserRead", "UserUpdate"),
+    "user_access_schema": ("UserAccessCreate", "UserAccessRead", "UserAccessUpdate"),
+    "mng_country_indicator_schema": ("CountryIndicatorCreate", "CountryIndicatorRead", "CountryIndicatorUpdate"),
+    "mng_indicator_category_schema": ("IndicatorCategoryCreate", "IndicatorCategoryRead", "IndicatorCategoryUpdate"),
+    "mng_indicators_features_schema": ("IndicatorFeatureCreate", "IndicatorFeatureRead", "IndicatorFeatureUpdate"),
+    "mng_country_climate_measure_schema": ("CountryClimateMeasureCreate", "CountryClimateMeasureRead", "CountryClimateMeasureUpdate"),
+}
+
+__all__ = [name for names in _SUBMODULES.values() for name in names]
+__getattr__, __dir__ = lazy_exports(__name__, _SUBMODULES)
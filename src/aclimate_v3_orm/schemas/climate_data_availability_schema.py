@@ -0,0 +1,33 @@
+from datetime import date, datetime
+from typing import Optional
+from pydantic import BaseModel, Field, ConfigDict
+from ..enums import Period
+from .mng_climate_measure_schema import ClimateMeasureRead
+
+class ClimateDataAvailabilityBase(BaseModel):
+    """Span and row count of one (location, measure) series"""
+    temporality: Period = Field(..., description="DAILY or MONTHLY table the series belongs to")
+    location_id: int = Field(..., gt=0, description="ID of the location")
+    measure_id: int = Field(..., gt=0, description="ID of the climate measure")
+    min_date: date = Field(..., description="First date with data")
+    max_date: date = Field(..., description="Last date with data")
+    count: int = Field(..., ge=0, description="Number of rows of the series")
+
+class ClimateDataAvailabilityCreate(ClimateDataAvailabilityBase):
+    """Schema for creating summary rows (normally maintained by the historical services)"""
+    pass
+
+class ClimateDataAvailabilityUpdate(BaseModel):
+    """Schema for updating summary rows"""
+    min_date: Optional[date] = None
+    max_date: Optional[date] = None
+    count: Optional[int] = Field(None, ge=0)
+
+class ClimateDataAvailabilityRead(ClimateDataAvailabilityBase):
+    """Summary row including read-only fields"""
+    id: int
+    last_ingest: Optional[datetime] = None
+
+    measure: Optional[ClimateMeasureRead] = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -1,32 +1,42 @@
-from .base_service import BaseService
-from .climate_historical_climatology_service import ClimateHistoricalClimatologyService
-from .climate_historical_monthly_service import ClimateHistoricalMonthlyService
-from .climate_historical_daily_service import ClimateHistoricalDailyService
-from .climate_historical_indicator_service import ClimateHistoricalIndicatorService
-from .mng_admin_1_service import MngAdmin1Service
-from .mng_admin_2_service import MngAdmin2Service
-from .mng_climate_measure_service import MngClimateMeasureService
-from .mng_indicators_service import MngIndicatorService
-from .mng_location_service import MngLocationService
-from .mng_country_service import MngCountryService
-from .mng_source_service import MngSourceService
-from .mng_cultivar_service import MngCultivarService
-from .mng_soil_service import MngSoilService
-from .mng_data_source_service import MngDataSourceService
-from .mng_phenological_stage_service import MngPhenologicalStageService
-from .mng_stress_service import MngStressService
-from .mng_crop_service import MngCropService
-from .mng_setup_service import MngSetupService
-from .mng_configuration_file_service import MngConfigurationFileService
-from .mng_season_service import MngSeasonService
-from .forecast_service import ForecastService
-from .forecast_analogue_service import ForecastAnalogueService
-from .historical_agroclimatic_indicator_service import HistoricalAgroclimaticIndicatorService
-from .phenological_stage_stress_service import PhenologicalStageStressService
-from .role_service import RoleService
-from .user_access_service import UserAccessService
-from .user_service import UserService
-from .mng_country_indicator_service import MngCountryIndicatorService
-from .mng_indicator_category_service import MngIndicatorCategoryService
-from .mng_indicators_features_service import MngIndicatorsFeaturesService
-from .mng_country_climate_measure_service import MngCountryClimateMeasureService
+"""Services, imported on first access"""
+from ..lazy import lazy_exports
+
+_SUBMODULES = {
+    "base_service": ("BaseService",),
+    "climate_historical_climatology_service": ("ClimateHistoricalClimatologyService",),
+    "climate_historical_monthly_service": ("ClimateHistoricalMonthlyService",),
+    "climate_historical_daily_service": ("ClimateHistoricalDailyService",),
+    "climate_historical_indicator_service": ("ClimateHistoricalIndicatorService",),
+    "climate_data_availability_service": ("ClimateDataAvailabilityService",),
+    "mng_admin_1_service": ("MngAdmin1Service",),
+    "mng_admin_2_service": ("MngAdmin2Service",),
+    "mng_climate_measure_service": ("MngClimateMeasureService",),
+    "mng_indicators_service": ("MngIndicatorService",),
+    "mng_location_service": ("MngLocationService",),
+    "mng_country_service": ("MngCountryService",),
+    "mng_source_service": ("MngSourceService",),
+    "mng_cultivar_service": ("MngCultivarService",),
+    "mng_soil_service": ("MngSoilService",),
+    "mng_data_source_service": ("MngDataSourceService",),
+    "mng_phenological_stage_service": ("MngPhenologicalStageService",),
+    "mng_stress_service": ("MngStressService",),
+    "mng_crop_service": ("MngCropService",),
+    "mng_setup_service": ("MngSetupService",),
+    "mng_configuration_file_service": ("MngConfigurationFileService",),
+    "mng_season_service": ("MngSeasonService",),
+    "forecast_service": ("ForecastService",),
+    "forecast_analogue_service": ("ForecastAnalogueService",),
+    "historical_agroclimatic_indicator_service": ("HistoricalAgroclimaticIndicatorService",),
+    "phenological_stage_stress_service": ("PhenologicalStageStressService",),
+    "role_service": ("RoleService",),
+    "user_access_service": ("UserAccessService",),
+    "permission_resolver": ("PermissionResolver",),
+    "user_service": ("UserService",),
+    "mng_country_indicator_service": ("MngCountryIndicatorService",),
+    "mng_indicator_category_service": ("MngIndicatorCategoryService",),
+    "mng_indicators_features_service": ("MngIndicatorsFeaturesService",),
+    "mng_country_climate_measure_service": ("MngCountryClimateMeasureService",),
+}
+
+__all__ = [name for names in _SUBMODULES.values() for name in names]
+__getattr__, __dir__ = lazy_exports(__name__, _SUBMODULES)
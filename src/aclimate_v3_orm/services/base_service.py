@@ -1,16 +1,66 @@
-from typing import TypeVar, Generic, Type, Optional, Any, Dict, List
+from typing import TypeVar, Generic, Type, Optional, Any, Callable, Dict, Iterable, List, Tuple, Union
+import time
+from datetime import date
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pydantic import BaseModel
+from sqlalchemy import delete, event, select, update
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from contextlib import contextmanager
-from ..database import get_db
+from ..cache import ResultCache
+from ..database import get_db, get_engine
 
 T = TypeVar("T")  # SQLAlchemy Model
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 ReadSchemaType = TypeVar("ReadSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+# Minimum server versions that implement SQL window functions (OVER / ROWS BETWEEN)
+WINDOW_FUNCTION_MIN_VERSIONS = {
+    "postgresql": (8, 4),
+    "sqlite": (3, 25),
+    "mysql": (8, 0),
+    "mariadb": (10, 2),
+}
+
+# Threads of parallel_map when the engine's pool does not report a size
+DEFAULT_PARALLEL_WORKERS = 8
+
+# Keys per IN (...) query when parallel_map coalesces per-key reads
+COALESCE_SIZE = 500
+
+# Ids per UPDATE/DELETE ... WHERE id IN (...) statement of bulk_update and bulk_delete
+BULK_CHUNK_SIZE = 1000
+
+# Columns of the targeted records handed to _after_change by bulk_update and bulk_delete
+CHANGE_KEY_COLUMNS = ("location_id", "measure_id")
+
+# Key of Session.info holding the result cache invalidations to repeat on commit
+PENDING_INVALIDATIONS = "result_cache_invalidations"
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session: Session):
+    """Repeat the invalidations of the written locations once the rows are visible to other sessions"""
+    for cache, table, location_ids in session.info.pop(PENDING_INVALIDATIONS, []):
+        cache.invalidate(table, location_ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidations(session: Session):
+    session.info.pop(PENDING_INVALIDATIONS, None)
+
 class BaseService(Generic[T, CreateSchemaType, ReadSchemaType, UpdateSchemaType]):
+    # Per-key reads with a set-based counterpart, used by parallel_map:
+    # method name -> (method taking a list of keys, attribute holding the key of each result)
+    coalesced_reads: Dict[str, Tuple[str, str]] = {}
+
+    # Cache of the reads decorated with cached_read, shared by every service of the process; off by default.
+    # Invalidations only reach the backend they are written to: processes that write (imports, ingest) and
+    # processes that read must share it, e.g. ResultCache(<Redis backend>). An in-process ResultCache()
+    # is only safe when every write goes through the same process.
+    result_cache: Optional[ResultCache] = None
+
     def __init__(self, 
                 model: Type[T],
                 create_schema: Type[CreateSchemaType],
@@ -44,6 +94,178 @@ class BaseService(Generic[T, CreateSchemaType, ReadSchemaType, UpdateSchemaType]
             with get_db() as session:
                 yield session
                 
+    def _supports_window_functions(self, session: Session, min_versions: Dict[str, tuple] = WINDOW_FUNCTION_MIN_VERSIONS) -> bool:
+        """
+        Check whether the database behind the session supports window functions
+        (or the feature whose first server version per dialect is given by min_versions).
+        Unknown dialects are assumed not to, so callers fall back to Python.
+        """
+        dialect = session.connection().dialect
+        name = "mariadb" if getattr(dialect, "is_mariadb", False) else dialect.name
+        min_version = min_versions.get(name)
+        version = dialect.server_version_info
+        if min_version is None or version is None:
+            return False
+        return tuple(version[:len(min_version)]) >= min_version
+
+    @staticmethod
+    def _columnar(rows: List[Any], columns: List[str], as_numpy: bool = False) -> Dict[str, Any]:
+        """
+        Pivot result rows into a dict of parallel columns (lists, or NumPy arrays when as_numpy).
+        Date columns become datetime64[D] arrays.
+        """
+        data = {name: list(values) for name, values in zip(columns, zip(*rows))} if rows else {name: [] for name in columns}
+        if not as_numpy:
+            return data
+
+        import numpy as np
+        from datetime import date as Date
+        arrays = {}
+        for name, values in data.items():
+            sample = next((value for value in values if value is not None), None)
+            if isinstance(sample, Date):
+                arrays[name] = np.array(values, dtype="datetime64[D]")
+            elif isinstance(sample, float):
+                arrays[name] = np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+            elif isinstance(sample, int) and not isinstance(sample, bool):
+                arrays[name] = np.array(values, dtype=np.int64)
+            else:
+                arrays[name] = np.array(values)
+        return arrays
+
+    def _series(self,
+                location_ids: List[int],
+                measure_ids: List[int],
+                start_date: Optional[date],
+                end_date: Optional[date],
+                as_numpy: bool,
+                db: Optional[Session]) -> Dict[str, Any]:
+        """
+        Columns location_id, measure_id, date and value of the historical series of several
+        locations and measures, ordered by location, measure and date. Dates are bounded after
+        _series_bounds() adjusts them.
+
+        Selects only the columns stored in the covering unique index
+        (location_id, measure_id, date INCLUDE value) in index order, so PostgreSQL can
+        answer with an index-only scan, and builds no ORM objects.
+        """
+        start_date, end_date = self._series_bounds(start_date, end_date)
+        with self._session_scope(db) as session:
+            query = (
+                select(self.model.location_id, self.model.measure_id, self.model.date, self.model.value)
+                .where(
+                    self.model.location_id.in_(location_ids),
+                    self.model.measure_id.in_(measure_ids)
+                )
+                .order_by(self.model.location_id, self.model.measure_id, self.model.date)
+            )
+            if start_date:
+                query = query.where(self.model.date >= start_date)
+            if end_date:
+                query = query.where(self.model.date <= end_date)
+            rows = session.execute(query).all()
+        return self._columnar(rows, ["location_id", "measure_id", "date", "value"], as_numpy)
+
+    def _series_bounds(self, start_date: Optional[date], end_date: Optional[date]) -> Tuple[Optional[date], Optional[date]]:
+        """Hook adjusting the date bounds of _series() to the dates the table stores. Defaults to leaving them as given."""
+        return start_date, end_date
+
+    def _invalidate_results(self, session: Session, location_ids: Iterable[Any]):
+        """
+        Make cached reads of the written locations stale. Done at the write and again when the
+        session commits, so a read in between cannot keep the rows as they were before the commit.
+        """
+        if self.result_cache is None or not hasattr(self.model, "location_id"):
+            return
+        table = self.model.__tablename__
+        location_ids = {location_id for location_id in location_ids if location_id is not None}
+        self.result_cache.invalidate(table, location_ids)
+        if isinstance(session.info, dict):
+            session.info.setdefault(PENDING_INVALIDATIONS, []).append((self.result_cache, table, location_ids))
+
+    @staticmethod
+    def _pool_size() -> int:
+        """Connections the engine's pool keeps, so parallel_map does not starve other requests"""
+        size = getattr(get_engine().pool, "size", None)
+        size = size() if callable(size) else size
+        return size or DEFAULT_PARALLEL_WORKERS
+
+    def _fan_out(self, call: Callable, items: List[Any], max_workers: Optional[int], timeout: Optional[float], db: Optional[Session]) -> List[Any]:
+        """call(item, db=...) for every item, in order; across threads, each with its own session, unless db is given"""
+        if db is not None or len(items) == 1:
+            return [call(item, db=db) for item in items]
+
+        # Start time of each call, so every call gets timeout seconds from when a thread picks it up
+        started: Dict[int, float] = {}
+
+        def timed(index: int):
+            started[index] = time.monotonic()
+            return call(items[index], db=None)
+
+        executor = ThreadPoolExecutor(min(len(items), max_workers or self._pool_size()))
+        futures = [executor.submit(timed, index) for index in range(len(items))]
+        pending = {future: index for index, future in enumerate(futures)}
+        try:
+            while pending:
+                wait_for = None
+                if timeout is not None:
+                    now = time.monotonic()
+                    for future, index in sorted(pending.items(), key=lambda entry: entry[1]):
+                        if index in started and not future.done() and now - started[index] >= timeout:
+                            raise TimeoutError(f"Call for {items[index]!r} did not finish within {timeout} seconds")
+                    # Calls not started yet cannot expire before now + timeout
+                    wait_for = max(min([started[index] + timeout - now for index in pending.values() if index in started] + [timeout]), 0)
+                done, _ = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()  # raise a failure without waiting for the other calls
+                    del pending[future]
+            return [future.result() for future in futures]
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def parallel_map(self,
+                     method: Union[str, Callable],
+                     keys: Iterable[Any],
+                     max_workers: Optional[int] = None,
+                     timeout: Optional[float] = None,
+                     coalesce_size: int = COALESCE_SIZE,
+                     db: Optional[Session] = None) -> List[Any]:
+        """
+        Run a per-key read (such as get_by_location_id) for many keys, returning the results in the order of keys.
+
+        Methods listed in coalesced_reads are answered with IN (...) queries of up to coalesce_size
+        keys when more than one key is requested. Other methods, or callables taking (key, db=...),
+        are called once per key across a thread pool, each call with its own pooled session.
+        With db the calls run one after another in that session, since a session is not thread-safe.
+
+        Args:
+            method: Name of a method of the service, or a callable
+            keys: Keys to read; duplicates are read once
+            max_workers: Threads (default: the size of the connection pool)
+            timeout: Seconds each call may run, counted from when a thread starts it, raising TimeoutError
+                when exceeded. Calls still queued are cancelled, but calls already running cannot be
+                interrupted: they keep running (and holding a pooled connection) until their query returns.
+            coalesce_size: Keys per IN (...) query
+            db: Optional database session
+        """
+        keys = list(keys)
+        unique = list(dict.fromkeys(keys))
+        if not unique:
+            return []
+
+        if isinstance(method, str) and method in self.coalesced_reads and len(unique) > 1:
+            set_method, attribute = self.coalesced_reads[method]
+            chunks = [unique[i:i + coalesce_size] for i in range(0, len(unique), coalesce_size)]
+            grouped = {key: [] for key in unique}
+            for rows in self._fan_out(getattr(self, set_method), chunks, max_workers, timeout, db):
+                for row in rows:
+                    grouped[getattr(row, attribute)].append(row)
+            return [grouped[key] for key in keys]
+
+        call = getattr(self, method) if isinstance(method, str) else method
+        results = dict(zip(unique, self._fan_out(call, unique, max_workers, timeout, db)))
+        return [results[key] for key in keys]
+
     def get_by_id(self, id: int, db: Optional[Session] = None) -> Optional[ReadSchemaType]:
         """Get a record by ID and return it as ReadSchema"""
         with self._session_scope(db) as session:
@@ -126,6 +348,7 @@ class BaseService(Generic[T, CreateSchemaType, ReadSchemaType, UpdateSchemaType]
             obj_data = obj_in.model_dump()
             db_obj = self.model(**obj_data)
             session.add(db_obj)
+            self._after_insert([obj_data], session)
             session.commit()
             session.refresh(db_obj)
             return self.read_schema.model_validate(db_obj)
@@ -154,12 +377,12 @@ class BaseService(Generic[T, CreateSchemaType, ReadSchemaType, UpdateSchemaType]
             for i in range(0, len(objs_in), batch_size):
                 batch = objs_in[i:i + batch_size]
 
-                for obj in batch:
-                    self._validate_create(obj, session)
+                self._validate_batch(batch, session)
 
                 batch_data = [obj.model_dump() for obj in batch]
                 session.bulk_insert_mappings(self.model, batch_data)
                 session.flush()
+                self._after_insert(batch_data, session)
                 created_count += len(batch)
 
             session.commit()
@@ -174,10 +397,12 @@ class BaseService(Generic[T, CreateSchemaType, ReadSchemaType, UpdateSchemaType]
                 return None
 
             update_data = obj_in.model_dump(exclude_unset=True) if isinstance(obj_in, BaseModel) else obj_in
+            before = self._column_values(db_obj)
             for field, value in update_data.items():
                 setattr(db_obj, field, value)
                 
             session.flush()
+            self._after_change([before, self._column_values(db_obj)], session)
             session.refresh(db_obj)
             return self.read_schema.model_validate(db_obj)
 
@@ -188,6 +413,7 @@ class BaseService(Generic[T, CreateSchemaType, ReadSchemaType, UpdateSchemaType]
             if not db_obj:
                 return False
 
+            before = self._column_values(db_obj)
             if hasattr(db_obj, "enable"):
                 db_obj.enable = False
                 session.add(db_obj)
@@ -195,8 +421,130 @@ class BaseService(Generic[T, CreateSchemaType, ReadSchemaType, UpdateSchemaType]
                 session.delete(db_obj)
                 session.flush()
 
+            self._after_change([before], session)
+
             return True
 
+    def bulk_update(self,
+                    target: Union[List[int], Dict[str, Any]],
+                    values: UpdateSchemaType | Dict[str, Any],
+                    chunk_size: int = BULK_CHUNK_SIZE,
+                    db: Optional[Session] = None) -> int:
+        """
+        Update many records with one UPDATE ... WHERE id IN (...) per chunk of ids.
+        Columns with an onupdate default (e.g. updated) are refreshed by the statement.
+
+        Args:
+            target: List of ids, or non-empty dict of column filters (as in get_all) selecting the records
+            values: UpdateSchema (only the fields set) or dict of column values applied to every record
+            chunk_size: Ids per statement
+            db: Optional database session
+
+        Returns:
+            Number of records updated
+        """
+        update_data = values.model_dump(exclude_unset=True) if isinstance(values, BaseModel) else dict(values)
+        self._check_columns(update_data)
+        if not update_data:
+            return 0
+        with self._session_scope(db) as session:
+            return self._bulk_write(session, target, update_data, chunk_size)
+
+    def bulk_delete(self,
+                    target: Union[List[int], Dict[str, Any]],
+                    soft: bool = True,
+                    chunk_size: int = BULK_CHUNK_SIZE,
+                    db: Optional[Session] = None) -> int:
+        """
+        Delete many records with one DELETE ... WHERE id IN (...) per chunk of ids.
+        With soft, records of models with an enable column are disabled instead, as delete() does.
+
+        Args:
+            target: List of ids, or non-empty dict of column filters (as in get_all) selecting the records
+            soft: Disable instead of deleting when the model has an enable column
+            chunk_size: Ids per statement
+            db: Optional database session
+
+        Returns:
+            Number of records deleted or disabled
+        """
+        with self._session_scope(db) as session:
+            if soft and hasattr(self.model, "enable"):
+                return self._bulk_write(session, target, {"enable": False}, chunk_size)
+            return self._bulk_write(session, target, None, chunk_size)
+
+    def _check_columns(self, data: Dict[str, Any]):
+        """Reject keys that are not columns of the model"""
+        columns = {column.key for column in self.model.__mapper__.column_attrs}
+        unknown = sorted(set(data) - columns)
+        if unknown:
+            raise ValueError(f"Unknown columns for {self.model.__tablename__}: {', '.join(unknown)}")
+
+    def _bulk_write(self, session: Session, target: Union[List[int], Dict[str, Any]], update_data: Optional[Dict[str, Any]], chunk_size: int) -> int:
+        """
+        Apply update_data (or delete when None) to the targeted records chunk by chunk, then
+        hand their key columns before (and after) the change to _after_change().
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        if not hasattr(self.model, "id"):
+            raise ValueError(f"Bulk writes need an id column, {self.model.__tablename__} has none")
+
+        keys = [self.model.id] + [getattr(self.model, name) for name in CHANGE_KEY_COLUMNS if hasattr(self.model, name)]
+        if isinstance(target, dict):
+            if not target:
+                raise ValueError("Filters cannot be empty; pass the ids to target every record")
+            self._check_columns(target)
+            rows = [dict(row) for row in session.execute(select(*keys).filter_by(**target)).mappings()]
+        else:
+            ids = list(dict.fromkeys(target))
+            rows = []
+            for i in range(0, len(ids), chunk_size):
+                query = select(*keys).where(self.model.id.in_(ids[i:i + chunk_size]))
+                rows.extend(dict(row) for row in session.execute(query).mappings())
+        if not rows:
+            return 0
+
+        affected = 0
+        for i in range(0, len(rows), chunk_size):
+            chunk = [row["id"] for row in rows[i:i + chunk_size]]
+            if update_data is None:
+                statement = delete(self.model).where(self.model.id.in_(chunk))
+            else:
+                statement = update(self.model).where(self.model.id.in_(chunk)).values(**update_data)
+            affected += session.execute(statement).rowcount
+
+        after = [] if update_data is None else [{key: update_data.get(key, value) for key, value in row.items()} for row in rows]
+        self._after_change(rows + after, session)
+        return affected
+
+    def _column_values(self, db_obj: T) -> Dict[str, Any]:
+        """Column values of a record, kept before it is changed"""
+        return {column.key: getattr(db_obj, column.key) for column in self.model.__mapper__.column_attrs}
+
+    def _after_insert(self, rows: List[Dict[str, Any]], session: Session):
+        """
+        Hook called in the write's transaction with the column values of the rows inserted by
+        create() and bulk_create(). Defaults to invalidating the cached reads of their locations.
+        """
+        self._invalidate_results(session, [row.get("location_id") for row in rows])
+
+    def _after_change(self, rows: List[Dict[str, Any]], session: Session):
+        """
+        Hook called in the write's transaction with the column values of a record before and
+        after update(), or before delete(); bulk_update() and bulk_delete() pass the id and
+        CHANGE_KEY_COLUMNS of every targeted record. Defaults to invalidating the cached reads of their locations.
+        """
+        self._invalidate_results(session, [row.get("location_id") for row in rows])
+
     def _validate_create(self, obj_in: CreateSchemaType, db: Optional[Session] = None):
         """Hook for additional validation during creation"""
-        pass
\ No newline at end of file
+        pass
+
+    def _validate_batch(self, objs_in: List[CreateSchemaType], db: Optional[Session] = None):
+        """
+        Hook for validation of a batch during bulk creation.
+        Defaults to validating each record; override with set-based checks for large batches.
+        """
+        for obj in objs_in:
+            self._validate_create(obj, db)
\ No newline at end of file
@@ -0,0 +1,202 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+import numpy as np
+from sqlalchemy import DateTime, delete, func, insert, literal, select
+from sqlalchemy.orm import Session
+from ..services.base_service import BaseService
+from ..models import ClimateDataAvailability, ClimateHistoricalDaily, ClimateHistoricalMonthly
+from ..enums import Period
+from ..schemas import (
+    ClimateDataAvailabilityCreate,
+    ClimateDataAvailabilityRead,
+    ClimateDataAvailabilityUpdate
+)
+
+# Historical tables summarized per temporality
+AVAILABILITY_SOURCES = {
+    Period.DAILY: ClimateHistoricalDaily,
+    Period.MONTHLY: ClimateHistoricalMonthly,
+}
+
+# Columns of the unique index matching a series
+SERIES_KEY = ("temporality", "location_id", "measure_id")
+
+class ClimateDataAvailabilityService(
+    BaseService[
+        ClimateDataAvailability,
+        ClimateDataAvailabilityCreate,
+        ClimateDataAvailabilityRead,
+        ClimateDataAvailabilityUpdate
+    ]
+):
+    """
+    Reads and maintenance of the per-series summary of the daily and monthly tables.
+
+    add_rows() and refresh() work in the caller's transaction (they neither commit nor open
+    a session), so the summary changes together with the rows it describes.
+    """
+
+    def __init__(self):
+        super().__init__(ClimateDataAvailability, ClimateDataAvailabilityCreate, ClimateDataAvailabilityRead, ClimateDataAvailabilityUpdate)
+
+    def get_by_location_id(self, location_id: int, temporality: Optional[Period] = None, db: Optional[Session] = None) -> List[ClimateDataAvailabilityRead]:
+        """Series available for a location (optionally of one temporality), ordered by measure"""
+        with self._session_scope(db) as session:
+            query = session.query(self.model).filter(self.model.location_id == location_id)
+            if temporality is not None:
+                query = query.filter(self.model.temporality == Period(temporality))
+            objs = query.order_by(self.model.temporality, self.model.measure_id).all()
+            return [ClimateDataAvailabilityRead.model_validate(obj) for obj in objs]
+
+    def get_date_range(self, temporality: Period, location_id: int, db: Optional[Session] = None) -> Optional[Dict[str, Any]]:
+        """First and last date of any series of a location, or None when the summary has no series for it"""
+        with self._session_scope(db) as session:
+            count, min_date, max_date = session.query(
+                func.count(self.model.id),
+                func.min(self.model.min_date),
+                func.max(self.model.max_date)
+            ).filter(
+                self.model.temporality == Period(temporality),
+                self.model.location_id == location_id
+            ).one()
+            if not count:
+                return None
+            return {"location_id": location_id, "min_date": min_date, "max_date": max_date}
+
+    def add_rows(self, session: Session, temporality: Period, location_ids: Iterable[int], measure_ids: Iterable[int], dates: Iterable[Any]) -> int:
+        """
+        Account for rows just inserted into the table of temporality: widen the span and add to
+        the count of their series, creating missing ones.
+
+        Returns:
+            Number of series touched
+        """
+        location_ids = np.asarray(location_ids, dtype=np.int64)
+        if not len(location_ids):
+            return 0
+        measure_ids = np.asarray(measure_ids, dtype=np.int64)
+        days = np.asarray(dates, dtype="datetime64[D]").astype(np.int64)
+
+        keys, inverse = np.unique(np.stack([location_ids, measure_ids], axis=1), axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        min_days = np.full(len(keys), np.iinfo(np.int64).max)
+        max_days = np.full(len(keys), np.iinfo(np.int64).min)
+        np.minimum.at(min_days, inverse, days)
+        np.maximum.at(max_days, inverse, days)
+        counts = np.bincount(inverse, minlength=len(keys))
+
+        now = datetime.now(timezone.utc)
+        rows = [
+            {
+                "temporality": Period(temporality), "location_id": location_id, "measure_id": measure_id,
+                "min_date": min_date, "max_date": max_date, "count": count, "last_ingest": now
+            }
+            for (location_id, measure_id), min_date, max_date, count in zip(
+                keys.tolist(), min_days.astype("datetime64[D]").tolist(),
+                max_days.astype("datetime64[D]").tolist(), counts.tolist()
+            )
+        ]
+        dialect = session.connection().dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            self._add_on_conflict(session, dialect, rows)
+        else:
+            self._add_select_then_write(session, rows)
+        return len(rows)
+
+    def _add_on_conflict(self, session: Session, dialect: str, rows: List[dict]):
+        """Native upsert against the unique index; rows arrive sorted by key, so concurrent writers lock in the same order"""
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+            least, greatest = func.least, func.greatest
+        else:
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+            least, greatest = func.min, func.max
+        statement = dialect_insert(self.model).values(rows)
+        statement = statement.on_conflict_do_update(
+            index_elements=list(SERIES_KEY),
+            set_={
+                "min_date": least(self.model.min_date, statement.excluded.min_date),
+                "max_date": greatest(self.model.max_date, statement.excluded.max_date),
+                "count": self.model.count + statement.excluded.count,
+                "last_ingest": statement.excluded.last_ingest
+            }
+        )
+        session.execute(statement)
+
+    def _add_select_then_write(self, session: Session, rows: List[dict]):
+        """Portable upsert: merge into the existing series of the batch, insert the rest"""
+        existing = {
+            (obj.temporality, obj.location_id, obj.measure_id): obj
+            for obj in session.query(self.model).filter(
+                self.model.temporality == rows[0]["temporality"],
+                self.model.location_id.in_({row["location_id"] for row in rows})
+            )
+        }
+        for row in rows:
+            obj = existing.get(tuple(row[key] for key in SERIES_KEY))
+            if obj is None:
+                session.add(self.model(**row))
+            else:
+                obj.min_date = min(obj.min_date, row["min_date"])
+                obj.max_date = max(obj.max_date, row["max_date"])
+                obj.count += row["count"]
+                obj.last_ingest = row["last_ingest"]
+        session.flush()
+
+    def refresh(self, session: Session, temporality: Period, location_ids: Iterable[int], measure_ids: Optional[Iterable[int]] = None) -> int:
+        """
+        Recompute the series of some locations (and measures) from the table of temporality,
+        after updates or deletes that add_rows() cannot account for.
+
+        Returns:
+            Number of series left for them
+        """
+        location_ids = sorted({location_id for location_id in location_ids if location_id is not None})
+        if not location_ids:
+            return 0
+        measure_ids = None if measure_ids is None else sorted({measure_id for measure_id in measure_ids if measure_id is not None})
+        return self._rebuild(session, Period(temporality), location_ids, measure_ids)
+
+    def rebuild(self, temporality: Optional[Period] = None, location_ids: Optional[List[int]] = None, db: Optional[Session] = None) -> int:
+        """
+        Rebuild the summary from the historical tables, for one temporality (default: all)
+        and optionally some locations.
+
+        Returns:
+            Number of series written
+        """
+        temporalities = [Period(temporality)] if temporality is not None else list(AVAILABILITY_SOURCES)
+        with self._session_scope(db) as session:
+            return sum(self._rebuild(session, value, location_ids) for value in temporalities)
+
+    def _rebuild(self, session: Session, temporality: Period, location_ids: Optional[List[int]], measure_ids: Optional[List[int]] = None) -> int:
+        """Replace the summary rows in scope with one INSERT ... SELECT ... GROUP BY over the source table"""
+        if temporality not in AVAILABILITY_SOURCES:
+            raise ValueError(f"No historical table for temporality {temporality}")
+        source = AVAILABILITY_SOURCES[temporality]
+
+        stale = delete(self.model).where(self.model.temporality == temporality)
+        aggregate = (
+            select(
+                literal(temporality, self.model.__table__.c.temporality.type),
+                source.location_id,
+                source.measure_id,
+                func.min(source.date),
+                func.max(source.date),
+                func.count(),
+                literal(datetime.now(timezone.utc), DateTime(timezone=True))
+            )
+            .group_by(source.location_id, source.measure_id)
+        )
+        if location_ids is not None:
+            stale = stale.where(self.model.location_id.in_(location_ids))
+            aggregate = aggregate.where(source.location_id.in_(location_ids))
+        if measure_ids is not None:
+            stale = stale.where(self.model.measure_id.in_(measure_ids))
+            aggregate = aggregate.where(source.measure_id.in_(measure_ids))
+
+        session.execute(stale)
+        result = session.execute(insert(self.model).from_select(
+            ["temporality", "location_id", "measure_id", "min_date", "max_date", "count", "last_ingest"], aggregate
+        ))
+        return result.rowcount
@@ -1,5 +1,6 @@
 from typing import List, Optional
 from sqlalchemy.orm import Session
+from ..cache import cached_read, single_flight
 from ..services.base_service import BaseService
 from ..models import ClimateHistoricalClimatology, MngLocation, MngClimateMeasure, MngAdmin1, MngAdmin2, MngCountry
 from ..validations import ClimateHistoricalClimatologyValidator
@@ -18,9 +19,12 @@ class ClimateHistoricalClimatologyService(
         ClimateHistoricalClimatologyUpdate
     ]
 ):
+    coalesced_reads = {"get_by_location_id": ("get_by_location_ids", "location_id")}
+
     def __init__(self):
         super().__init__(ClimateHistoricalClimatology, ClimateHistoricalClimatologyCreate, ClimateHistoricalClimatologyRead, ClimateHistoricalClimatologyUpdate)
 
+    @cached_read
     def get_by_location_id(self, location_id: int, db: Optional[Session] = None) -> List[ClimateHistoricalClimatologyRead]:
         """Get records by location ID"""
         with self._session_scope(db) as session:
@@ -31,6 +35,16 @@ class ClimateHistoricalClimatologyService(
             )
             return [ClimateHistoricalClimatologyRead.model_validate(obj) for obj in objs]
 
+    def get_by_location_ids(self, location_ids: List[int], db: Optional[Session] = None) -> List[ClimateHistoricalClimatologyRead]:
+        """Get records of several locations with one IN (...) query"""
+        with self._session_scope(db) as session:
+            results = (
+                session.query(self.model)
+                .filter(self.model.location_id.in_(location_ids))
+                .all()
+            )
+            return [ClimateHistoricalClimatologyRead.model_validate(obj) for obj in results]
+
     def get_by_location_name(self, location_name: str, db: Optional[Session] = None) -> List[ClimateHistoricalClimatologyRead]:
         """Get records by location name"""
         with self._session_scope(db) as session:
@@ -113,6 +127,9 @@ class ClimateHistoricalClimatologyService(
                 .all()
             )
             return [ClimateHistoricalClimatologyRead.model_validate(obj) for obj in objs]
+
+    @cached_read
+    @single_flight()
     def get_date_range_by_location_id(self, location_id: int, db: Optional[Session] = None):
         """
         Get the minimum and maximum month for a given location ID.
@@ -135,6 +152,7 @@ class ClimateHistoricalClimatologyService(
             )
             return [ClimateHistoricalClimatologyRead.model_validate(obj) for obj in objs]
         
+    @cached_read
     def get_max_min_by_location_id(self, location_id: int, db: Optional[Session] = None) -> List[dict]:
         """
         Returns a list of dicts with min/max value and month for each measure_id at a given location_id.
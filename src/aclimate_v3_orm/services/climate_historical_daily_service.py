@@ -1,9 +1,13 @@
 from typing import List, Optional
-from datetime import date
+from datetime import date, timedelta
 from sqlalchemy.orm import Session
+from ..cache import cached_read, single_flight
 from ..services.base_service import BaseService
+from ..services.climate_data_availability_service import ClimateDataAvailabilityService
 from ..models import ClimateHistoricalDaily, MngLocation, MngClimateMeasure, MngAdmin1, MngAdmin2, MngCountry
+from ..enums import Period
 from ..validations import ClimateHistoricalDailyValidator
+from sqlalchemy import Date, literal, select
 from sqlalchemy.sql import func
 from ..schemas import (
     ClimateHistoricalDailyCreate,
@@ -11,6 +15,16 @@ from ..schemas import (
     ClimateHistoricalDailyRead
 )
 
+ROLLING_AGGREGATIONS = ("sum", "mean")
+
+# First server versions accepting RANGE frames with an offset (RANGE BETWEEN n PRECEDING ...)
+RANGE_FRAME_MIN_VERSIONS = {
+    "postgresql": (11,),
+    "sqlite": (3, 28),
+    "mysql": (8, 0),
+    "mariadb": (10, 2),
+}
+
 class ClimateHistoricalDailyService(
     BaseService[
         ClimateHistoricalDaily,
@@ -19,9 +33,14 @@ class ClimateHistoricalDailyService(
         ClimateHistoricalDailyUpdate
     ]
 ):
+    coalesced_reads = {"get_by_location_id": ("get_by_location_ids", "location_id")}
+    # Summary of the series of the table, maintained by the write hooks below
+    availability = ClimateDataAvailabilityService()
+
     def __init__(self):
         super().__init__(ClimateHistoricalDaily, ClimateHistoricalDailyCreate, ClimateHistoricalDailyRead, ClimateHistoricalDailyUpdate)
 
+    @cached_read
     def get_by_location_id(self, location_id: int, db: Optional[Session] = None) -> List[ClimateHistoricalDailyRead]:
         with self._session_scope(db) as session:
             results = (
@@ -31,6 +50,16 @@ class ClimateHistoricalDailyService(
             )
             return [ClimateHistoricalDailyRead.model_validate(obj) for obj in results]
 
+    def get_by_location_ids(self, location_ids: List[int], db: Optional[Session] = None) -> List[ClimateHistoricalDailyRead]:
+        """Get daily records of several locations with one IN (...) query"""
+        with self._session_scope(db) as session:
+            results = (
+                session.query(self.model)
+                .filter(self.model.location_id.in_(location_ids))
+                .all()
+            )
+            return [ClimateHistoricalDailyRead.model_validate(obj) for obj in results]
+
     def get_by_location_name(self, location_name: str, db: Optional[Session] = None) -> List[ClimateHistoricalDailyRead]:
         with self._session_scope(db) as session:
             results = (
@@ -128,9 +157,36 @@ class ClimateHistoricalDailyService(
                 .all()
             )
             return [ClimateHistoricalDailyRead.model_validate(obj) for obj in results]
+
+    def get_series(self,
+                   location_ids: List[int],
+                   measure_ids: List[int],
+                   start_date: Optional[date] = None,
+                   end_date: Optional[date] = None,
+                   as_numpy: bool = False,
+                   db: Optional[Session] = None) -> dict:
+        """
+        Daily series of several locations and measures in column-oriented form.
+
+        Reads only the columns of the covering unique index, see BaseService._series().
+
+        Returns:
+            Dict of parallel columns location_id, measure_id, date and value ordered by
+            location, measure and date (lists, or NumPy arrays with datetime64[D] dates when as_numpy)
+        """
+        return self._series(location_ids, measure_ids, start_date, end_date, as_numpy, db)
+
+    @cached_read
+    @single_flight()
     def get_date_range_by_location_id(self, location_id: int, db: Optional[Session] = None):
-        
+        """
+        First and last date with data of a location, read from the availability summary.
+        Falls back to MIN/MAX over the table when the summary has no series for the location.
+        """
         with self._session_scope(db) as session:
+            summary = self.availability.get_date_range(Period.DAILY, location_id, db=session)
+            if summary is not None:
+                return summary
             min_date, max_date = session.query(
                 func.min(self.model.date),
                 func.max(self.model.date)
@@ -138,6 +194,7 @@ class ClimateHistoricalDailyService(
             return {"location_id": location_id, "min_date": min_date, "max_date": max_date}
     
 
+    @cached_read
     def get_max_min_by_location_id(self, location_id: int, db: Optional[Session] = None) -> List[dict]:
         """
         Returns a list of dicts with min/max value and date for each measure_id at a given location_id.
@@ -168,6 +225,7 @@ class ClimateHistoricalDailyService(
                     })
             return result
         
+    @single_flight()
     def get_latest_by_location(self, location_id: int, days: int = 1, db: Optional[Session] = None) -> Optional[dict]:
         """
         Get the latest climate data for a location within the last N days.
@@ -243,5 +301,293 @@ class ClimateHistoricalDailyService(
             
             return result
         
+    def rolling(self,
+                location_ids: List[int],
+                measure_id: int,
+                window_days: int,
+                agg: str = "sum",
+                start_date: Optional[date] = None,
+                end_date: Optional[date] = None,
+                chunk_size: int = 10000,
+                db: Optional[Session] = None) -> List[dict]:
+        """
+        Rolling sum or mean of a measure over the last `window_days` days of each location.
+
+        Uses a SQL window frame (RANGE BETWEEN n PRECEDING AND CURRENT ROW over the day
+        number) when the database supports it, otherwise streams each location in chunks
+        and computes the windows with a NumPy cumulative sum, so memory stays bounded per
+        location. Frames are date based: every window covers the `window_days` calendar
+        days ending on its date, so missing days lower the `count` of observations in the
+        window instead of stretching it further back.
+
+        Args:
+            location_ids: IDs of the locations
+            measure_id: ID of the climate measure (e.g. precipitation)
+            window_days: Window length in days (7, 15, 30, ...)
+            agg: "sum" for accumulations or "mean" for running means
+            start_date: First date to return (earlier days are only used to fill the window)
+            end_date: Last date to return
+            chunk_size: Rows fetched per round trip in the streaming fallback
+            db: Optional database session
+
+        Returns:
+            List of dicts with location_id, measure_id, date, value and count,
+            ordered by location and date
+        """
+        if window_days < 1:
+            raise ValueError("window_days must be greater than 0")
+        if agg not in ROLLING_AGGREGATIONS:
+            raise ValueError(f"Invalid aggregation '{agg}'. Must be one of: {', '.join(ROLLING_AGGREGATIONS)}")
+
+        lookback_start = start_date - timedelta(days=window_days - 1) if start_date else None
+
+        with self._session_scope(db) as session:
+            use_window = self._supports_window_functions(session, RANGE_FRAME_MIN_VERSIONS)
+            result = []
+            for location_id in location_ids:
+                filters = [
+                    self.model.location_id == location_id,
+                    self.model.measure_id == measure_id
+                ]
+                if lookback_start:
+                    filters.append(self.model.date >= lookback_start)
+                if end_date:
+                    filters.append(self.model.date <= end_date)
+
+                if use_window:
+                    rows = self._rolling_window_query(session, filters, window_days, agg, start_date)
+                else:
+                    rows = self._rolling_cumsum(session, filters, window_days, agg, start_date, chunk_size)
+
+                result.extend(
+                    {
+                        "location_id": location_id,
+                        "measure_id": measure_id,
+                        "date": row_date,
+                        "value": value,
+                        "count": count
+                    }
+                    for row_date, value, count in rows
+                )
+            return result
+
+    def _rolling_window_query(self, session: Session, filters: list, window_days: int, agg: str, start_date: Optional[date]):
+        """Rolling aggregation computed by the database with a RANGE frame over the day number"""
+        aggregate = func.sum if agg == "sum" else func.avg
+        day_number = self._day_diff(session, self.model.date, literal(date(1970, 1, 1), Date))
+        frame = {"order_by": day_number, "range_": (-(window_days - 1), 0)}
+        windowed = (
+            session.query(
+                self.model.date.label("date"),
+                aggregate(self.model.value).over(**frame).label("value"),
+                func.count(self.model.value).over(**frame).label("count")
+            )
+            .filter(*filters)
+            .subquery()
+        )
+        query = session.query(windowed.c.date, windowed.c.value, windowed.c.count)
+        if start_date:
+            query = query.filter(windowed.c.date >= start_date)
+        return [(row.date, row.value, row.count) for row in query.order_by(windowed.c.date)]
+
+    def _rolling_cumsum(self, session: Session, filters: list, window_days: int, agg: str,
+                        start_date: Optional[date], chunk_size: int):
+        """Rolling aggregation streamed in chunks, carrying over the values of the last window_days - 1 days"""
+        import numpy as np
+
+        stream = session.execute(
+            select(self.model.date, self.model.value)
+            .where(*filters)
+            .order_by(self.model.date)
+            .execution_options(yield_per=chunk_size)
+        )
+        rows = []
+        carry = np.empty(0, dtype=np.float64)
+        carry_days = np.empty(0, dtype=np.int64)
+        for chunk in stream.partitions():
+            dates = [row_date for row_date, _ in chunk]
+            values = np.concatenate([carry, np.fromiter((value for _, value in chunk), dtype=np.float64, count=len(chunk))])
+            days = np.concatenate([carry_days, np.array(dates, dtype="datetime64[D]").astype(np.int64)])
+            cumsum = np.concatenate([[0.0], np.cumsum(values)])
+
+            positions = np.arange(len(carry), len(values))
+            window_start = np.searchsorted(days, days[positions] - (window_days - 1), side="left")
+            counts = positions + 1 - window_start
+            totals = cumsum[positions + 1] - cumsum[window_start]
+            if agg == "mean":
+                totals = totals / counts
+
+            rows.extend(
+                (row_date, float(total), int(count))
+                for row_date, total, count in zip(dates, totals, counts)
+                if not start_date or row_date >= start_date
+            )
+            in_next_window = days > days[-1] - (window_days - 1)
+            carry, carry_days = values[in_next_window], days[in_next_window]
+        return rows
+
+    def completeness(self,
+                     location_ids: List[int],
+                     measure_ids: List[int],
+                     start_date: date,
+                     end_date: date,
+                     db: Optional[Session] = None) -> List[dict]:
+        """
+        Expected vs present day counts and missing date ranges for each (location, measure) series.
+
+        Gaps are found in the database with a gaps-and-islands query (LAG over date),
+        so only the gap boundaries travel over the wire. Databases without window
+        functions fall back to streaming the dates of each series.
+
+        Args:
+            location_ids: IDs of the locations
+            measure_ids: IDs of the climate measures
+            start_date: First expected day (inclusive)
+            end_date: Last expected day (inclusive)
+            db: Optional database session
+
+        Returns:
+            One dict per (location_id, measure_id) combination, including series without data, with
+            expected_days, present_days, missing_days, completeness (0-1), first_date, last_date and
+            missing_ranges (list of dicts with start_date, end_date and days) ready to plan an ingest
+        """
+        if start_date > end_date:
+            raise ValueError("Start date cannot be after end date")
+
+        filters = [
+            self.model.location_id.in_(location_ids),
+            self.model.measure_id.in_(measure_ids),
+            self.model.date >= start_date,
+            self.model.date <= end_date
+        ]
+
+        with self._session_scope(db) as session:
+            stats = {
+                (row.location_id, row.measure_id): row
+                for row in session.query(
+                    self.model.location_id,
+                    self.model.measure_id,
+                    func.count(self.model.date).label("present_days"),
+                    func.min(self.model.date).label("first_date"),
+                    func.max(self.model.date).label("last_date")
+                )
+                .filter(*filters)
+                .group_by(self.model.location_id, self.model.measure_id)
+            }
+
+            if self._supports_window_functions(session):
+                inner_gaps = self._inner_gaps_window_query(session, filters)
+            else:
+                inner_gaps = self._inner_gaps_streamed(session, filters)
+
+        expected_days = (end_date - start_date).days + 1
+        result = []
+        for location_id in location_ids:
+            for measure_id in measure_ids:
+                series = stats.get((location_id, measure_id))
+                if series is None:
+                    gaps = [(start_date, end_date)]
+                    present_days, first_date, last_date = 0, None, None
+                else:
+                    present_days, first_date, last_date = series.present_days, series.first_date, series.last_date
+                    gaps = inner_gaps.get((location_id, measure_id), [])
+                    if first_date > start_date:
+                        gaps.insert(0, (start_date, first_date - timedelta(days=1)))
+                    if last_date < end_date:
+                        gaps.append((last_date + timedelta(days=1), end_date))
+
+                result.append({
+                    "location_id": location_id,
+                    "measure_id": measure_id,
+                    "expected_days": expected_days,
+                    "present_days": present_days,
+                    "missing_days": expected_days - present_days,
+                    "completeness": present_days / expected_days,
+                    "first_date": first_date,
+                    "last_date": last_date,
+                    "missing_ranges": [
+                        {"start_date": gap_start, "end_date": gap_end, "days": (gap_end - gap_start).days + 1}
+                        for gap_start, gap_end in gaps
+                    ]
+                })
+        return result
+
+    def _day_diff(self, session: Session, later, earlier):
+        """Number of days between two date expressions for the session's dialect"""
+        dialect = session.connection().dialect.name
+        if dialect == "sqlite":
+            return func.julianday(later) - func.julianday(earlier)
+        if dialect in ("mysql", "mariadb"):
+            return func.datediff(later, earlier)
+        return later - earlier
+
+    def _inner_gaps_window_query(self, session: Session, filters: list) -> dict:
+        """Gaps between consecutive records of each series, found with LAG(date)"""
+        ordered = (
+            session.query(
+                self.model.location_id.label("location_id"),
+                self.model.measure_id.label("measure_id"),
+                self.model.date.label("date"),
+                func.lag(self.model.date, type_=Date).over(
+                    partition_by=(self.model.location_id, self.model.measure_id),
+                    order_by=self.model.date
+                ).label("previous_date")
+            )
+            .filter(*filters)
+            .subquery()
+        )
+        rows = (
+            session.query(ordered.c.location_id, ordered.c.measure_id, ordered.c.previous_date, ordered.c.date)
+            .filter(
+                ordered.c.previous_date.isnot(None),
+                self._day_diff(session, ordered.c.date, ordered.c.previous_date) > 1
+            )
+            .order_by(ordered.c.location_id, ordered.c.measure_id, ordered.c.date)
+        )
+        gaps = {}
+        for location_id, measure_id, previous_date, next_date in rows:
+            gaps.setdefault((location_id, measure_id), []).append(
+                (previous_date + timedelta(days=1), next_date - timedelta(days=1))
+            )
+        return gaps
+
+    def _inner_gaps_streamed(self, session: Session, filters: list, chunk_size: int = 10000) -> dict:
+        """Gaps between consecutive records of each series, found by streaming ordered dates"""
+        stream = session.execute(
+            select(self.model.location_id, self.model.measure_id, self.model.date)
+            .where(*filters)
+            .order_by(self.model.location_id, self.model.measure_id, self.model.date)
+            .execution_options(yield_per=chunk_size)
+        )
+        gaps = {}
+        previous_key, previous_date = None, None
+        for location_id, measure_id, row_date in stream:
+            key = (location_id, measure_id)
+            if key == previous_key and (row_date - previous_date).days > 1:
+                gaps.setdefault(key, []).append(
+                    (previous_date + timedelta(days=1), row_date - timedelta(days=1))
+                )
+            previous_key, previous_date = key, row_date
+        return gaps
+
+    def get_availability_by_location_id(self, location_id: int, db: Optional[Session] = None):
+        """Measures with data for a location, with the span and row count of each series"""
+        return self.availability.get_by_location_id(location_id, Period.DAILY, db=db)
+
+    def _after_insert(self, rows: List[dict], session: Session):
+        """Add the inserted rows to the availability summary"""
+        super()._after_insert(rows, session)
+        self.availability.add_rows(
+            session, Period.DAILY,
+            [row["location_id"] for row in rows], [row["measure_id"] for row in rows], [row["date"] for row in rows]
+        )
+
+    def _after_change(self, rows: List[dict], session: Session):
+        """Recompute the series the updated or deleted record belonged to"""
+        super()._after_change(rows, session)
+        self.availability.refresh(
+            session, Period.DAILY, [row["location_id"] for row in rows], [row["measure_id"] for row in rows]
+        )
+
     def _validate_create(self, obj_in: ClimateHistoricalDailyCreate, db: Optional[Session] = None):
         ClimateHistoricalDailyValidator.create_validate(db, obj_in)
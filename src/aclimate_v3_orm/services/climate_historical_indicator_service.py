@@ -1,15 +1,23 @@
 from typing import List, Optional
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from datetime import date
 from ..services.base_service import BaseService
-from ..models import ClimateHistoricalIndicator, MngLocation, MngIndicator, MngIndicatorCategory
+from ..models import ClimateHistoricalIndicator, MngLocation, MngIndicator, MngIndicatorCategory, MngAdmin1, MngAdmin2
 from ..enums import Period
+from ..validations import ClimateHistoricalIndicatorValidator
 from ..schemas import (
     ClimateHistoricalIndicatorCreate,
     ClimateHistoricalIndicatorRead,
     ClimateHistoricalIndicatorUpdate
 )
 
+# Columns of the unique index used to match existing rows on upsert
+UPSERT_KEY = ("indicator_id", "location_id", "period", "start_date")
+
+# Output formats supported by get_matrix()
+MATRIX_OUTPUTS = ("numpy", "arrow")
+
 class ClimateHistoricalIndicatorService(
     BaseService[
         ClimateHistoricalIndicator,
@@ -18,6 +26,8 @@ class ClimateHistoricalIndicatorService(
         ClimateHistoricalIndicatorUpdate
     ]
 ):
+    coalesced_reads = {"get_by_location_id": ("get_by_location_ids", "location_id")}
+
     def __init__(self):
         super().__init__(ClimateHistoricalIndicator, ClimateHistoricalIndicatorCreate, ClimateHistoricalIndicatorRead, ClimateHistoricalIndicatorUpdate)
 
@@ -67,6 +77,16 @@ class ClimateHistoricalIndicatorService(
             )
             return [ClimateHistoricalIndicatorRead.model_validate(obj) for obj in objs]
 
+    def get_by_location_ids(self, location_ids: List[int], db: Optional[Session] = None) -> List[ClimateHistoricalIndicatorRead]:
+        """Get records of several locations with one IN (...) query"""
+        with self._session_scope(db) as session:
+            results = (
+                session.query(self.model)
+                .filter(self.model.location_id.in_(location_ids))
+                .all()
+            )
+            return [ClimateHistoricalIndicatorRead.model_validate(obj) for obj in results]
+
     def get_by_period(self, period: str, db: Optional[Session] = None) -> List[ClimateHistoricalIndicatorRead]:
         """Get records by period type"""
         with self._session_scope(db) as session:
@@ -186,6 +206,210 @@ class ClimateHistoricalIndicatorService(
             )
             return [ClimateHistoricalIndicatorRead.model_validate(obj) for obj in objs]
         
+    def get_matrix(self,
+                   indicator_ids: List[int],
+                   period: Period,
+                   location_ids: Optional[List[int]] = None,
+                   country_id: Optional[int] = None,
+                   start_date: Optional[date] = None,
+                   end_date: Optional[date] = None,
+                   output: str = "numpy",
+                   sparse: bool = False,
+                   db: Optional[Session] = None) -> dict:
+        """
+        Values of several indicators for many locations as a dense location x time x indicator array.
+
+        Runs a single query ordered by (location_id, start_date, indicator_id), which follows the
+        (location_id, period, start_date) index, and fills the array with NumPy.
+
+        Args:
+            indicator_ids: Indicators to fetch (third axis)
+            period: Period of the values (e.g. Period.ANNUAL)
+            location_ids: Locations to fetch (first axis)
+            country_id: Use every location of the country instead of location_ids
+            start_date: Optional lower bound on start_date (inclusive)
+            end_date: Optional upper bound on start_date (inclusive)
+            output: "numpy" or "arrow" (requires pyarrow)
+            sparse: Return only the cells that have a value instead of the dense array
+            db: Optional database session
+
+        Returns:
+            For output="numpy", a dict with the axis labels location_ids, dates (datetime64[D])
+            and indicator_ids, plus:
+              - values: float64 array of shape (locations, dates, indicators), NaN where missing
+              - or, when sparse: coords (n x 3 int64 indices into the axes), values (n floats) and shape
+            For output="arrow", a pyarrow.Table with location_id, date and one float column per
+            indicator (named by its ID); when sparse, rows without any value are dropped.
+        """
+        if output not in MATRIX_OUTPUTS:
+            raise ValueError(f"Invalid output '{output}', expected one of {', '.join(MATRIX_OUTPUTS)}")
+        if (location_ids is None) == (country_id is None):
+            raise ValueError("Provide either location_ids or country_id")
+
+        import numpy as np
+
+        with self._session_scope(db) as session:
+            if country_id is not None:
+                location_ids = session.execute(
+                    select(MngLocation.id)
+                    .join(MngLocation.admin_2)
+                    .join(MngAdmin2.admin_1)
+                    .where(MngAdmin1.country_id == country_id)
+                ).scalars().all()
+
+            query = (
+                select(self.model.location_id, self.model.start_date, self.model.indicator_id, self.model.value)
+                .where(
+                    self.model.location_id.in_(location_ids),
+                    self.model.indicator_id.in_(indicator_ids),
+                    self.model.period == period
+                )
+                .order_by(self.model.location_id, self.model.start_date, self.model.indicator_id)
+            )
+            if start_date:
+                query = query.where(self.model.start_date >= start_date)
+            if end_date:
+                query = query.where(self.model.start_date <= end_date)
+            columns = self._columnar(session.execute(query).all(), ["location_id", "date", "indicator_id", "value"], as_numpy=True)
+
+        location_axis = np.unique(np.asarray(location_ids, dtype=np.int64))
+        indicator_axis = np.unique(np.asarray(indicator_ids, dtype=np.int64))
+        date_axis = np.unique(columns["date"].astype("datetime64[D]"))
+        coords = np.column_stack([
+            np.searchsorted(location_axis, columns["location_id"]),
+            np.searchsorted(date_axis, columns["date"]),
+            np.searchsorted(indicator_axis, columns["indicator_id"])
+        ]).astype(np.int64).reshape(-1, 3)
+        values = columns["value"].astype(np.float64)
+        shape = (len(location_axis), len(date_axis), len(indicator_axis))
+
+        if output == "arrow":
+            return self._matrix_to_arrow(location_axis, date_axis, indicator_axis, coords, values, sparse)
+
+        matrix = {"location_ids": location_axis, "dates": date_axis, "indicator_ids": indicator_axis}
+        if sparse:
+            matrix.update({"coords": coords, "values": values, "shape": shape})
+        else:
+            dense = np.full(shape, np.nan)
+            dense[coords[:, 0], coords[:, 1], coords[:, 2]] = values
+            matrix["values"] = dense
+        return matrix
+
+    @staticmethod
+    def _matrix_to_arrow(location_axis, date_axis, indicator_axis, coords, values, sparse: bool):
+        """Build a pyarrow.Table with one row per (location, date) and one column per indicator"""
+        try:
+            import pyarrow as pa
+        except ImportError as e:
+            raise ImportError("output='arrow' requires pyarrow, install aclimate_v3_orm[arrow]") from e
+        import numpy as np
+
+        # Flat (location, date) row of every cell; sparse keeps only rows with at least one value
+        cell_rows = coords[:, 0] * len(date_axis) + coords[:, 1]
+        rows = np.unique(cell_rows) if sparse else np.arange(len(location_axis) * len(date_axis))
+        row_index = np.searchsorted(rows, cell_rows)
+
+        table = {
+            "location_id": pa.array(location_axis[rows // max(len(date_axis), 1)]),
+            "date": pa.array(date_axis[rows % len(date_axis)] if len(date_axis) else date_axis)
+        }
+        for position, indicator_id in enumerate(indicator_axis):
+            column = np.full(len(rows), np.nan)
+            selected = coords[:, 2] == position
+            column[row_index[selected]] = values[selected]
+            table[str(indicator_id)] = pa.array(column, mask=np.isnan(column))
+        return pa.table(table)
+
+    def bulk_upsert(self,
+                    objs_in: List[ClimateHistoricalIndicatorCreate],
+                    batch_size: int = 1000,
+                    db: Optional[Session] = None) -> int:
+        """
+        Insert or update indicator values matched by (indicator_id, location_id, period, start_date),
+        so re-running an indicator pipeline replaces values instead of duplicating rows.
+
+        Uses INSERT ... ON CONFLICT DO UPDATE on PostgreSQL and SQLite, and a
+        select-then-write per batch elsewhere. Foreign keys are validated per batch
+        with one query per referenced table. Within a batch the last record for a key wins.
+
+        Args:
+            objs_in: List of CreateSchema objects
+            batch_size: Number of records written per statement
+            db: Optional database session
+
+        Returns:
+            Number of records inserted or updated
+        """
+        if not objs_in:
+            return 0
+
+        written = 0
+        with self._session_scope(db) as session:
+            dialect = session.connection().dialect.name
+            for i in range(0, len(objs_in), batch_size):
+                batch = objs_in[i:i + batch_size]
+                self._validate_batch(batch, session)
+
+                rows = {}
+                for obj in batch:
+                    data = obj.model_dump()
+                    rows[tuple(data[key] for key in UPSERT_KEY)] = data
+                rows = list(rows.values())
+
+                if dialect in ("postgresql", "sqlite"):
+                    self._upsert_on_conflict(session, dialect, rows)
+                else:
+                    self._upsert_select_then_write(session, rows)
+                written += len(rows)
+
+            session.commit()
+        return written
+
+    def _upsert_on_conflict(self, session: Session, dialect: str, rows: List[dict]):
+        """Native upsert against the unique index"""
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        statement = insert(self.model).values(rows)
+        statement = statement.on_conflict_do_update(
+            index_elements=list(UPSERT_KEY),
+            set_={
+                "value": statement.excluded.value,
+                "end_date": statement.excluded.end_date
+            }
+        )
+        session.execute(statement)
+
+    def _upsert_select_then_write(self, session: Session, rows: List[dict]):
+        """Portable upsert: look up existing keys of the batch, then update those and insert the rest"""
+        existing = {
+            (obj.indicator_id, obj.location_id, obj.period, obj.start_date): obj.id
+            for obj in session.query(
+                self.model.id, self.model.indicator_id, self.model.location_id, self.model.period, self.model.start_date
+            ).filter(
+                self.model.indicator_id.in_({row["indicator_id"] for row in rows}),
+                self.model.location_id.in_({row["location_id"] for row in rows}),
+                self.model.start_date.in_({row["start_date"] for row in rows})
+            )
+        }
+        updates, inserts = [], []
+        for row in rows:
+            record_id = existing.get(tuple(row[key] for key in UPSERT_KEY))
+            if record_id is None:
+                inserts.append(row)
+            else:
+                updates.append({"id": record_id, "value": row["value"], "end_date": row["end_date"]})
+        if updates:
+            session.bulk_update_mappings(self.model, updates)
+        if inserts:
+            session.bulk_insert_mappings(self.model, inserts)
+        session.flush()
+
+    def _validate_batch(self, objs_in: List[ClimateHistoricalIndicatorCreate], db: Optional[Session] = None):
+        """Set-based validation used by bulk_create() and bulk_upsert()"""
+        ClimateHistoricalIndicatorValidator.batch_validate(db, objs_in)
+
     def _validate_create(self, obj_in: ClimateHistoricalIndicatorCreate, db: Optional[Session] = None):
         """Automatic validation called from BaseService.create()"""
         # Validate indicator exists
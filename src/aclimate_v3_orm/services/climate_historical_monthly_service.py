@@ -1,8 +1,11 @@
 from typing import List, Optional
 from datetime import date
 from sqlalchemy.orm import Session
+from ..cache import cached_read, single_flight
 from ..services.base_service import BaseService
+from ..services.climate_data_availability_service import ClimateDataAvailabilityService
 from ..models import ClimateHistoricalMonthly, MngLocation, MngClimateMeasure, MngAdmin1, MngAdmin2, MngCountry
+from ..enums import Period
 from ..validations import ClimateHistoricalMonthlyValidator
 from sqlalchemy.sql import func
 from ..schemas import (
@@ -19,9 +22,14 @@ class ClimateHistoricalMonthlyService(
         ClimateHistoricalMonthlyUpdate
     ]
 ):
+    coalesced_reads = {"get_by_location_id": ("get_by_location_ids", "location_id")}
+    # Summary of the series of the table, maintained by the write hooks below
+    availability = ClimateDataAvailabilityService()
+
     def __init__(self):
         super().__init__(ClimateHistoricalMonthly, ClimateHistoricalMonthlyCreate, ClimateHistoricalMonthlyRead, ClimateHistoricalMonthlyUpdate)
 
+    @cached_read
     def get_by_location_id(self, location_id: int, db: Optional[Session] = None) -> List[ClimateHistoricalMonthlyRead]:
         """Get monthly records by location ID"""
         with self._session_scope(db) as session:
@@ -32,6 +40,16 @@ class ClimateHistoricalMonthlyService(
             )
             return [ClimateHistoricalMonthlyRead.model_validate(obj) for obj in results]
 
+    def get_by_location_ids(self, location_ids: List[int], db: Optional[Session] = None) -> List[ClimateHistoricalMonthlyRead]:
+        """Get monthly records of several locations with one IN (...) query"""
+        with self._session_scope(db) as session:
+            results = (
+                session.query(self.model)
+                .filter(self.model.location_id.in_(location_ids))
+                .all()
+            )
+            return [ClimateHistoricalMonthlyRead.model_validate(obj) for obj in results]
+
     def get_by_location_name(self, location_name: str, db: Optional[Session] = None) -> List[ClimateHistoricalMonthlyRead]:
         """Get monthly records by location name"""
         with self._session_scope(db) as session:
@@ -144,17 +162,48 @@ class ClimateHistoricalMonthlyService(
                 .all()
             )
             return [ClimateHistoricalMonthlyRead.model_validate(obj) for obj in results]
+
+    def get_series(self,
+                   location_ids: List[int],
+                   measure_ids: List[int],
+                   start_date: Optional[date] = None,
+                   end_date: Optional[date] = None,
+                   as_numpy: bool = False,
+                   db: Optional[Session] = None) -> dict:
+        """
+        Monthly (first day of month) series of several locations and measures in column-oriented form.
+
+        Reads only the columns of the covering unique index, see BaseService._series().
+
+        Returns:
+            Dict of parallel columns location_id, measure_id, date and value ordered by
+            location, measure and date (lists, or NumPy arrays with datetime64[D] dates when as_numpy)
+        """
+        return self._series(location_ids, measure_ids, start_date, end_date, as_numpy, db)
+
+    def _series_bounds(self, start_date: Optional[date], end_date: Optional[date]):
+        """Months are stored on their first day, so the bounds move to the start of their month"""
+        return (start_date.replace(day=1) if start_date else None,
+                end_date.replace(day=1) if end_date else None)
+
+    @cached_read
+    @single_flight()
     def get_date_range_by_location_id(self, location_id: int, db: Optional[Session] = None):
         """
-        Get the maximun and minimum dates
+        First and last date with data of a location, read from the availability summary.
+        Falls back to MIN/MAX over the table when the summary has no series for the location.
         """
         with self._session_scope(db) as session:
+            summary = self.availability.get_date_range(Period.MONTHLY, location_id, db=session)
+            if summary is not None:
+                return summary
             min_date, max_date = session.query(
                 func.min(self.model.date),
                 func.max(self.model.date)
             ).filter(self.model.location_id == location_id).one()
             return {"location_id": location_id, "min_date": min_date, "max_date": max_date}
 
+    @cached_read
     def get_max_min_by_location_id(self, location_id: int, db: Optional[Session] = None) -> List[dict]:
         """
         Returns a list of dicts with min/max value and date for each measure_id at a given location_id.
@@ -185,6 +234,25 @@ class ClimateHistoricalMonthlyService(
                     })
             return result
         
+    def get_availability_by_location_id(self, location_id: int, db: Optional[Session] = None):
+        """Measures with data for a location, with the span and row count of each series"""
+        return self.availability.get_by_location_id(location_id, Period.MONTHLY, db=db)
+
+    def _after_insert(self, rows: List[dict], session: Session):
+        """Add the inserted rows to the availability summary"""
+        super()._after_insert(rows, session)
+        self.availability.add_rows(
+            session, Period.MONTHLY,
+            [row["location_id"] for row in rows], [row["measure_id"] for row in rows], [row["date"] for row in rows]
+        )
+
+    def _after_change(self, rows: List[dict], session: Session):
+        """Recompute the series the updated or deleted record belonged to"""
+        super()._after_change(rows, session)
+        self.availability.refresh(
+            session, Period.MONTHLY, [row["location_id"] for row in rows], [row["measure_id"] for row in rows]
+        )
+
     def _validate_create(self, obj_in: ClimateHistoricalMonthlyCreate, db: Optional[Session] = None):
         """Automatic validation called from BaseService.create()"""
         ClimateHistoricalMonthlyValidator.create_validate(db, obj_in)
@@ -1,23 +1,280 @@
-from typing import List, Optional
+import calendar
+from datetime import date
+from typing import List, Optional, Tuple
+from sqlalchemy import and_, false, func, or_, select
 from sqlalchemy.orm import Session
 from ..services.base_service import BaseService
-from ..models import ForecastAnalogue
+from ..models import ForecastAnalogue, ClimateHistoricalDaily, ClimateHistoricalMonthly
 from ..schemas import ForecastAnalogueCreate, ForecastAnalogueUpdate, ForecastAnalogueRead
 from ..validations import ForecastAnalogueValidator
 
+# History tables analogue years can be read from
+ANALOGUE_SOURCES = {
+    "daily": ClimateHistoricalDaily,
+    "monthly": ClimateHistoricalMonthly,
+}
+
 class ForecastAnalogueService(BaseService[ForecastAnalogue, ForecastAnalogueCreate, ForecastAnalogueRead, ForecastAnalogueUpdate]):
     def __init__(self):
         super().__init__(ForecastAnalogue, ForecastAnalogueCreate, ForecastAnalogueRead, ForecastAnalogueUpdate)
 
     def get_by_forecast(self, forecast_id: int, db: Optional[Session] = None) -> List[ForecastAnalogueRead]:
         with self._session_scope(db) as session:
-            objs = session.query(self.model).filter(self.model.forecast_id == forecast_id).all()
+            objs = (
+                session.query(self.model)
+                .filter(self.model.forecast_id == forecast_id)
+                .order_by(self.model.location_id, self.model.rank)
+                .all()
+            )
             return [ForecastAnalogueRead.model_validate(obj) for obj in objs]
 
     def get_by_location(self, location_id: int, db: Optional[Session] = None) -> List[ForecastAnalogueRead]:
         with self._session_scope(db) as session:
-            objs = session.query(self.model).filter(self.model.location_id == location_id).all()
+            objs = (
+                session.query(self.model)
+                .filter(self.model.location_id == location_id)
+                .order_by(self.model.forecast_id, self.model.rank)
+                .all()
+            )
             return [ForecastAnalogueRead.model_validate(obj) for obj in objs]
 
+    def get_top_k(self,
+                  forecast_id: int,
+                  location_ids: Optional[List[int]] = None,
+                  k: int = 5,
+                  db: Optional[Session] = None) -> List[ForecastAnalogueRead]:
+        """
+        Best-ranked analogues of each location for a forecast, in one query.
+
+        Numbers each location's analogues with ROW_NUMBER() OVER (PARTITION BY location_id
+        ORDER BY rank, similarity_score DESC) and keeps the first k. On databases without
+        window functions the rows are read in that order and trimmed while streaming.
+
+        Args:
+            forecast_id: Forecast ID
+            location_ids: Optional locations to restrict to (all locations of the forecast by default)
+            k: Number of analogues per location
+            db: Optional database session
+
+        Returns:
+            Analogues ordered by location and rank, at most k per location
+        """
+        if k < 1:
+            raise ValueError("k must be at least 1")
+
+        with self._session_scope(db) as session:
+            conditions = [self.model.forecast_id == forecast_id]
+            if location_ids is not None:
+                conditions.append(self.model.location_id.in_(location_ids))
+            ordering = (self.model.rank, self.model.similarity_score.desc(), self.model.id)
+
+            if self._supports_window_functions(session):
+                position = func.row_number().over(partition_by=self.model.location_id, order_by=ordering).label("position")
+                ranked = select(self.model.id, position).where(*conditions).subquery()
+                objs = session.scalars(
+                    select(self.model)
+                    .join(ranked, ranked.c.id == self.model.id)
+                    .where(ranked.c.position <= k)
+                    .order_by(self.model.location_id, *ordering)
+                ).all()
+            else:
+                objs, counts = [], {}
+                for obj in session.scalars(
+                    select(self.model).where(*conditions).order_by(self.model.location_id, *ordering)
+                    .execution_options(yield_per=1000)
+                ):
+                    counts[obj.location_id] = counts.get(obj.location_id, 0) + 1
+                    if counts[obj.location_id] <= k:
+                        objs.append(obj)
+            return [ForecastAnalogueRead.model_validate(obj) for obj in objs]
+
+    @staticmethod
+    def _season_date_ranges(offsets: List[Tuple[int, int]], year: int) -> List[Tuple[date, date]]:
+        """
+        Season of an analogue year as (first day, last day) ranges, one per run of consecutive
+        months (e.g. [(11, 0), (12, 0), (1, 1)] for 2010 -> [(2010-11-01, 2011-01-31)]).
+        """
+        ranges = []
+        previous = None
+        for month, offset in offsets:
+            month_year = year + offset
+            index = month_year * 12 + month - 1
+            end = date(month_year, month, calendar.monthrange(month_year, month)[1])
+            if previous is not None and index == previous + 1:
+                ranges[-1] = (ranges[-1][0], end)
+            else:
+                ranges.append((date(month_year, month, 1), end))
+            previous = index
+        return ranges
+
+    @staticmethod
+    def _season_year_offsets(months: List[int]) -> List[Tuple[int, int]]:
+        """
+        Pair each season month with its year offset from the analogue year, which is the
+        year of the first month (e.g. [11, 12, 1, 2] -> [(11, 0), (12, 0), (1, 1), (2, 1)]).
+        """
+        if not months or len(set(months)) != len(months) or any(month < 1 or month > 12 for month in months):
+            raise ValueError("months must be distinct month numbers between 1 and 12")
+        offsets, offset = [], 0
+        for position, month in enumerate(months):
+            if position and month < months[position - 1]:
+                offset += 1
+            offsets.append((month, offset))
+        return offsets
+
+    def get_analogue_series(self,
+                            forecast_id: int,
+                            location_ids: List[int],
+                            measure_ids: List[int],
+                            months: List[int],
+                            source: str = "daily",
+                            max_rank: Optional[int] = None,
+                            db: Optional[Session] = None) -> dict:
+        """
+        Historical climate of each location's analogue years over the forecast season,
+        as similarity-weighted scenario arrays.
+
+        After reading the distinct analogue years, analogues are joined to the daily (or monthly)
+        history in a single query: a history row belongs to an analogue when it is from the same
+        location and its date falls in the analogue year's season (shifted one year for months
+        after a December wrap). Seasons are given as date ranges, so the date index and
+        partition pruning apply.
+
+        Args:
+            forecast_id: Forecast ID
+            location_ids: Locations to reconstruct
+            measure_ids: Climate measures to read
+            months: Season months in order, may wrap the year (e.g. [11, 12, 1])
+            source: "daily" or "monthly"
+            max_rank: Optional highest analogue rank to use
+            db: Optional database session
+
+        Returns:
+            Dict with:
+              - location_ids, measure_ids: axis labels
+              - years: (location x analogue) analogue years in rank order, 0 for padding
+              - weights: (location x analogue) similarity scores normalized per location, 0 for padding
+              - dates: (location x analogue x step) datetime64[D] of each step (NaT for padding)
+              - values: (location x measure x analogue x step) values, NaN where there is no data;
+                steps are days from the season start (daily) or season months (monthly)
+              - weighted_mean: (location x measure x step) similarity-weighted mean over analogues
+        """
+        if source not in ANALOGUE_SOURCES:
+            raise ValueError(f"Invalid source '{source}', expected one of {', '.join(ANALOGUE_SOURCES)}")
+        offsets = self._season_year_offsets(months)
+        history = ANALOGUE_SOURCES[source]
+
+        import numpy as np
+
+        with self._session_scope(db) as session:
+            scope = [self.model.forecast_id == forecast_id, self.model.location_id.in_(location_ids)]
+            if max_rank is not None:
+                scope.append(self.model.rank <= max_rank)
+            spans = {
+                year: self._season_date_ranges(offsets, year)
+                for year in session.scalars(select(self.model.year).where(*scope).distinct())
+            }
+            bounds = [bound for ranges in spans.values() for bound in ranges]
+            in_season = and_(
+                # Overall bounds let PostgreSQL prune the partitions outside every season
+                history.date >= min(start for start, _ in bounds),
+                history.date <= max(end for _, end in bounds),
+                or_(*[
+                    and_(self.model.year == year, history.date >= start, history.date <= end)
+                    for year, ranges in spans.items() for start, end in ranges
+                ])
+            ) if bounds else false()
+            query = (
+                select(self.model.id, self.model.location_id, self.model.year, self.model.similarity_score,
+                       history.measure_id, history.date, history.value)
+                .outerjoin(history, and_(
+                    history.location_id == self.model.location_id,
+                    history.measure_id.in_(measure_ids),
+                    in_season
+                ))
+                .where(*scope)
+                .order_by(self.model.location_id, self.model.rank, self.model.id, history.measure_id, history.date)
+            )
+            rows = session.execute(query).all()
+
+        location_axis = np.unique(np.asarray(location_ids, dtype=np.int64))
+        measure_axis = np.unique(np.asarray(measure_ids, dtype=np.int64))
+
+        # Analogue slots per location, in rank order
+        slots, analogues = {}, {}
+        for analogue_id, location_id, year, similarity, *_ in rows:
+            if analogue_id not in slots:
+                location_slots = analogues.setdefault(location_id, [])
+                slots[analogue_id] = len(location_slots)
+                location_slots.append((year, similarity))
+        width = max((len(items) for items in analogues.values()), default=0)
+
+        years = np.zeros((len(location_axis), width), dtype=np.int64)
+        weights = np.zeros((len(location_axis), width))
+        present = np.zeros((len(location_axis), width), dtype=bool)
+        for location_id, items in analogues.items():
+            row = np.searchsorted(location_axis, location_id)
+            years[row, :len(items)] = [year for year, _ in items]
+            present[row, :len(items)] = True
+            scores = np.array([similarity for _, similarity in items], dtype=np.float64)
+            weights[row, :len(items)] = scores / scores.sum() if scores.sum() > 0 else 1.0 / len(items)
+
+        # Steps of the season: days from the season start, or the season months
+        first_month, last_month, last_offset = months[0], months[-1], offsets[-1][1]
+
+        def season_start(year: int) -> date:
+            return date(year, first_month, 1)
+
+        def season_end(year: int) -> date:
+            return date(year + last_offset, last_month, calendar.monthrange(year + last_offset, last_month)[1])
+
+        analogue_years = {int(year) for year in years[present]}
+        if source == "daily":
+            steps = max(((season_end(year) - season_start(year)).days + 1 for year in analogue_years), default=0)
+        else:
+            steps = len(months)
+
+        dates = np.full((len(location_axis), width, steps), np.datetime64("NaT"), dtype="datetime64[D]")
+        for row, column in zip(*np.nonzero(present)):
+            start = season_start(int(years[row, column]))
+            if source == "daily":
+                length = (season_end(int(years[row, column])) - start).days + 1
+                dates[row, column, :length] = np.arange(np.datetime64(start, "D"), np.datetime64(start, "D") + length)
+            else:
+                dates[row, column] = [np.datetime64(date(start.year + offset, month, 1), "D") for month, offset in offsets]
+
+        values = np.full((len(location_axis), len(measure_axis), width, steps), np.nan)
+        data = [row for row in rows if row[4] is not None]
+        if data:
+            month_position = {month: position for position, (month, _) in enumerate(offsets)}
+            location_index = np.searchsorted(location_axis, [row[1] for row in data])
+            measure_index = np.searchsorted(measure_axis, [row[4] for row in data])
+            slot_index = np.array([slots[row[0]] for row in data])
+            if source == "daily":
+                step_index = np.array([(row[5] - season_start(row[2])).days for row in data])
+            else:
+                step_index = np.array([month_position[row[5].month] for row in data])
+            values[location_index, measure_index, slot_index, step_index] = [row[6] for row in data]
+
+        # Weighted mean over the analogues that have a value at each step
+        scenario_weights = np.where(np.isnan(values), 0.0, weights[:, None, :, None])
+        total_weight = scenario_weights.sum(axis=2)
+        weighted_sum = np.nansum(values * scenario_weights, axis=2)
+        weighted_mean = np.divide(weighted_sum, total_weight, out=np.full(total_weight.shape, np.nan), where=total_weight > 0)
+
+        return {
+            "location_ids": location_axis,
+            "measure_ids": measure_axis,
+            "years": years,
+            "weights": weights,
+            "dates": dates,
+            "values": values,
+            "weighted_mean": weighted_mean
+        }
+
+    def _validate_batch(self, objs_in: List[ForecastAnalogueCreate], db: Optional[Session] = None):
+        """Set-based validation so bulk_create() of a forecast run costs a few queries per batch"""
+        ForecastAnalogueValidator.batch_validate(db, objs_in)
+
     def _validate_create(self, obj_in: ForecastAnalogueCreate, db: Optional[Session] = None):
         ForecastAnalogueValidator.create_validate(db, obj_in)
\ No newline at end of file
@@ -1,15 +1,103 @@
 from datetime import date
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
-from ..services.base_service import BaseService
+from ..cache import TTLCache
+from ..services.base_service import BULK_CHUNK_SIZE, BaseService
 from ..models import Forecast
 from ..schemas import ForecastCreate, ForecastRead, ForecastUpdate
 from ..validations import ForecastValidator
 
 class ForecastService(BaseService[Forecast, ForecastCreate, ForecastRead, ForecastUpdate]):
+    # Latest forecast per country, shared by every instance in the process
+    latest_cache = TTLCache(ttl=300)
+
     def __init__(self):
         super().__init__(Forecast, ForecastCreate, ForecastRead, ForecastUpdate)
 
+    def get_latest(self, country_id: int, db: Optional[Session] = None) -> Optional[ForecastRead]:
+        """
+        Most recent enabled forecast of a country (highest run_date, then highest ID).
+        Served from latest_cache, which is cleared whenever a forecast is written. Calls made
+        with a db session bypass it, since they may see uncommitted data of their own transaction.
+        """
+        def load():
+            with self._session_scope(db) as session:
+                obj = (
+                    session.query(self.model)
+                    .filter(self.model.country_id == country_id, self.model.enable == True)
+                    .order_by(self.model.run_date.desc(), self.model.id.desc())
+                    .first()
+                )
+                return ForecastRead.model_validate(obj) if obj else None
+
+        if db is not None:
+            return load()
+        latest = self.latest_cache.get_or_set(("country", country_id), load)
+        return latest.model_copy() if latest else None
+
+    def get_latest_all(self, db: Optional[Session] = None) -> List[ForecastRead]:
+        """
+        Most recent enabled forecast of every country, ordered by country, in one query.
+        Served from latest_cache, which is cleared whenever a forecast is written. Calls made
+        with a db session bypass it, since they may see uncommitted data of their own transaction.
+        """
+        def load():
+            with self._session_scope(db) as session:
+                ordering = (self.model.run_date.desc(), self.model.id.desc())
+                if self._supports_window_functions(session):
+                    position = func.row_number().over(partition_by=self.model.country_id, order_by=ordering).label("position")
+                    ranked = select(self.model.id, position).where(self.model.enable == True).subquery()
+                    objs = session.scalars(
+                        select(self.model)
+                        .join(ranked, ranked.c.id == self.model.id)
+                        .where(ranked.c.position == 1)
+                        .order_by(self.model.country_id)
+                    ).all()
+                else:
+                    objs, seen = [], set()
+                    for obj in session.scalars(
+                        select(self.model).where(self.model.enable == True).order_by(self.model.country_id, *ordering)
+                    ):
+                        if obj.country_id not in seen:
+                            seen.add(obj.country_id)
+                            objs.append(obj)
+                return [ForecastRead.model_validate(obj) for obj in objs]
+
+        if db is not None:
+            return load()
+        return [forecast.model_copy() for forecast in self.latest_cache.get_or_set("all", load)]
+
+    def create(self, obj_in: ForecastCreate, db: Optional[Session] = None) -> ForecastRead:
+        forecast = super().create(obj_in, db)
+        self.latest_cache.clear()
+        return forecast
+
+    def bulk_create(self, objs_in: List[ForecastCreate], batch_size: int = 1000, db: Optional[Session] = None) -> int:
+        created = super().bulk_create(objs_in, batch_size, db)
+        self.latest_cache.clear()
+        return created
+
+    def update(self, id: int, obj_in: ForecastUpdate | Dict[str, Any], db: Optional[Session] = None) -> Optional[ForecastRead]:
+        forecast = super().update(id, obj_in, db)
+        self.latest_cache.clear()
+        return forecast
+
+    def delete(self, id: int, db: Optional[Session] = None) -> bool:
+        deleted = super().delete(id, db)
+        self.latest_cache.clear()
+        return deleted
+
+    def bulk_update(self, target: List[int] | Dict[str, Any], values: ForecastUpdate | Dict[str, Any], chunk_size: int = BULK_CHUNK_SIZE, db: Optional[Session] = None) -> int:
+        updated = super().bulk_update(target, values, chunk_size, db)
+        self.latest_cache.clear()
+        return updated
+
+    def bulk_delete(self, target: List[int] | Dict[str, Any], soft: bool = True, chunk_size: int = BULK_CHUNK_SIZE, db: Optional[Session] = None) -> int:
+        deleted = super().bulk_delete(target, soft, chunk_size, db)
+        self.latest_cache.clear()
+        return deleted
+
     def get_by_run_date(self, 
                        run_date: date,
                        enabled: bool = True,
@@ -35,5 +35,8 @@ class HistoricalAgroclimaticIndicatorService(
             objs = session.query(self.model).filter(self.model.indicator_id == indicator_id).all()
             return [HistoricalAgroclimaticIndicatorRead.model_validate(obj) for obj in objs]
 
+    def _validate_batch(self, objs_in: List[HistoricalAgroclimaticIndicatorCreate], db: Optional[Session] = None):
+        HistoricalAgroclimaticIndicatorValidator.batch_validate(db, objs_in)
+
     def _validate_create(self, obj_in: HistoricalAgroclimaticIndicatorCreate, db: Optional[Session] = None):
         HistoricalAgroclimaticIndicatorValidator.create_validate(db, obj_in)
\ No newline at end of file
@@ -1,7 +1,8 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from sqlalchemy import or_
 from sqlalchemy.orm import Session
-from ..services.base_service import BaseService
+from ..cache import single_flight
+from ..services.base_service import BULK_CHUNK_SIZE, BaseService
 from ..models import MngLocation, MngCountry, MngAdmin1, MngAdmin2, MngSource
 from ..validations import MngLocationValidator
 from ..schemas import LocationCreate, LocationRead, LocationUpdate
@@ -10,6 +11,36 @@ class MngLocationService(BaseService[MngLocation, LocationCreate, LocationRead,
     def __init__(self):
         super().__init__(MngLocation, LocationCreate, LocationRead, LocationUpdate)
 
+    def create(self, obj_in: LocationCreate, db: Optional[Session] = None) -> LocationRead:
+        location = super().create(obj_in, db)
+        self.get_by_country_id.cache.clear()
+        return location
+
+    def bulk_create(self, objs_in: List[LocationCreate], batch_size: int = 1000, db: Optional[Session] = None) -> int:
+        created = super().bulk_create(objs_in, batch_size, db)
+        self.get_by_country_id.cache.clear()
+        return created
+
+    def update(self, id: int, obj_in: LocationUpdate | Dict[str, Any], db: Optional[Session] = None) -> Optional[LocationRead]:
+        location = super().update(id, obj_in, db)
+        self.get_by_country_id.cache.clear()
+        return location
+
+    def delete(self, id: int, db: Optional[Session] = None) -> bool:
+        deleted = super().delete(id, db)
+        self.get_by_country_id.cache.clear()
+        return deleted
+
+    def bulk_update(self, target: List[int] | Dict[str, Any], values: LocationUpdate | Dict[str, Any], chunk_size: int = BULK_CHUNK_SIZE, db: Optional[Session] = None) -> int:
+        updated = super().bulk_update(target, values, chunk_size, db)
+        self.get_by_country_id.cache.clear()
+        return updated
+
+    def bulk_delete(self, target: List[int] | Dict[str, Any], soft: bool = True, chunk_size: int = BULK_CHUNK_SIZE, db: Optional[Session] = None) -> int:
+        deleted = super().bulk_delete(target, soft, chunk_size, db)
+        self.get_by_country_id.cache.clear()
+        return deleted
+
     def get_by_visible(self, visible: bool, enabled: bool = True, db: Optional[Session] = None) -> List[LocationRead]:
         """Obtiene ubicaciones por visibilidad y habilitación"""
         with self._session_scope(db) as session:
@@ -54,8 +85,13 @@ class MngLocationService(BaseService[MngLocation, LocationCreate, LocationRead,
             ).all()
             return [LocationRead.model_validate(obj) for obj in objs]
 
+    @single_flight(ttl=30)
     def get_by_country_id(self, country_id: int, enabled: bool = True, db: Optional[Session] = None) -> List[LocationRead]:
-        """Obtiene ubicaciones por ID de país"""
+        """
+        Obtiene ubicaciones por ID de país.
+        Sin db, las llamadas concurrentes comparten una consulta y el resultado se guarda 30 segundos
+        (se limpia con cada escritura del servicio).
+        """
         with self._session_scope(db) as session:
             objs = (
                 session.query(self.model)
@@ -0,0 +1,84 @@
+from contextlib import nullcontext
+from typing import Dict, Optional, Set, Union
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from ..cache import TTLCache
+from ..database import get_db
+from ..enums import Modules
+from ..models import UserAccess, User
+
+# CRUD flags of UserAccess, one bit each per module
+ACTIONS = ("create", "read", "update", "delete")
+MODULES = tuple(Modules)
+
+
+class PermissionResolver:
+    """
+    Answers authorization checks from a compiled permission matrix.
+
+    A user's accesses are compiled into one integer per country: for module number m and
+    action number a the bit m * len(ACTIONS) + a is set when any of the user's accesses
+    grants it. Matrices are cached per keycloak ID and the cache is cleared by the
+    UserAccessService write methods.
+    """
+
+    # Compiled matrices by keycloak ID, shared by every instance in the process
+    cache = TTLCache(ttl=60)
+
+    @staticmethod
+    def bit(module: Union[Modules, str], action: str) -> int:
+        """Bit of a (module, action) pair"""
+        if action not in ACTIONS:
+            raise ValueError(f"Invalid action '{action}', expected one of {', '.join(ACTIONS)}")
+        return 1 << (MODULES.index(Modules(module)) * len(ACTIONS) + ACTIONS.index(action))
+
+    @classmethod
+    def invalidate(cls, keycloak_ext_id: Optional[str] = None):
+        """Drop the cached matrix of one user, or of every user"""
+        if keycloak_ext_id is None:
+            cls.cache.clear()
+        else:
+            cls.cache.invalidate(keycloak_ext_id.strip())
+
+    def get_matrix(self, keycloak_ext_id: str, db: Optional[Session] = None) -> Dict[int, int]:
+        """Permission bitmask per country ID of an enabled user (empty for unknown or disabled users)"""
+        keycloak_ext_id = keycloak_ext_id.strip()
+
+        def load():
+            with nullcontext(db) if db else get_db() as session:
+                rows = session.execute(
+                    select(UserAccess.country_id, UserAccess.module, UserAccess.create,
+                           UserAccess.read, UserAccess.update, UserAccess.delete)
+                    .join(User, User.id == UserAccess.user_id)
+                    .where(User.keycloak_ext_id == keycloak_ext_id, User.enable == True)
+                ).all()
+            matrix: Dict[int, int] = {}
+            for country_id, module, *flags in rows:
+                mask = matrix.get(country_id, 0)
+                for action, granted in zip(ACTIONS, flags):
+                    if granted:
+                        mask |= self.bit(module, action)
+                matrix[country_id] = mask
+            return matrix
+
+        return self.cache.get_or_set(keycloak_ext_id, load)
+
+    def can(self,
+            keycloak_ext_id: str,
+            country_id: int,
+            module: Union[Modules, str],
+            action: str,
+            db: Optional[Session] = None) -> bool:
+        """Whether the user may perform action ("create", "read", "update" or "delete") on module in a country"""
+        bit = self.bit(module, action)
+        return bool(self.get_matrix(keycloak_ext_id, db).get(country_id, 0) & bit)
+
+    def get_permissions(self, keycloak_ext_id: str, country_id: int, db: Optional[Session] = None) -> Dict[Modules, Set[str]]:
+        """Granted actions per module of the user in a country"""
+        mask = self.get_matrix(keycloak_ext_id, db).get(country_id, 0)
+        permissions = {}
+        for module in MODULES:
+            actions = {action for action in ACTIONS if mask & self.bit(module, action)}
+            if actions:
+                permissions[module] = actions
+        return permissions
@@ -1,6 +1,7 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from sqlalchemy.orm import Session
 from ..services.base_service import BaseService
+from ..services.permission_resolver import PermissionResolver
 from ..models import UserAccess, User, MngCountry
 from ..validations import UserAccessValidator
 from ..schemas import UserAccessCreate, UserAccessRead, UserAccessUpdate
@@ -68,6 +69,26 @@ class UserAccessService(BaseService[UserAccess, UserAccessCreate, UserAccessRead
             )
             return [UserAccessRead.model_validate(obj) for obj in objs]
 
+    def create(self, obj_in: UserAccessCreate, db: Optional[Session] = None) -> UserAccessRead:
+        access = super().create(obj_in, db)
+        PermissionResolver.invalidate()
+        return access
+
+    def bulk_create(self, objs_in: List[UserAccessCreate], batch_size: int = 1000, db: Optional[Session] = None) -> int:
+        created = super().bulk_create(objs_in, batch_size, db)
+        PermissionResolver.invalidate()
+        return created
+
+    def update(self, id: Any, obj_in: UserAccessUpdate | Dict[str, Any], db: Optional[Session] = None) -> Optional[UserAccessRead]:
+        access = super().update(id, obj_in, db)
+        PermissionResolver.invalidate()
+        return access
+
+    def delete(self, id: Any, db: Optional[Session] = None) -> bool:
+        deleted = super().delete(id, db)
+        PermissionResolver.invalidate()
+        return deleted
+
     def _validate_create(self, obj_in: UserAccessCreate, db: Optional[Session] = None):
         """Automatic validation called from BaseService.create()"""
         UserAccessValidator.create_validate(db, obj_in)
@@ -80,7 +101,8 @@ class UserAccessService(BaseService[UserAccess, UserAccessCreate, UserAccessRead
                 self.model.country_id == country_id
             ).delete(synchronize_session=False)
             session.commit()
-            return deleted_count
+        PermissionResolver.invalidate()
+        return deleted_count
 
     def delete_by_user_country_and_module(self, user_id: int, country_id: int, module: str, db: Optional[Session] = None) -> bool:
         """Delete a specific user access by user_id, country_id and module."""
@@ -91,4 +113,5 @@ class UserAccessService(BaseService[UserAccess, UserAccessCreate, UserAccessRead
                 self.model.module == module
             ).delete(synchronize_session=False)
             session.commit()
-            return deleted_count > 0
+        PermissionResolver.invalidate()
+        return deleted_count > 0
@@ -1,6 +1,7 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from sqlalchemy.orm import Session, joinedload
-from ..services.base_service import BaseService
+from ..services.base_service import BULK_CHUNK_SIZE, BaseService
+from ..services.permission_resolver import PermissionResolver
 from ..models import User, UserAccess, Role
 from ..validations import UserValidator
 from ..schemas import UserCreate, UserRead, UserUpdate
@@ -77,6 +78,26 @@ class UserService(BaseService[User, UserCreate, UserRead, UserUpdate]):
             )
             return [UserRead.model_validate(obj) for obj in objs]
 
+    def update(self, id: int, obj_in: UserUpdate | Dict[str, Any], db: Optional[Session] = None) -> Optional[UserRead]:
+        user = super().update(id, obj_in, db)
+        PermissionResolver.invalidate()
+        return user
+
+    def delete(self, id: int, db: Optional[Session] = None) -> bool:
+        deleted = super().delete(id, db)
+        PermissionResolver.invalidate()
+        return deleted
+
+    def bulk_update(self, target: List[int] | Dict[str, Any], values: UserUpdate | Dict[str, Any], chunk_size: int = BULK_CHUNK_SIZE, db: Optional[Session] = None) -> int:
+        updated = super().bulk_update(target, values, chunk_size, db)
+        PermissionResolver.invalidate()
+        return updated
+
+    def bulk_delete(self, target: List[int] | Dict[str, Any], soft: bool = True, chunk_size: int = BULK_CHUNK_SIZE, db: Optional[Session] = None) -> int:
+        deleted = super().bulk_delete(target, soft, chunk_size, db)
+        PermissionResolver.invalidate()
+        return deleted
+
     def _validate_create(self, obj_in: UserCreate, db: Optional[Session] = None):
         """Automatic validation called from BaseService.create()"""
         UserValidator.create_validate(db, obj_in)
@@ -1,31 +1,41 @@
-from .mng_admin_1_validation import MngAdmin1Validator
-from .mng_admin_2_validation import MngAdmin2Validator
-from .mng_country_validation import MngCountryValidator
-from .mng_location_validation import MngLocationValidator
-from .mng_climate_measure_validation import MngClimateMeasureNameValidator
-from .climate_historical_monthly_validation import ClimateHistoricalMonthlyValidator
-from .climate_historical_climatology_validation import ClimateHistoricalClimatologyValidator
-from .climate_historical_daily_validation import ClimateHistoricalDailyValidator
-from .mng_source_validation import MngSourceValidator
-from .climate_historical_indicator_validation import ClimateHistoricalIndicatorValidator
-from .mng_indicators_validation import IndicatorValidator
-from .mng_cultivar_validation import MngCultivarValidator
-from .mng_soil_validation import MngSoilValidator
-from .mng_data_source_validation import MngDataSourceValidator
-from .mng_phenological_stage_validation import MngPhenologicalStageValidator
-from .mng_stress_validation import MngStressValidator
-from .mng_crop_validation import MngCropValidator
-from .mng_setup_validation import MngSetupValidator
-from .mng_configuration_file_validation import MngConfigurationFileValidator
-from .mng_season_validation import MngSeasonValidator
-from .forecast_validation import ForecastValidator
-from .forecast_analogue_validation import ForecastAnalogueValidator
-from .historical_agroclimatic_indicator_validation import HistoricalAgroclimaticIndicatorValidator
-from .phenological_stage_stress_validation import PhenologicalStageStressValidator
-from .user_validation import UserValidator
-from .role_validation import RoleValidator
-from .user_access_validation import UserAccessValidator
-from .mng_country_indicator_validation import MngCountryIndicatorValidator
-from .mng_indicator_category_validation import MngIndicatorCategoryValidator
-from .mng_indicators_features_validation import MngIndicatorsFeaturesValidator
-from .mng_country_climate_measure_validation import MngCountryClimateMeasureValidator
+"""Validators, imported on first access"""
+from ..lazy import lazy_exports
+
+_SUBMODULES = {
+    "mng_admin_1_validation": ("MngAdmin1Validator",),
+    "mng_admin_2_validation": ("MngAdmin2Validator",),
+    "mng_country_validation": ("MngCountryValidator",),
+    "mng_location_validation": ("MngLocationValidator",),
+    "mng_climate_measure_validation": ("MngClimateMeasureNameValidator",),
+    "climate_historical_monthly_validation": ("ClimateHistoricalMonthlyValidator",),
+    "climate_historical_climatology_validation": ("ClimateHistoricalClimatologyValidator",),
+    "climate_historical_daily_validation": ("ClimateHistoricalDailyValidator",),
+    "mng_source_validation": ("MngSourceValidator",),
+    "climate_historical_indicator_validation": ("ClimateHistoricalIndicatorValidator",),
+    "mng_indicators_validation": ("IndicatorValidator",),
+    "mng_cultivar_validation": ("MngCultivarValidator",),
+    "mng_soil_validation": ("MngSoilValidator",),
+    "mng_data_source_validation": ("MngDataSourceValidator",),
+    "mng_phenological_stage_validation": ("MngPhenologicalStageValidator",),
+    "mng_stress_validation": ("MngStressValidator",),
+    "mng_crop_validation": ("MngCropValidator",),
+    "mng_setup_validation": ("MngSetupValidator",),
+    "mng_configuration_file_validation": ("MngConfigurationFileValidator",),
+    "mng_season_validation": ("MngSeasonValidator",),
+    "forecast_validation": ("ForecastValidator",),
+    "forecast_analogue_validation": ("ForecastAnalogueValidator",),
+    "historical_agroclimatic_indicator_validation": ("HistoricalAgroclimaticIndicatorValidator",),
+    "phenological_stage_stress_validation": ("PhenologicalStageStressValidator",),
+    "user_validation": ("UserValidator",),
+    "role_validation": ("RoleValidator",),
+    "user_access_validation": ("UserAccessValidator",),
+    "mng_country_indicator_validation": ("MngCountryIndicatorValidator",),
+    "mng_indicator_category_validation": ("MngIndicatorCategoryValidator",),
+    "mng_indicators_features_validation": ("MngIndicatorsFeaturesValidator",),
+    "mng_country_climate_measure_validation": ("MngCountryClimateMeasureValidator",),
+    "validation_context": ("ValidationContext",),
+    "batch_validation": ("BatchValidation", "BatchValidator"),
+}
+
+__all__ = [name for names in _SUBMODULES.values() for name in names]
+__getattr__, __dir__ = lazy_exports(__name__, _SUBMODULES)
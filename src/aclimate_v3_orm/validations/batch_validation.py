@@ -0,0 +1,184 @@
+"""
+Column-wise versions of the validator rules for bulk loaders.
+
+The checks take NumPy arrays (or anything np.asarray accepts, including pyarrow arrays)
+and flag rows in a BatchValidation, which keeps one bit per failed rule for every row.
+Loaders can reject the batch, or drop and quarantine the flagged rows, without building a
+schema object per row.
+"""
+from datetime import date
+from typing import Any, Dict, List, Optional
+import numpy as np
+
+# Reasons of the built-in rules
+FUTURE_DATE = "date in the future"
+MISSING_DATE = "missing date"
+NOT_NUMERIC = "value is not numeric"
+MISSING_VALUE = "missing value"
+NOT_POSITIVE_ID = "id must be greater than 0"
+LATITUDE_RANGE = "latitude must be between -90 and 90"
+LONGITUDE_RANGE = "longitude must be between -180 and 180"
+START_AFTER_END = "start date after end date"
+
+
+def _array(column: Any) -> np.ndarray:
+    """NumPy view of a list, NumPy array or pyarrow (Chunked)Array"""
+    if hasattr(column, "to_numpy") and not isinstance(column, np.ndarray):
+        return column.to_numpy(zero_copy_only=False) if "pyarrow" in type(column).__module__ else column.to_numpy()
+    return np.asarray(column)
+
+
+def _as_float(value: Any) -> float:
+    """Float of a numeric value, NaN for anything else (booleans and numeric strings included)"""
+    if isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, (bool, np.bool_)):
+        return float(value)
+    return np.nan
+
+
+class BatchValidation:
+    """
+    Result of the checks of one batch: a bitmask per row, with one bit per reason.
+
+    Example:
+        result = BatchValidator.validate_historical(columns)
+        if result.any():
+            quarantine(rows[result.invalid])
+            rows = rows[result.valid]
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.flags = np.zeros(size, dtype=np.uint32)
+        self.reasons: List[str] = []
+
+    def bit(self, reason: str) -> int:
+        """Bit of a reason, assigned in the order reasons are first flagged"""
+        if reason not in self.reasons:
+            if len(self.reasons) == 32:
+                raise ValueError("A batch validation supports at most 32 reasons")
+            self.reasons.append(reason)
+        return 1 << self.reasons.index(reason)
+
+    def flag(self, reason: str, mask: np.ndarray) -> "BatchValidation":
+        """Mark the rows where mask is True as failing reason"""
+        mask = np.asarray(mask, dtype=bool)
+        if mask.shape != (self.size,):
+            raise ValueError(f"Mask of {mask.shape} rows for a batch of {self.size}")
+        if mask.any():
+            self.flags[mask] |= np.uint32(self.bit(reason))
+        return self
+
+    @property
+    def invalid(self) -> np.ndarray:
+        """Boolean mask of the rows failing any rule"""
+        return self.flags != 0
+
+    @property
+    def valid(self) -> np.ndarray:
+        """Boolean mask of the rows passing every rule"""
+        return self.flags == 0
+
+    def any(self) -> bool:
+        return bool(self.flags.any())
+
+    def counts(self) -> Dict[str, int]:
+        """Number of rows failing each reason"""
+        counts = {reason: int(np.count_nonzero(self.flags & np.uint32(1 << bit))) for bit, reason in enumerate(self.reasons)}
+        return {reason: count for reason, count in counts.items() if count}
+
+    def reasons_of(self, row: int) -> List[str]:
+        """Reasons a row failed"""
+        return [reason for bit, reason in enumerate(self.reasons) if self.flags[row] & (1 << bit)]
+
+    def raise_if_invalid(self, label: str = "Batch"):
+        """Raise ValueError with the failing rows per reason"""
+        if self.any():
+            reasons = ", ".join(f"{reason} ({count})" for reason, count in self.counts().items())
+            raise ValueError(f"{label} has {int(np.count_nonzero(self.flags))} invalid rows: {reasons}")
+
+
+class BatchValidator:
+    """Column-wise rules shared by the bulk loaders"""
+
+    @staticmethod
+    def check_dates_not_future(result: BatchValidation, dates: Any, today: Optional[date] = None) -> BatchValidation:
+        """Same rule as ClimateHistoricalDailyValidator.validate_date, also rejecting missing dates (None or NaT)"""
+        dates = _array(dates).astype("datetime64[D]")
+        result.flag(MISSING_DATE, np.isnat(dates))
+        return result.flag(FUTURE_DATE, dates > np.datetime64(today or date.today(), "D"))
+
+    @staticmethod
+    def check_numeric(result: BatchValidation, values: Any) -> BatchValidation:
+        """
+        Same rule as ClimateHistoricalDailyValidator.validate_value, also rejecting NaN and missing values.
+        Numeric arrays are checked in bulk; only object arrays are inspected value by value.
+        """
+        values = _array(values)
+        if values.dtype.kind in "iuf":
+            return result.flag(MISSING_VALUE, np.isnan(values.astype(np.float64)))
+        numbers = np.frompyfunc(_as_float, 1, 1)(values).astype(np.float64)
+        missing = np.array([value is None or value != value for value in values.tolist()], dtype=bool)
+        result.flag(MISSING_VALUE, missing)
+        return result.flag(NOT_NUMERIC, np.isnan(numbers) & ~missing)
+
+    @staticmethod
+    def check_positive_ids(result: BatchValidation, ids: Any, name: str = "id") -> BatchValidation:
+        """Same rule as the Field(gt=0) constraints of the Create schemas"""
+        ids = _array(ids)
+        reason = NOT_POSITIVE_ID if name == "id" else f"{name} must be greater than 0"
+        if ids.dtype.kind not in "iuf":
+            ids = np.frompyfunc(_as_float, 1, 1)(ids).astype(np.float64)
+        with np.errstate(invalid="ignore"):
+            return result.flag(reason, ~(ids > 0))
+
+    @staticmethod
+    def check_latitudes(result: BatchValidation, latitudes: Any) -> BatchValidation:
+        """Same rule as MngLocationValidator.validate_latitude"""
+        latitudes = _array(latitudes).astype(np.float64)
+        with np.errstate(invalid="ignore"):
+            return result.flag(LATITUDE_RANGE, (latitudes < -90) | (latitudes > 90))
+
+    @staticmethod
+    def check_longitudes(result: BatchValidation, longitudes: Any) -> BatchValidation:
+        """Same rule as MngLocationValidator.validate_longitude"""
+        longitudes = _array(longitudes).astype(np.float64)
+        with np.errstate(invalid="ignore"):
+            return result.flag(LONGITUDE_RANGE, (longitudes < -180) | (longitudes > 180))
+
+    @staticmethod
+    def check_date_order(result: BatchValidation, start_dates: Any, end_dates: Any) -> BatchValidation:
+        """Same rule as ClimateHistoricalIndicatorValidator.validate_dates; missing end dates pass"""
+        start_dates = _array(start_dates).astype("datetime64[D]")
+        end_dates = _array(end_dates).astype("datetime64[D]")
+        return result.flag(START_AFTER_END, ~np.isnat(end_dates) & (start_dates > end_dates))
+
+    @staticmethod
+    def validate_historical(columns: Dict[str, Any], today: Optional[date] = None) -> BatchValidation:
+        """Rules of ClimateHistoricalDailyCreate / ClimateHistoricalMonthlyCreate rows"""
+        result = BatchValidation(len(_array(columns["value"])))
+        BatchValidator.check_positive_ids(result, columns["location_id"], "location_id")
+        BatchValidator.check_positive_ids(result, columns["measure_id"], "measure_id")
+        BatchValidator.check_dates_not_future(result, columns["date"], today)
+        return BatchValidator.check_numeric(result, columns["value"])
+
+    @staticmethod
+    def validate_locations(columns: Dict[str, Any]) -> BatchValidation:
+        """Rules of LocationCreate rows"""
+        result = BatchValidation(len(_array(columns["latitude"])))
+        for name in ("admin_2_id", "source_id"):
+            if name in columns:
+                BatchValidator.check_positive_ids(result, columns[name], name)
+        BatchValidator.check_latitudes(result, columns["latitude"])
+        return BatchValidator.check_longitudes(result, columns["longitude"])
+
+    @staticmethod
+    def validate_indicators(columns: Dict[str, Any]) -> BatchValidation:
+        """Rules of ClimateHistoricalIndicatorCreate rows"""
+        result = BatchValidation(len(_array(columns["value"])))
+        BatchValidator.check_positive_ids(result, columns["indicator_id"], "indicator_id")
+        BatchValidator.check_positive_ids(result, columns["location_id"], "location_id")
+        BatchValidator.check_numeric(result, columns["value"])
+        if "end_date" in columns:
+            BatchValidator.check_date_order(result, columns["start_date"], columns["end_date"])
+        return result
+
@@ -1,6 +1,7 @@
 from sqlalchemy import Date
 from sqlalchemy.orm import Session
 from ..models import ClimateHistoricalDaily, MngLocation, MngClimateMeasure
+from .validation_context import ValidationContext
 from datetime import datetime
 
 class ClimateHistoricalDailyValidator:
@@ -20,15 +21,13 @@ class ClimateHistoricalDailyValidator:
     @staticmethod
     def validate_location_exists(db: Session, location_id: int):
         """ Validate if the location exists in the database """
-        existing_location = db.query(MngLocation).filter(MngLocation.id == location_id).first()
-        if not existing_location:
+        if not ValidationContext.for_session(db).exists(MngLocation, location_id):
             raise ValueError(f"Location with ID {location_id} does not exist.")
 
     @staticmethod
     def validate_measure_exists(db: Session, measure_id: int):
         """ Validate if the measure exists in the database """
-        existing_measure = db.query(MngClimateMeasure).filter(MngClimateMeasure.id == measure_id).first()
-        if not existing_measure:
+        if not ValidationContext.for_session(db).exists(MngClimateMeasure, measure_id):
             raise ValueError(f"Climate measure with ID {measure_id} does not exist.")
 
     @staticmethod
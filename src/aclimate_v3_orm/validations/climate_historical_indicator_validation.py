@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 from ..models import ClimateHistoricalIndicator, MngLocation, MngIndicator
-from typing import Optional
+from .validation_context import ValidationContext
+from typing import List, Optional
 from datetime import date
 from ..enums import Period
 
@@ -31,13 +32,13 @@ class ClimateHistoricalIndicatorValidator:
     @staticmethod
     def validate_indicator_exists(db: Session, indicator_id: int):
         """Validate if the indicator exists"""
-        if not db.query(MngIndicator).filter(MngIndicator.id == indicator_id).first():
+        if not ValidationContext.for_session(db).exists(MngIndicator, indicator_id):
             raise ValueError(f"No indicator found with ID {indicator_id}")
 
     @staticmethod
     def validate_location_exists(db: Session, location_id: int):
         """Validate if the location exists"""
-        if not db.query(MngLocation).filter(MngLocation.id == location_id).first():
+        if not ValidationContext.for_session(db).exists(MngLocation, location_id):
             raise ValueError(f"No location found with ID {location_id}")
 
     @staticmethod
@@ -77,4 +78,27 @@ class ClimateHistoricalIndicatorValidator:
             obj_in.location_id,
             obj_in.start_date,
             obj_in.period
-        )
\ No newline at end of file
+        )
+
+    @staticmethod
+    def validate_foreign_keys_batch(db: Session, indicator_ids: set, location_ids: set):
+        """Validate that every referenced indicator and location exists, with one query per table"""
+        context = ValidationContext.for_session(db)
+        missing_indicators = context.missing(MngIndicator, indicator_ids)
+        if missing_indicators:
+            raise ValueError(f"No indicator found with ID {', '.join(map(str, sorted(missing_indicators)))}")
+
+        missing_locations = context.missing(MngLocation, location_ids)
+        if missing_locations:
+            raise ValueError(f"No location found with ID {', '.join(map(str, sorted(missing_locations)))}")
+
+    @staticmethod
+    def batch_validate(db: Session, objs_in: List):
+        """Set-based validation for bulk writes: per-row checks in memory, FK checks in bulk"""
+        for obj_in in objs_in:
+            ClimateHistoricalIndicatorValidator.validate_dates(obj_in.start_date, obj_in.end_date)
+        ClimateHistoricalIndicatorValidator.validate_foreign_keys_batch(
+            db,
+            {obj_in.indicator_id for obj_in in objs_in},
+            {obj_in.location_id for obj_in in objs_in}
+        )
@@ -1,13 +1,15 @@
 from sqlalchemy.orm import Session
 from ..models import ForecastAnalogue, Forecast, MngLocation
+from .validation_context import ValidationContext
 
 class ForecastAnalogueValidator:
 
     @staticmethod
     def validate_foreign_keys(db: Session, forecast_id: int, location_id: int):
-        if not db.query(Forecast).filter(Forecast.id == forecast_id).first():
+        context = ValidationContext.for_session(db)
+        if not context.exists(Forecast, forecast_id):
             raise ValueError(f"Forecast con id '{forecast_id}' no existe.")
-        if not db.query(MngLocation).filter(MngLocation.id == location_id).first():
+        if not context.exists(MngLocation, location_id):
             raise ValueError(f"Location con id '{location_id}' no existe.")
 
     @staticmethod
@@ -24,4 +26,39 @@ class ForecastAnalogueValidator:
     @staticmethod
     def create_validate(db: Session, obj_in):
         ForecastAnalogueValidator.validate_foreign_keys(db, obj_in.forecast_id, obj_in.location_id)
-        ForecastAnalogueValidator.validate_unique(db, obj_in.forecast_id, obj_in.location_id, obj_in.year, obj_in.rank)
\ No newline at end of file
+        ForecastAnalogueValidator.validate_unique(db, obj_in.forecast_id, obj_in.location_id, obj_in.year, obj_in.rank)
+
+    @staticmethod
+    def validate_foreign_keys_batch(db: Session, forecast_ids: set, location_ids: set):
+        """Valida las llaves foráneas de un lote con una consulta por tabla"""
+        context = ValidationContext.for_session(db)
+        missing = context.missing(Forecast, forecast_ids)
+        if missing:
+            raise ValueError(f"Forecast con id '{', '.join(map(str, sorted(missing)))}' no existe.")
+        missing = context.missing(MngLocation, location_ids)
+        if missing:
+            raise ValueError(f"Location con id '{', '.join(map(str, sorted(missing)))}' no existe.")
+
+    @staticmethod
+    def validate_unique_batch(db: Session, objs_in):
+        """Valida que las llaves (forecast, location, year, rank) no se repitan en el lote ni en la base de datos"""
+        keys = [(obj_in.forecast_id, obj_in.location_id, obj_in.year, obj_in.rank) for obj_in in objs_in]
+        if len(set(keys)) != len(keys):
+            raise ValueError("El lote contiene registros repetidos con los mismos valores clave.")
+        existing = db.query(
+            ForecastAnalogue.forecast_id, ForecastAnalogue.location_id, ForecastAnalogue.year, ForecastAnalogue.rank
+        ).filter(
+            ForecastAnalogue.forecast_id.in_({key[0] for key in keys}),
+            ForecastAnalogue.location_id.in_({key[1] for key in keys})
+        )
+        if set(keys) & {tuple(row) for row in existing}:
+            raise ValueError("Ya existe un registro con estos valores clave.")
+
+    @staticmethod
+    def batch_validate(db: Session, objs_in):
+        ForecastAnalogueValidator.validate_foreign_keys_batch(
+            db,
+            {obj_in.forecast_id for obj_in in objs_in},
+            {obj_in.location_id for obj_in in objs_in}
+        )
+        ForecastAnalogueValidator.validate_unique_batch(db, objs_in)
@@ -5,16 +5,18 @@ from ..models import (
     MngLocation,
     MngPhenologicalStage
 )
+from .validation_context import ValidationContext
 
 class HistoricalAgroclimaticIndicatorValidator:
 
     @staticmethod
     def validate_foreign_keys(db: Session, indicator_id: int, location_id: int, phenological_id: int):
-        if not db.query(MngIndicator).filter(MngIndicator.id == indicator_id).first():
+        context = ValidationContext.for_session(db)
+        if not context.exists(MngIndicator, indicator_id):
             raise ValueError(f"Indicator con id '{indicator_id}' no existe.")
-        if not db.query(MngLocation).filter(MngLocation.id == location_id).first():
+        if not context.exists(MngLocation, location_id):
             raise ValueError(f"Location con id '{location_id}' no existe.")
-        if not db.query(MngPhenologicalStage).filter(MngPhenologicalStage.id == phenological_id).first():
+        if not context.exists(MngPhenologicalStage, phenological_id):
             raise ValueError(f"PhenologicalStage con id '{phenological_id}' no existe.")
 
     @staticmethod
@@ -27,4 +29,23 @@ class HistoricalAgroclimaticIndicatorValidator:
         HistoricalAgroclimaticIndicatorValidator.validate_foreign_keys(
             db, obj_in.indicator_id, obj_in.location_id, obj_in.phenological_id
         )
-        HistoricalAgroclimaticIndicatorValidator.validate_dates(obj_in.start_date, obj_in.end_date)
\ No newline at end of file
+        HistoricalAgroclimaticIndicatorValidator.validate_dates(obj_in.start_date, obj_in.end_date)
+
+    @staticmethod
+    def validate_foreign_keys_batch(db: Session, objs_in):
+        """Valida las llaves foráneas de un lote con una consulta por tabla"""
+        context = ValidationContext.for_session(db)
+        for model, field, label in (
+            (MngIndicator, "indicator_id", "Indicator"),
+            (MngLocation, "location_id", "Location"),
+            (MngPhenologicalStage, "phenological_id", "PhenologicalStage"),
+        ):
+            missing = context.missing(model, {getattr(obj_in, field) for obj_in in objs_in})
+            if missing:
+                raise ValueError(f"{label} con id '{', '.join(map(str, sorted(missing)))}' no existe.")
+
+    @staticmethod
+    def batch_validate(db: Session, objs_in):
+        for obj_in in objs_in:
+            HistoricalAgroclimaticIndicatorValidator.validate_dates(obj_in.start_date, obj_in.end_date)
+        HistoricalAgroclimaticIndicatorValidator.validate_foreign_keys_batch(db, objs_in)
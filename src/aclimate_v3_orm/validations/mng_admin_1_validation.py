@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
 from ..models import MngAdmin1, MngCountry
+from .validation_context import ValidationContext
 
 class MngAdmin1Validator:
 
@@ -12,8 +13,7 @@ class MngAdmin1Validator:
     @staticmethod
     def validate_country_id(db: Session, country_id: int):
         """ Validate if the country_id corresponds to an existing country """
-        country = db.query(MngCountry).filter(MngCountry.id == country_id).first()
-        if not country:
+        if not ValidationContext.for_session(db).exists(MngCountry, country_id):
             raise ValueError(f"Country with id '{country_id}' does not exist.")
 
     @staticmethod
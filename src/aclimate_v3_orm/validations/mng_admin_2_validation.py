@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
 from ..models import MngAdmin2, MngAdmin1
+from .validation_context import ValidationContext
 
 class MngAdmin2Validator:
 
@@ -12,8 +13,7 @@ class MngAdmin2Validator:
     @staticmethod
     def validate_admin_1_id(db: Session, admin_1_id: int):
         """ Validate that the admin_1_id corresponds to an existing Admin1 """
-        admin_1 = db.query(MngAdmin1).filter(MngAdmin1.id == admin_1_id).first()
-        if not admin_1:
+        if not ValidationContext.for_session(db).exists(MngAdmin1, admin_1_id):
             raise ValueError(f"The 'admin_1_id' '{admin_1_id}' does not correspond to a valid Admin1 record.")
 
     @staticmethod
@@ -1,6 +1,7 @@
 import os
 from sqlalchemy.orm import Session
 from ..models import MngConfigurationFile, MngSetup
+from .validation_context import ValidationContext
 
 class MngConfigurationFileValidator:
 
@@ -8,7 +9,7 @@ class MngConfigurationFileValidator:
 
     @staticmethod
     def validate_setup_id(db: Session, setup_id: int):
-        if not db.query(MngSetup).filter(MngSetup.id == setup_id).first():
+        if not ValidationContext.for_session(db).exists(MngSetup, setup_id):
             raise ValueError(f"Setup con id '{setup_id}' no existe.")
 
     @staticmethod
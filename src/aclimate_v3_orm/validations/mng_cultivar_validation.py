@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
 from ..models import MngCultivar, MngCountry, MngCrop
+from .validation_context import ValidationContext
 
 class MngCultivarValidator:
 
@@ -10,12 +11,12 @@ class MngCultivarValidator:
 
     @staticmethod
     def validate_country_id(db: Session, country_id: int):
-        if not db.query(MngCountry).filter(MngCountry.id == country_id).first():
+        if not ValidationContext.for_session(db).exists(MngCountry, country_id):
             raise ValueError(f"Country con id '{country_id}' no existe.")
 
     @staticmethod
     def validate_crop_id(db: Session, crop_id: int):
-        if not db.query(MngCrop).filter(MngCrop.id == crop_id).first():
+        if not ValidationContext.for_session(db).exists(MngCrop, crop_id):
             raise ValueError(f"Crop con id '{crop_id}' no existe.")
 
     @staticmethod
@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
 from ..models import MngDataSource, MngCountry
+from .validation_context import ValidationContext
 
 class MngDataSourceValidator:
 
@@ -15,7 +16,7 @@ class MngDataSourceValidator:
 
     @staticmethod
     def validate_country_id(db: Session, country_id: int):
-        if not db.query(MngCountry).filter(MngCountry.id == country_id).first():
+        if not ValidationContext.for_session(db).exists(MngCountry, country_id):
             raise ValueError(f"Country con id '{country_id}' no existe.")
 
     @staticmethod
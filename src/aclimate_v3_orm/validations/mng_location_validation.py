@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
 from ..models import MngLocation, MngAdmin2
+from .validation_context import ValidationContext
 import re
 
 class MngLocationValidator:
@@ -13,8 +14,7 @@ class MngLocationValidator:
     @staticmethod
     def validate_admin_2_id(db: Session, admin_2_id: int):
         """ Validate if the admin_2_id corresponds to an existing Admin2 """
-        admin_2 = db.query(MngAdmin2).filter(MngAdmin2.id == admin_2_id).first()
-        if not admin_2:
+        if not ValidationContext.for_session(db).exists(MngAdmin2, admin_2_id):
             raise ValueError(f"Admin2 with id '{admin_2_id}' does not exist.")
 
     @staticmethod
@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
 from ..models import MngPhenologicalStage, MngCrop
+from .validation_context import ValidationContext
 
 class MngPhenologicalStageValidator:
 
@@ -10,7 +11,7 @@ class MngPhenologicalStageValidator:
 
     @staticmethod
     def validate_crop_id(db: Session, crop_id: int):
-        if not db.query(MngCrop).filter(MngCrop.id == crop_id).first():
+        if not ValidationContext.for_session(db).exists(MngCrop, crop_id):
             raise ValueError(f"Crop con id '{crop_id}' no existe.")
 
     @staticmethod
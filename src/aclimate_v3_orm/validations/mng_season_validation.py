@@ -1,16 +1,17 @@
 from sqlalchemy.orm import Session
 from ..models import MngSeason, MngLocation, MngCrop
+from .validation_context import ValidationContext
 
 class MngSeasonValidator:
 
     @staticmethod
     def validate_location_id(db: Session, location_id: int):
-        if not db.query(MngLocation).filter(MngLocation.id == location_id).first():
+        if not ValidationContext.for_session(db).exists(MngLocation, location_id):
             raise ValueError(f"Location con id '{location_id}' no existe.")
 
     @staticmethod
     def validate_crop_id(db: Session, crop_id: int):
-        if not db.query(MngCrop).filter(MngCrop.id == crop_id).first():
+        if not ValidationContext.for_session(db).exists(MngCrop, crop_id):
             raise ValueError(f"Crop con id '{crop_id}' no existe.")
 
     @staticmethod
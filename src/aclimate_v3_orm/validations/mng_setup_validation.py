@@ -1,6 +1,7 @@
 # mng_setup_validation.py
 from sqlalchemy.orm import Session
 from ..models import MngCultivar, MngSoil, MngSeason
+from .validation_context import ValidationContext
 
 class MngSetupValidator:
     @staticmethod
@@ -10,16 +11,17 @@ class MngSetupValidator:
     
     @staticmethod
     def validate_foreign_keys(db: Session, cultivar_id: int, soil_id: int, season_id: int):
+        context = ValidationContext.for_session(db)
         # Validate cultivar exists
-        if not db.query(MngCultivar).filter(MngCultivar.id == cultivar_id).first():
+        if not context.exists(MngCultivar, cultivar_id):
             raise ValueError("Invalid cultivar ID")
         
         # Validate soil exists
-        if not db.query(MngSoil).filter(MngSoil.id == soil_id).first():
+        if not context.exists(MngSoil, soil_id):
             raise ValueError("Invalid soil ID")
         
         # Validate season exists
-        if not db.query(MngSeason).filter(MngSeason.id == season_id).first():
+        if not context.exists(MngSeason, season_id):
             raise ValueError("Invalid season ID")
     
     @staticmethod
@@ -1,13 +1,15 @@
 from sqlalchemy.orm import Session
 from ..models import PhenologicalStageStress, MngStress, MngPhenologicalStage
+from .validation_context import ValidationContext
 
 class PhenologicalStageStressValidator:
 
     @staticmethod
     def validate_foreign_keys(db: Session, stress_id: int, phenological_stage_id: int):
-        if not db.query(MngStress).filter(MngStress.id == stress_id).first():
+        context = ValidationContext.for_session(db)
+        if not context.exists(MngStress, stress_id):
             raise ValueError(f"Stress con id '{stress_id}' no existe.")
-        if not db.query(MngPhenologicalStage).filter(MngPhenologicalStage.id == phenological_stage_id).first():
+        if not context.exists(MngPhenologicalStage, phenological_stage_id):
             raise ValueError(f"MngPhenologicalStage con id '{phenological_stage_id}' no existe.")
 
     @staticmethod
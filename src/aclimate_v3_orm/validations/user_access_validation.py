@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
 from ..models import UserAccess, User, Role, MngCountry
+from .validation_context import ValidationContext
 from ..schemas import UserAccessCreate, UserAccessUpdate
 from ..enums import Modules
 
@@ -37,26 +38,20 @@ class UserAccessValidator:
     @staticmethod
     def validate_user_exists(db: Session, user_id: int):
         """Check if user exists"""
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
+        if not ValidationContext.for_session(db).exists(User, user_id):
             raise ValueError(f"User with id '{user_id}' does not exist.")
-        return user
 
     @staticmethod
     def validate_country_exists(db: Session, country_id: int):
         """Check if country exists"""
-        country = db.query(MngCountry).filter(MngCountry.id == country_id).first()
-        if not country:
+        if not ValidationContext.for_session(db).exists(MngCountry, country_id):
             raise ValueError(f"Country with id '{country_id}' does not exist.")
-        return country
 
     @staticmethod
     def validate_role_exists(db: Session, role_id: int):
         """Check if role exists"""
-        role = db.query(Role).filter(Role.id == role_id).first()
-        if not role:
+        if not ValidationContext.for_session(db).exists(Role, role_id):
             raise ValueError(f"Role with id '{role_id}' does not exist.")
-        return role
 
     @staticmethod
     def validate_unique_user_country_role_module(db: Session, user_id: int, country_id: int, role_id: int, module, exclude_user_id: int = None):
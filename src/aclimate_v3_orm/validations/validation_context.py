@@ -0,0 +1,59 @@
+from collections import defaultdict
+from typing import Any, Iterable, Set
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# Key of the shared context in Session.info
+CONTEXT_KEY = "validation_context"
+
+
+class ValidationContext:
+    """
+    Existence checks of referenced rows, shared by the validators of a session.
+
+    Lookups select only the primary key (``SELECT id ... WHERE id IN (...)``) and the IDs
+    found are remembered until the session's outermost transaction ends, so bulk and
+    nested creates check each parent row once per transaction.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._known = defaultdict(set)
+
+    @classmethod
+    def for_session(cls, db: Session) -> "ValidationContext":
+        """Context of the session's current transaction (a throwaway one when the session has no info dict)"""
+        info = getattr(db, "info", None)
+        if not isinstance(info, dict):
+            return cls(db)
+        context = info.get(CONTEXT_KEY)
+        if context is None:
+            context = info[CONTEXT_KEY] = cls(db)
+        return context
+
+    def exists(self, model, id: Any) -> bool:
+        """Whether a row of model with this primary key exists"""
+        known = self._known[model]
+        if id in known:
+            return True
+        if self.db.query(model.id).filter(model.id == id).first() is None:
+            return False
+        known.add(id)
+        return True
+
+    def missing(self, model, ids: Iterable[Any]) -> Set[Any]:
+        """IDs that do not match a row of model, checked with a single query"""
+        known = self._known[model]
+        pending = set(ids) - known
+        if pending:
+            found = {row[0] for row in self.db.query(model.id).filter(model.id.in_(pending))}
+            known |= found
+            pending -= found
+        return pending
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_context(session, transaction):
+    """Forget the checked IDs once the outermost transaction commits or rolls back"""
+    if transaction.parent is None:
+        session.info.pop(CONTEXT_KEY, None)
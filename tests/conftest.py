@@ -1,8 +1,18 @@
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import BigInteger, create_engine
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import sessionmaker
+from aclimate_v3_orm import models
 from aclimate_v3_orm.database.base import Base  # Adjust this import based on your actual model location
 
+# Models load lazily; register every table so foreign keys resolve in create_all
+models.import_all()
+
+@compiles(BigInteger, "sqlite")
+def _bigint_as_integer(type_, compiler, **kw):
+    """SQLite only auto-assigns ids to INTEGER PRIMARY KEY columns (PostgreSQL uses BIGSERIAL)"""
+    return "INTEGER"
+
 @pytest.fixture(scope="session")
 def engine():
     return create_engine("sqlite:///:memory:")
@@ -36,4 +46,28 @@ def sample_countries(db_session):
     db_session.add_all(countries)
     db_session.commit()
     
-    return countries
\ No newline at end of file
+    return countries
+
+@pytest.fixture(scope="function")
+def table_session(engine):
+    """
+    Factory for a real SQLite session with only the given models' tables created.
+    Needed because some tables use PostgreSQL-only types (e.g. ARRAY) that SQLite cannot render.
+
+    Usage:
+        session = table_session(ClimateHistoricalDaily, MngLocation)
+    """
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    created = []
+
+    def _create(*models):
+        tables = [model.__table__ for model in models]
+        Base.metadata.create_all(engine, tables=tables)
+        created.extend(tables)
+        return session
+
+    yield _create
+
+    session.close()
+    Base.metadata.drop_all(engine, tables=created)
@@ -0,0 +1,114 @@
+import pytest
+from datetime import date, timedelta
+
+from aclimate_v3_orm.enums import IndicatorsType, Period
+from aclimate_v3_orm.indicators import AgroclimaticEngine, stage_windows
+from aclimate_v3_orm.models import (
+    ClimateHistoricalDaily,
+    HistoricalAgroclimaticIndicator,
+    MngClimateMeasure,
+    MngIndicator,
+    MngLocation,
+    MngPhenologicalStage,
+    MngSeason
+)
+from aclimate_v3_orm.schemas import HistoricalAgroclimaticIndicatorCreate
+from aclimate_v3_orm.services import HistoricalAgroclimaticIndicatorService
+
+
+def test_stage_windows_chain_from_planting_date():
+    """Test para encadenar las ventanas de las etapas desde la siembra"""
+    windows = stage_windows(1, 10, date(2023, 1, 1), [(1, 10), (2, 20), (3, None), (4, 5)])
+
+    assert [(w.stage_id, w.start_date, w.end_date) for w in windows] == [
+        (1, date(2023, 1, 1), date(2023, 1, 10)),
+        (2, date(2023, 1, 11), date(2023, 1, 30)),
+    ]
+    assert all(w.season_id == 1 and w.location_id == 10 for w in windows)
+
+
+@pytest.fixture
+def agro_db(table_session):
+    """Sesión SQLite con una temporada, dos etapas con duración y lluvia de 5 mm cada cinco días"""
+    session = table_session(
+        ClimateHistoricalDaily, HistoricalAgroclimaticIndicator, MngClimateMeasure,
+        MngIndicator, MngLocation, MngPhenologicalStage, MngSeason
+    )
+    session.add_all([
+        MngClimateMeasure(id=1, name="Precipitation", short_name="prec", unit="mm"),
+        MngIndicator(id=1, type=IndicatorsType.AGROCLIMATIC, name="Total precipitation", short_name="PRCPTOT",
+                     unit="mm", temporality=Period.OTHER),
+        MngLocation(id=1, admin_2_id=1, source_id=1, name="Loc 1", machine_name="loc_1", ext_id="1",
+                    latitude=0.0, longitude=0.0, altitude=0.0),
+        MngPhenologicalStage(id=1, crop_id=1, name="Emergence", order_stage=1, duration_avg_day=10),
+        MngPhenologicalStage(id=2, crop_id=1, name="Vegetative", order_stage=2, duration_avg_day=20),
+        MngPhenologicalStage(id=3, crop_id=1, name="Harvest", order_stage=3),
+        MngSeason(id=1, location_id=1, crop_id=1, planting_start=date(2023, 1, 1), planting_end=date(2023, 1, 15),
+                  season_start=date(2023, 1, 1), season_end=date(2023, 4, 30)),
+    ])
+    day = date(2023, 1, 1)
+    record_id = 1
+    while day <= date(2023, 4, 30):
+        session.add(ClimateHistoricalDaily(id=record_id, location_id=1, measure_id=1, date=day,
+                                           value=5.0 if day.day % 5 == 0 else 0.0))
+        record_id += 1
+        day += timedelta(days=1)
+    session.commit()
+    return session
+
+def _stored(session):
+    return sorted(
+        (r.phenological_id, r.start_date, r.end_date, r.value)
+        for r in session.query(HistoricalAgroclimaticIndicator).all()
+    )
+
+def test_engine_computes_stage_windows(agro_db):
+    """Test para el cálculo por etapa fenológica"""
+    written = AgroclimaticEngine().run(["PRCPTOT"], db=agro_db)
+
+    assert written == 2
+    assert _stored(agro_db) == [
+        (1, date(2023, 1, 1), date(2023, 1, 10), 10.0),
+        (2, date(2023, 1, 11), date(2023, 1, 30), 20.0),
+    ]
+
+def test_engine_is_incremental(agro_db):
+    """Test para recalcular solo las ventanas que cambiaron"""
+    engine = AgroclimaticEngine()
+    engine.run(["PRCPTOT"], db=agro_db)
+    assert engine.run(["PRCPTOT"], db=agro_db) == 0
+
+    # Moving the planting date replaces the windows of the season
+    agro_db.get(MngSeason, 1).planting_start = date(2023, 1, 6)
+    agro_db.commit()
+    assert engine.run(["PRCPTOT"], season_ids=[1], db=agro_db) == 2
+    assert _stored(agro_db) == [
+        (1, date(2023, 1, 6), date(2023, 1, 15), 10.0),
+        (2, date(2023, 1, 16), date(2023, 2, 4), 15.0),
+    ]
+
+    # A changed stage duration only recomputes that stage
+    agro_db.get(MngPhenologicalStage, 2).duration_avg_day = 5
+    agro_db.commit()
+    assert engine.run(["PRCPTOT"], db=agro_db) == 1
+    assert _stored(agro_db)[1] == (2, date(2023, 1, 16), date(2023, 1, 20), 5.0)
+
+    assert engine.run(["PRCPTOT"], force=True, db=agro_db) == 2
+    assert len(_stored(agro_db)) == 2
+
+def test_engine_skips_disabled_seasons(agro_db):
+    """Test para omitir temporadas deshabilitadas"""
+    agro_db.get(MngSeason, 1).enable = False
+    agro_db.commit()
+
+    assert AgroclimaticEngine().run(["PRCPTOT"], db=agro_db) == 0
+
+def test_bulk_create_validates_foreign_keys_in_batch(agro_db):
+    """Test para la validación por lote de llaves foráneas"""
+    records = [
+        HistoricalAgroclimaticIndicatorCreate(indicator_id=1, location_id=1, phenological_id=stage_id, value=1.0,
+                                              start_date=date(2023, 1, 1), end_date=date(2023, 1, 10))
+        for stage_id in (1, 9)
+    ]
+    with pytest.raises(ValueError, match="PhenologicalStage con id '9' no existe."):
+        HistoricalAgroclimaticIndicatorService().bulk_create(records, db=agro_db)
@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+from datetime import date, timedelta
+
+from aclimate_v3_orm.validations import BatchValidation, BatchValidator
+from aclimate_v3_orm.validations.batch_validation import FUTURE_DATE, MISSING_DATE, MISSING_VALUE, NOT_NUMERIC, START_AFTER_END
+
+
+def test_validate_historical_flags_each_rule():
+    """Test para marcar fechas futuras, valores no numéricos o faltantes e ids no positivos"""
+    tomorrow = date.today() + timedelta(days=1)
+    result = BatchValidator.validate_historical({
+        "location_id": np.array([1, 0, 1, 1, 1]),
+        "measure_id": [1, 1, 1, 1, -3],
+        "date": [date(2020, 1, 1), date(2020, 1, 1), tomorrow, date(2020, 1, 1), date(2020, 1, 1)],
+        "value": np.array([1.0, 2.0, 3.0, np.nan, 4.0]),
+    })
+
+    assert result.valid.tolist() == [True, False, False, False, False]
+    assert result.counts() == {
+        "location_id must be greater than 0": 1,
+        "measure_id must be greater than 0": 1,
+        FUTURE_DATE: 1,
+        MISSING_VALUE: 1,
+    }
+    assert result.reasons_of(2) == [FUTURE_DATE]
+    with pytest.raises(ValueError, match="Daily batch has 4 invalid rows"):
+        result.raise_if_invalid("Daily batch")
+
+def test_missing_dates_are_invalid():
+    """Test para rechazar fechas faltantes (None o NaT)"""
+    result = BatchValidator.validate_historical({
+        "location_id": [1, 1, 1],
+        "measure_id": [1, 1, 1],
+        "date": np.array(["2020-01-01", "NaT", "2020-01-02"], dtype="datetime64[D]"),
+        "value": [1.0, 2.0, 3.0],
+    })
+    assert result.valid.tolist() == [True, False, True]
+    assert result.counts() == {MISSING_DATE: 1}
+
+    result = BatchValidator.check_dates_not_future(BatchValidation(2), [date(2020, 1, 1), None])
+    assert result.reasons_of(1) == [MISSING_DATE]
+
+def test_check_numeric_object_values():
+    """Test para valores no numéricos en arreglos de objetos"""
+    result = BatchValidator.check_numeric(BatchValidation(5), np.array([1, "a", None, True, 2.5], dtype=object))
+
+    assert result.reasons_of(1) == [NOT_NUMERIC]
+    assert result.reasons_of(2) == [MISSING_VALUE]
+    assert result.reasons_of(3) == [NOT_NUMERIC]
+    assert result.invalid.tolist() == [False, True, True, True, False]
+
+def test_validate_locations_ranges():
+    """Test para los rangos de latitud y longitud"""
+    result = BatchValidator.validate_locations({
+        "latitude": [0.0, 91.0, -45.0],
+        "longitude": [0.0, 10.0, -181.0],
+        "admin_2_id": [1, 1, 1],
+    })
+
+    assert result.invalid.tolist() == [False, True, True]
+    assert result.reasons_of(2) == ["longitude must be between -180 and 180"]
+
+def test_validate_indicators_date_order():
+    """Test para fechas de inicio posteriores a la fecha final"""
+    result = BatchValidator.validate_indicators({
+        "indicator_id": [1, 1, 1],
+        "location_id": [1, 1, 1],
+        "value": [1.0, 2.0, 3.0],
+        "start_date": np.array(["2020-01-01", "2020-02-01", "2020-03-01"], dtype="datetime64[D]"),
+        "end_date": np.array(["2020-01-31", "2020-01-15", "NaT"], dtype="datetime64[D]"),
+    })
+
+    assert result.counts() == {START_AFTER_END: 1}
+    assert result.invalid.tolist() == [False, True, False]
+
+def test_accepts_pyarrow_arrays():
+    """Test para validar columnas de pyarrow"""
+    pa = pytest.importorskip("pyarrow")
+    result = BatchValidator.check_numeric(BatchValidation(3), pa.array([1.0, None, 3.0]))
+
+    assert result.counts() == {MISSING_VALUE: 1}
+
+def test_mask_size_must_match():
+    """Test para máscaras de tamaño distinto al lote"""
+    with pytest.raises(ValueError, match="for a batch of 2"):
+        BatchValidation(2).flag("reason", [True, False, True])
@@ -0,0 +1,116 @@
+import pytest
+from datetime import date
+from unittest.mock import patch
+from sqlalchemy import text
+
+from aclimate_v3_orm.__main__ import main
+from aclimate_v3_orm.enums import Period
+from aclimate_v3_orm.models import ClimateDataAvailability, MngClimateMeasure
+from aclimate_v3_orm.schemas import ClimateHistoricalDailyCreate
+from aclimate_v3_orm.services import ClimateDataAvailabilityService, ClimateHistoricalDailyService
+from aclimate_v3_orm.validations import ClimateHistoricalDailyValidator
+
+
+@pytest.fixture
+def availability_db(table_session):
+    """
+    Sesión SQLite con el resumen de disponibilidad. La tabla diaria se crea con un id
+    autoincremental, como el DEFAULT nextval de la tabla particionada en PostgreSQL.
+    """
+    session = table_session(MngClimateMeasure, ClimateDataAvailability)
+    session.execute(text(
+        "CREATE TABLE climate_historical_daily (id INTEGER PRIMARY KEY, location_id INTEGER NOT NULL, "
+        "measure_id INTEGER NOT NULL, date DATE NOT NULL, value FLOAT NOT NULL, UNIQUE (location_id, measure_id, date))"
+    ))
+    session.add(MngClimateMeasure(id=1, name="Precipitation", short_name="prec", unit="mm"))
+    session.commit()
+    yield session
+    session.execute(text("DROP TABLE climate_historical_daily"))
+    session.commit()
+
+@pytest.fixture
+def daily_service():
+    """Servicio diario sin la validación de claves foráneas"""
+    with patch.object(ClimateHistoricalDailyValidator, "create_validate"):
+        yield ClimateHistoricalDailyService()
+
+def _series(session):
+    return session.query(
+        ClimateDataAvailability.location_id, ClimateDataAvailability.measure_id,
+        ClimateDataAvailability.min_date, ClimateDataAvailability.max_date, ClimateDataAvailability.count
+    ).order_by(ClimateDataAvailability.location_id, ClimateDataAvailability.measure_id).all()
+
+def _record(location_id, day, measure_id=1):
+    return ClimateHistoricalDailyCreate(location_id=location_id, measure_id=measure_id, date=date(2020, 1, day), value=1.0)
+
+def test_bulk_create_updates_summary_incrementally(daily_service, availability_db):
+    """Test para ampliar rangos y sumar conteos con cada inserción masiva"""
+    daily_service.bulk_create([_record(1, 5), _record(1, 3), _record(2, 1)], db=availability_db)
+    daily_service.bulk_create([_record(1, 10), _record(1, 1, measure_id=2)], db=availability_db)
+
+    assert _series(availability_db) == [
+        (1, 1, date(2020, 1, 3), date(2020, 1, 10), 3),
+        (1, 2, date(2020, 1, 1), date(2020, 1, 1), 1),
+        (2, 1, date(2020, 1, 1), date(2020, 1, 1), 1),
+    ]
+
+def test_delete_recomputes_series(daily_service, availability_db):
+    """Test para recalcular la serie al borrar su último registro"""
+    daily_service.bulk_create([_record(1, 1), _record(1, 2), _record(1, 3)], db=availability_db)
+    last_id = availability_db.execute(text("SELECT MAX(id) FROM climate_historical_daily")).scalar()
+
+    assert daily_service.delete(last_id, db=availability_db)
+    assert _series(availability_db) == [(1, 1, date(2020, 1, 1), date(2020, 1, 2), 2)]
+
+def test_reads_from_summary(daily_service, availability_db):
+    """Test para leer rango de fechas y disponibilidad desde el resumen"""
+    daily_service.bulk_create([_record(1, 4), _record(1, 8)], db=availability_db)
+    # Sin la tabla diaria, la lectura solo puede venir del resumen
+    availability_db.execute(text("DELETE FROM climate_historical_daily"))
+
+    assert daily_service.get_date_range_by_location_id(1, db=availability_db) == {
+        "location_id": 1, "min_date": date(2020, 1, 4), "max_date": date(2020, 1, 8)
+    }
+    availability = daily_service.get_availability_by_location_id(1, db=availability_db)
+    assert [(row.measure_id, row.count, row.measure.short_name) for row in availability] == [(1, 2, "prec")]
+    assert daily_service.get_availability_by_location_id(2, db=availability_db) == []
+
+def test_date_range_falls_back_to_table(daily_service, availability_db):
+    """Test para calcular el rango sobre la tabla cuando el resumen no tiene la ubicación"""
+    availability_db.execute(text(
+        "INSERT INTO climate_historical_daily (location_id, measure_id, date, value) VALUES (3, 1, '2021-02-01', 1.0)"
+    ))
+    assert daily_service.get_date_range_by_location_id(3, db=availability_db)["max_date"] == date(2021, 2, 1)
+
+def test_rebuild(availability_db):
+    """Test para reconstruir el resumen desde la tabla, completo o por ubicación"""
+    availability_db.execute(text(
+        "INSERT INTO climate_historical_daily (location_id, measure_id, date, value) VALUES "
+        "(1, 1, '2020-01-01', 1.0), (1, 1, '2020-03-01', 1.0), (2, 1, '2020-02-01', 1.0)"
+    ))
+    service = ClimateDataAvailabilityService()
+
+    assert service.rebuild(Period.DAILY, db=availability_db) == 2
+    assert _series(availability_db) == [
+        (1, 1, date(2020, 1, 1), date(2020, 3, 1), 2), (2, 1, date(2020, 2, 1), date(2020, 2, 1), 1)
+    ]
+
+    availability_db.execute(text("DELETE FROM climate_historical_daily WHERE location_id = 2"))
+    assert service.rebuild(Period.DAILY, location_ids=[2], db=availability_db) == 0
+    assert [row[0] for row in _series(availability_db)] == [1]
+
+def test_rebuild_command():
+    """Test para el comando rebuild-availability"""
+    with patch.object(ClimateDataAvailabilityService, "rebuild", return_value=3) as rebuild:
+        main(["rebuild-availability", "--temporality", "monthly", "--location-id", "4", "--location-id", "5"])
+
+    rebuild.assert_called_once_with(Period.MONTHLY, [4, 5])
+
+def test_bulk_writes_recompute_series(daily_service, availability_db):
+    """Test para recalcular las series tocadas por actualizaciones y borrados en bloque"""
+    daily_service.bulk_create([_record(1, day) for day in range(1, 6)] + [_record(2, 1)], db=availability_db)
+
+    assert daily_service.bulk_update({"location_id": 2}, {"location_id": 1, "measure_id": 2}, db=availability_db) == 1
+    assert daily_service.bulk_delete({"location_id": 1, "measure_id": 1}, chunk_size=2, db=availability_db) == 5
+
+    assert _series(availability_db) == [(1, 2, date(2020, 1, 1), date(2020, 1, 1), 1)]
@@ -1,4 +1,6 @@
 import pytest
+import threading
+import time
 from unittest.mock import create_autospec, MagicMock, patch
 from sqlalchemy.orm import Session
 from datetime import date
@@ -248,4 +250,193 @@ def test_daily_schema_validation():
     
     # Test de validación fallida (falta campo requerido)
     with pytest.raises(ValueError):
-        ClimateHistoricalDailyCreate(location_id=1, measure_id=1, date="2023-06-01")  # Falta value
\ No newline at end of file
+        ClimateHistoricalDailyCreate(location_id=1, measure_id=1, date="2023-06-01")  # Falta value
+# ---- Tests para ventanas móviles ----
+@pytest.fixture
+def history_db(table_session):
+    """Sesión SQLite real con la tabla de datos diarios"""
+    return table_session(ClimateHistoricalDaily)
+
+@pytest.fixture
+def daily_series(history_db):
+    """Serie diaria de precipitación para dos ubicaciones (la segunda con un día faltante)"""
+    records = []
+    record_id = 1
+    for location_id in (1, 2):
+        for day in range(1, 11):
+            if location_id == 2 and day == 5:
+                continue
+            records.append(ClimateHistoricalDaily(
+                id=record_id, location_id=location_id, measure_id=1,
+                date=date(2023, 1, day), value=float(day)
+            ))
+            record_id += 1
+    history_db.add_all(records)
+    history_db.commit()
+    return records
+
+def test_rolling_sum_window_frame(daily_service, history_db, daily_series):
+    """Test para sumas móviles calculadas con RANGE BETWEEN"""
+    result = daily_service.rolling([1], measure_id=1, window_days=3, agg="sum", db=history_db)
+
+    assert [r["value"] for r in result] == [1.0, 3.0, 6.0, 9.0, 12.0, 15.0, 18.0, 21.0, 24.0, 27.0]
+    assert [r["count"] for r in result[:3]] == [1, 2, 3]
+    assert all(r["location_id"] == 1 and r["measure_id"] == 1 for r in result)
+
+def test_rolling_window_spans_calendar_days(daily_service, history_db, daily_series):
+    """Test para que un día faltante reduzca el conteo de la ventana en vez de alargarla"""
+    expected = [(date(2023, 1, 4), 9.0, 3), (date(2023, 1, 6), 10.0, 2), (date(2023, 1, 7), 13.0, 2), (date(2023, 1, 8), 21.0, 3)]
+    result = daily_service.rolling([2], 1, 3, start_date=date(2023, 1, 4), end_date=date(2023, 1, 8), db=history_db)
+    assert [(r["date"], r["value"], r["count"]) for r in result] == expected
+
+    with patch.object(ClimateHistoricalDailyService, '_supports_window_functions', return_value=False):
+        result = daily_service.rolling([2], 1, 3, start_date=date(2023, 1, 4), end_date=date(2023, 1, 8), chunk_size=2, db=history_db)
+    assert [(r["date"], r["value"], r["count"]) for r in result] == expected
+
+def test_rolling_uses_lookback_before_start(daily_service, history_db, daily_series):
+    """Test para que la ventana se llene con días anteriores a start_date"""
+    result = daily_service.rolling([1], 1, 3, "mean", start_date=date(2023, 1, 5), end_date=date(2023, 1, 7), db=history_db)
+
+    assert [r["date"] for r in result] == [date(2023, 1, 5), date(2023, 1, 6), date(2023, 1, 7)]
+    assert [r["value"] for r in result] == [4.0, 5.0, 6.0]
+    assert all(r["count"] == 3 for r in result)
+
+def test_rolling_cumsum_fallback_matches_window_frame(daily_service, history_db, daily_series):
+    """Test para que el cálculo por suma acumulada coincida con el de SQL"""
+    expected = daily_service.rolling([1, 2], 1, 4, "mean", start_date=date(2023, 1, 2), db=history_db)
+
+    with patch.object(ClimateHistoricalDailyService, '_supports_window_functions', return_value=False):
+        result = daily_service.rolling([1, 2], 1, 4, "mean", start_date=date(2023, 1, 2), chunk_size=3, db=history_db)
+
+    assert [(r["location_id"], r["date"], r["count"]) for r in result] == \
+        [(r["location_id"], r["date"], r["count"]) for r in expected]
+    assert [r["value"] for r in result] == pytest.approx([r["value"] for r in expected])
+
+def test_rolling_invalid_arguments(daily_service, mock_db):
+    """Test para argumentos inválidos en ventanas móviles"""
+    with pytest.raises(ValueError):
+        daily_service.rolling([1], 1, 0, db=mock_db)
+    with pytest.raises(ValueError):
+        daily_service.rolling([1], 1, 7, agg="median", db=mock_db)
+
+# ---- Tests para reporte de completitud ----
+def test_completeness_reports_missing_ranges(daily_service, history_db, daily_series):
+    """Test para detectar días faltantes con LAG sobre la fecha"""
+    result = daily_service.completeness([1, 2], [1, 2], date(2022, 12, 30), date(2023, 1, 12), db=history_db)
+    by_series = {(r["location_id"], r["measure_id"]): r for r in result}
+
+    assert len(result) == 4
+    full = by_series[(1, 1)]
+    assert full["expected_days"] == 14
+    assert full["present_days"] == 10
+    assert [(g["start_date"], g["end_date"]) for g in full["missing_ranges"]] == [
+        (date(2022, 12, 30), date(2022, 12, 31)),
+        (date(2023, 1, 11), date(2023, 1, 12))
+    ]
+
+    gapped = by_series[(2, 1)]
+    assert gapped["missing_days"] == 5
+    assert {"start_date": date(2023, 1, 5), "end_date": date(2023, 1, 5), "days": 1} in gapped["missing_ranges"]
+
+    empty = by_series[(1, 2)]
+    assert empty["present_days"] == 0
+    assert empty["completeness"] == 0
+    assert empty["missing_ranges"] == [{"start_date": date(2022, 12, 30), "end_date": date(2023, 1, 12), "days": 14}]
+
+def test_completeness_streamed_fallback_matches(daily_service, history_db, daily_series):
+    """Test para que el recorrido en Python coincida con la consulta de ventana"""
+    expected = daily_service.completeness([1, 2], [1], date(2023, 1, 1), date(2023, 1, 10), db=history_db)
+
+    with patch.object(ClimateHistoricalDailyService, '_supports_window_functions', return_value=False):
+        result = daily_service.completeness([1, 2], [1], date(2023, 1, 1), date(2023, 1, 10), db=history_db)
+
+    assert result == expected
+    assert expected[0]["completeness"] == 1
+    assert expected[1]["missing_ranges"] == [{"start_date": date(2023, 1, 5), "end_date": date(2023, 1, 5), "days": 1}]
+
+# ---- Tests para series en columnas ----
+def test_get_series_columnar(daily_service, history_db, daily_series):
+    """Test para obtener series en columnas ordenadas por el índice único"""
+    result = daily_service.get_series([2, 1], [1], start_date=date(2023, 1, 9), db=history_db)
+
+    assert result["location_id"] == [1, 1, 2, 2]
+    assert result["date"] == [date(2023, 1, 9), date(2023, 1, 10)] * 2
+    assert result["value"] == [9.0, 10.0, 9.0, 10.0]
+
+def test_get_series_as_numpy(daily_service, history_db, daily_series):
+    """Test para obtener series como arreglos NumPy"""
+    result = daily_service.get_series([1], [1], end_date=date(2023, 1, 3), as_numpy=True, db=history_db)
+
+    assert str(result["date"].dtype) == "datetime64[D]"
+    assert result["value"].tolist() == [1.0, 2.0, 3.0]
+    assert result["location_id"].dtype.kind == "i"
+
+def test_get_series_empty(daily_service, history_db):
+    """Test para series sin datos"""
+    result = daily_service.get_series([1], [1], db=history_db)
+
+    assert result == {"location_id": [], "measure_id": [], "date": [], "value": []}
+
+# ---- Tests para lecturas de varias ubicaciones ----
+@pytest.fixture
+def read_db(history_db, table_session):
+    """Sesión con las tablas de ubicaciones y medidas, que el esquema de lectura consulta"""
+    return table_session(MngLocation, MngClimateMeasure)
+
+def test_parallel_map_coalesces_into_in_query(daily_service, read_db, daily_series):
+    """Test para agrupar lecturas por ubicación en una consulta IN conservando el orden"""
+    with patch.object(ClimateHistoricalDailyService, 'get_by_location_id') as per_location:
+        result = daily_service.parallel_map("get_by_location_id", [2, 1, 3, 2], coalesce_size=2, db=read_db)
+
+    per_location.assert_not_called()
+    assert [len(rows) for rows in result] == [9, 10, 0, 9]
+    assert all(row.location_id == 2 for row in result[0])
+    assert result[3] is result[0]
+
+def test_parallel_map_single_key_uses_per_key_read(daily_service, read_db, daily_series):
+    """Test para usar la consulta por ubicación cuando hay una sola"""
+    with patch.object(ClimateHistoricalDailyService, 'get_by_location_ids') as coalesced:
+        result = daily_service.parallel_map("get_by_location_id", [1], db=read_db)
+
+    coalesced.assert_not_called()
+    assert len(result[0]) == 10
+
+def test_parallel_map_fans_out_in_order(daily_service):
+    """Test para repartir llamadas entre hilos, cada una sin sesión compartida, en el orden pedido"""
+    def read(key, db=None):
+        assert db is None
+        time.sleep(0.01 * (5 - key))
+        return (key, threading.get_ident())
+
+    result = daily_service.parallel_map(read, [1, 2, 3, 4], max_workers=4)
+
+    assert [key for key, _ in result] == [1, 2, 3, 4]
+    assert len({thread for _, thread in result}) > 1
+
+def test_parallel_map_timeout(daily_service):
+    """Test para el tiempo máximo de cada llamada"""
+    def slow(key, db=None):
+        time.sleep(0.5 if key == 2 else 0)
+        return key
+
+    with pytest.raises(TimeoutError, match="2"):
+        daily_service.parallel_map(slow, [1, 2], max_workers=2, timeout=0.05)
+
+def test_parallel_map_timeout_is_per_call(daily_service):
+    """Test para contar el tiempo máximo de cada llamada desde que empieza, no tras esperar a las anteriores"""
+    def read(key, db=None):
+        time.sleep(0.06)
+        return key
+
+    # Cuatro llamadas de 0.06 s en dos hilos: cada una cabe en 0.1 s aunque todas juntas no
+    assert daily_service.parallel_map(read, [1, 2, 3, 4], max_workers=2, timeout=0.1) == [1, 2, 3, 4]
+
+    def uneven(key, db=None):
+        time.sleep(0.1 if key == 1 else 0.5)
+        return key
+
+    # La segunda llamada vence 0.15 s después de empezar, no 0.15 s después de que termine la primera
+    started = time.monotonic()
+    with pytest.raises(TimeoutError, match="2"):
+        daily_service.parallel_map(uneven, [1, 2], max_workers=2, timeout=0.15)
+    assert time.monotonic() - started < 0.22
@@ -1,11 +1,12 @@
 import pytest
+import numpy as np
 from unittest.mock import create_autospec, MagicMock, patch
 from sqlalchemy.orm import Session
 from datetime import date
 from pydantic import ValidationError
 
 # Import your project classes
-from aclimate_v3_orm.models import ClimateHistoricalIndicator, MngIndicator, MngLocation
+from aclimate_v3_orm.models import ClimateHistoricalIndicator, MngIndicator, MngLocation, MngAdmin1, MngAdmin2
 from aclimate_v3_orm.schemas import (
     ClimateHistoricalIndicatorCreate,
     ClimateHistoricalIndicatorRead
@@ -13,6 +14,7 @@ from aclimate_v3_orm.schemas import (
 from aclimate_v3_orm.services import (
     ClimateHistoricalIndicatorService
 )
+from aclimate_v3_orm.enums import IndicatorsType, Period
 from aclimate_v3_orm.validations import (
     ClimateHistoricalIndicatorValidator
 )
@@ -174,3 +176,133 @@ def test_validate_date_range(historical_indicator_service, mock_db):
             historical_indicator_service.create(record_data, db=mock_db)
         
         assert "Start date cannot be after end date" in str(excinfo.value)
+
+
+# ---- Upsert ----
+@pytest.fixture
+def indicator_db(table_session):
+    """Sesión SQLite real con indicadores, ubicaciones y valores históricos"""
+    session = table_session(ClimateHistoricalIndicator, MngIndicator, MngLocation, MngAdmin1, MngAdmin2)
+    session.add_all([
+        MngIndicator(id=1, type=IndicatorsType.CLIMATE, name="Dry days", short_name="CDD", unit="days", temporality=Period.ANNUAL),
+        MngIndicator(id=2, type=IndicatorsType.CLIMATE, name="Wet days", short_name="CWD", unit="days", temporality=Period.ANNUAL),
+        MngAdmin1(id=1, country_id=1, name="Cauca"),
+        MngAdmin1(id=2, country_id=2, name="Azuay"),
+        MngAdmin2(id=1, admin_1_id=1, name="Popayán"),
+        MngAdmin2(id=2, admin_1_id=2, name="Cuenca"),
+    ])
+    session.add_all([
+        MngLocation(id=location_id, admin_2_id=admin_2_id, source_id=1, name=f"Loc {location_id}",
+                    machine_name=f"loc_{location_id}", ext_id=str(location_id),
+                    latitude=0.0, longitude=0.0, altitude=0.0)
+        for location_id, admin_2_id in ((1, 1), (2, 1), (3, 2))
+    ])
+    session.commit()
+    return session
+
+def _indicator_value(location_id, year, value, indicator_id=1):
+    return ClimateHistoricalIndicatorCreate(
+        indicator_id=indicator_id, location_id=location_id, value=value, period=Period.ANNUAL,
+        start_date=date(year, 1, 1), end_date=date(year, 12, 31)
+    )
+
+def test_bulk_upsert_inserts_then_updates(historical_indicator_service, indicator_db):
+    """Test para que bulk_upsert actualice valores existentes sin duplicar filas"""
+    written = historical_indicator_service.bulk_upsert(
+        [_indicator_value(1, 2022, 10.0), _indicator_value(2, 2022, 20.0)], db=indicator_db
+    )
+    assert written == 2
+
+    written = historical_indicator_service.bulk_upsert(
+        [_indicator_value(1, 2022, 11.0), _indicator_value(1, 2023, 12.0), _indicator_value(1, 2023, 13.0)],
+        batch_size=2,
+        db=indicator_db
+    )
+    assert written == 3
+
+    rows = indicator_db.query(ClimateHistoricalIndicator).order_by(
+        ClimateHistoricalIndicator.location_id, ClimateHistoricalIndicator.start_date
+    ).all()
+    assert [(r.location_id, r.start_date.year, r.value) for r in rows] == [
+        (1, 2022, 11.0), (1, 2023, 13.0), (2, 2022, 20.0)
+    ]
+
+def test_bulk_upsert_select_then_write_fallback(historical_indicator_service, indicator_db):
+    """Test para el upsert portable usado en motores sin ON CONFLICT"""
+    historical_indicator_service._upsert_select_then_write(
+        indicator_db, [_indicator_value(1, 2022, 10.0).model_dump()]
+    )
+    historical_indicator_service._upsert_select_then_write(
+        indicator_db, [_indicator_value(1, 2022, 15.0).model_dump(), _indicator_value(2, 2022, 5.0).model_dump()]
+    )
+    indicator_db.commit()
+
+    rows = indicator_db.query(ClimateHistoricalIndicator).order_by(ClimateHistoricalIndicator.location_id).all()
+    assert [(r.location_id, r.value) for r in rows] == [(1, 15.0), (2, 5.0)]
+
+def test_bulk_upsert_validates_foreign_keys_in_batch(historical_indicator_service, indicator_db):
+    """Test para la validación de llaves foráneas por lote"""
+    with pytest.raises(ValueError, match="No location found with ID 7, 9"):
+        historical_indicator_service.bulk_upsert(
+            [_indicator_value(1, 2022, 1.0), _indicator_value(9, 2022, 1.0), _indicator_value(7, 2022, 1.0)],
+            db=indicator_db
+        )
+    assert indicator_db.query(ClimateHistoricalIndicator).count() == 0
+
+
+# ---- Matrix ----
+@pytest.fixture
+def indicator_matrix(historical_indicator_service, indicator_db):
+    """Valores anuales de dos indicadores; la ubicación 2 no tiene el indicador 2 en 2023"""
+    historical_indicator_service.bulk_upsert([
+        _indicator_value(1, 2022, 1.0), _indicator_value(1, 2023, 2.0),
+        _indicator_value(1, 2022, 10.0, indicator_id=2), _indicator_value(1, 2023, 20.0, indicator_id=2),
+        _indicator_value(2, 2022, 3.0), _indicator_value(2, 2023, 4.0),
+        _indicator_value(2, 2022, 30.0, indicator_id=2),
+        _indicator_value(3, 2022, 99.0),
+    ], db=indicator_db)
+
+def test_get_matrix_dense(historical_indicator_service, indicator_db, indicator_matrix):
+    """Test para la matriz densa ubicación x tiempo x indicador"""
+    matrix = historical_indicator_service.get_matrix([2, 1], Period.ANNUAL, location_ids=[2, 1], db=indicator_db)
+
+    assert matrix["location_ids"].tolist() == [1, 2]
+    assert matrix["indicator_ids"].tolist() == [1, 2]
+    assert matrix["dates"].astype(str).tolist() == ["2022-01-01", "2023-01-01"]
+    assert matrix["values"].shape == (2, 2, 2)
+    assert matrix["values"][1, 0].tolist() == [3.0, 30.0]
+    assert matrix["values"][1, 1, 0] == 4.0
+    assert np.isnan(matrix["values"][1, 1, 1])
+
+def test_get_matrix_by_country_sparse(historical_indicator_service, indicator_db, indicator_matrix):
+    """Test para la matriz dispersa de todas las ubicaciones de un país"""
+    matrix = historical_indicator_service.get_matrix(
+        [1, 2], Period.ANNUAL, country_id=1, start_date=date(2023, 1, 1), sparse=True, db=indicator_db
+    )
+
+    assert matrix["location_ids"].tolist() == [1, 2]
+    assert matrix["shape"] == (2, 1, 2)
+    assert matrix["coords"].tolist() == [[0, 0, 0], [0, 0, 1], [1, 0, 0]]
+    assert matrix["values"].tolist() == [2.0, 20.0, 4.0]
+
+def test_get_matrix_arrow(historical_indicator_service, indicator_db, indicator_matrix):
+    """Test para la salida Arrow con una columna por indicador"""
+    pa = pytest.importorskip("pyarrow")
+    table = historical_indicator_service.get_matrix([1, 2], Period.ANNUAL, location_ids=[1, 2, 3], output="arrow", db=indicator_db)
+
+    assert isinstance(table, pa.Table)
+    assert table.column_names == ["location_id", "date", "1", "2"]
+    assert table.num_rows == 6
+    assert table.column("location_id").to_pylist() == [1, 1, 2, 2, 3, 3]
+    assert table.column("2").to_pylist() == [10.0, 20.0, 30.0, None, None, None]
+    assert table.column("date").to_pylist()[:2] == [date(2022, 1, 1), date(2023, 1, 1)]
+
+    sparse = historical_indicator_service.get_matrix([1, 2], Period.ANNUAL, location_ids=[1, 2, 3], output="arrow", sparse=True, db=indicator_db)
+    assert sparse.column("location_id").to_pylist() == [1, 1, 2, 2, 3]
+
+def test_get_matrix_invalid_arguments(historical_indicator_service, mock_db):
+    """Test para argumentos inválidos de get_matrix"""
+    with pytest.raises(ValueError, match="Invalid output"):
+        historical_indicator_service.get_matrix([1], Period.ANNUAL, location_ids=[1], output="csv", db=mock_db)
+    with pytest.raises(ValueError, match="either location_ids or country_id"):
+        historical_indicator_service.get_matrix([1], Period.ANNUAL, db=mock_db)
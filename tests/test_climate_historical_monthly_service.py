@@ -285,4 +285,18 @@ def test_monthly_schema_validation():
     
     # Test de validación fallida (falta campo requerido)
     with pytest.raises(ValueError):
-        ClimateHistoricalMonthlyCreate(location_id=1, measure_id=1, date="2023-06-01")  # Falta value
\ No newline at end of file
+        ClimateHistoricalMonthlyCreate(location_id=1, measure_id=1, date="2023-06-01")  # Falta value
+# ---- Tests para series en columnas ----
+def test_get_series_normalizes_month_bounds(monthly_service, table_session):
+    """Test para series mensuales con límites normalizados al primer día del mes"""
+    session = table_session(ClimateHistoricalMonthly)
+    session.add_all([
+        ClimateHistoricalMonthly(id=month, location_id=1, measure_id=1, date=date(2023, month, 1), value=float(month))
+        for month in range(1, 7)
+    ])
+    session.commit()
+
+    result = monthly_service.get_series([1], [1], start_date=date(2023, 2, 15), end_date=date(2023, 4, 20), db=session)
+
+    assert result["date"] == [date(2023, 2, 1), date(2023, 3, 1), date(2023, 4, 1)]
+    assert result["value"] == [2.0, 3.0, 4.0]
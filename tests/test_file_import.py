@@ -0,0 +1,163 @@
+import json
+import pytest
+from datetime import date, timedelta
+from unittest.mock import patch
+from sqlalchemy import text
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from aclimate_v3_orm.enums import Period
+from aclimate_v3_orm.models import ClimateDataAvailability, ClimateHistoricalDaily, MngClimateMeasure, MngLocation
+from aclimate_v3_orm.pipelines import ClimateFileImporter
+
+
+@pytest.fixture
+def import_db(table_session):
+    """
+    Sesión SQLite con dos ubicaciones y dos medidas. La tabla diaria se crea con un id
+    autoincremental, como el DEFAULT nextval de la tabla particionada en PostgreSQL, y con
+    el índice único (location_id, measure_id, date) del modelo.
+    """
+    session = table_session(MngLocation, MngClimateMeasure, ClimateDataAvailability)
+    session.execute(text(
+        "CREATE TABLE climate_historical_daily (id INTEGER PRIMARY KEY, location_id INTEGER NOT NULL, "
+        "measure_id INTEGER NOT NULL, date DATE NOT NULL, value FLOAT NOT NULL)"
+    ))
+    unique_index = next(index for index in ClimateHistoricalDaily.__table__.indexes if index.name == "ix_daily_location_measure_date")
+    unique_index.create(session.connection())
+    session.add_all([
+        MngLocation(id=location_id, admin_2_id=1, source_id=1, name=f"Loc {location_id}",
+                    machine_name=f"loc-{location_id}", ext_id=f"E{location_id}",
+                    latitude=0.0, longitude=0.0, altitude=0.0)
+        for location_id in (1, 2)
+    ])
+    session.add_all([
+        MngClimateMeasure(id=1, name="Precipitation", short_name="prec", unit="mm"),
+        MngClimateMeasure(id=2, name="Maximum temperature", short_name="tmax", unit="°C"),
+    ])
+    session.commit()
+    yield session
+    session.execute(text("DROP TABLE climate_historical_daily"))
+    session.commit()
+
+def _rows(session):
+    return session.query(
+        ClimateHistoricalDaily.location_id, ClimateHistoricalDaily.measure_id,
+        ClimateHistoricalDaily.date, ClimateHistoricalDaily.value
+    ).order_by(ClimateHistoricalDaily.location_id, ClimateHistoricalDaily.measure_id, ClimateHistoricalDaily.date).all()
+
+def _write_csv(path, rows):
+    path.write_text("location,measure,date,value\n" + "".join(f"{','.join(map(str, row))}\n" for row in rows))
+    return path
+
+def test_import_csv_maps_names(import_db, tmp_path):
+    """Test para importar un CSV traduciendo machine_name y short_name a ids"""
+    path = _write_csv(tmp_path / "daily.csv", [
+        ("loc-1", "prec", "2020-01-01", 1.5), ("loc-2", "tmax", "2020-01-01", 30.0), ("loc-1", "prec", "2020-01-02", 0.0),
+    ])
+    progress = []
+    summary = ClimateFileImporter(progress=progress.append).import_file(path, db=import_db)
+
+    assert summary == {"batches": 1, "rows": 3, "rejected": 0}
+    assert progress[-1]["rows"] == 3
+    assert _rows(import_db) == [
+        (1, 1, date(2020, 1, 1), 1.5), (1, 1, date(2020, 1, 2), 0.0), (2, 2, date(2020, 1, 1), 30.0)
+    ]
+    assert import_db.query(
+        ClimateDataAvailability.temporality, ClimateDataAvailability.location_id, ClimateDataAvailability.measure_id,
+        ClimateDataAvailability.min_date, ClimateDataAvailability.max_date, ClimateDataAvailability.count
+    ).order_by(ClimateDataAvailability.location_id).all() == [
+        (Period.DAILY, 1, 1, date(2020, 1, 1), date(2020, 1, 2), 2), (Period.DAILY, 2, 2, date(2020, 1, 1), date(2020, 1, 1), 1)
+    ]
+
+def test_import_parquet_by_ext_id_in_batches(import_db, tmp_path):
+    """Test para importar un Parquet por lotes usando ext_id"""
+    days = [date(2020, 1, 1) + timedelta(days=i) for i in range(10)]
+    path = tmp_path / "daily.parquet"
+    pq.write_table(pa.table({
+        "location": ["E2"] * 10, "measure": ["tmax"] * 10, "date": days, "value": [float(i) for i in range(10)],
+    }), path)
+    importer = ClimateFileImporter(batch_size=4, location_key="ext_id")
+
+    assert importer.import_file(path, db=import_db) == {"batches": 3, "rows": 10, "rejected": 0}
+    assert importer.location_ids == {"E2": 2}
+    assert len(_rows(import_db)) == 10
+
+def test_import_rejects_invalid_rows(import_db, tmp_path):
+    """Test para rechazar o reportar filas inválidas"""
+    future = date.today() + timedelta(days=5)
+    path = _write_csv(tmp_path / "daily.csv", [
+        ("loc-1", "prec", "2020-01-01", 1.0), ("loc-9", "prec", "2020-01-01", 1.0),
+        ("loc-1", "wind", "2020-01-01", 1.0), ("loc-1", "prec", future, 1.0), ("loc-1", "prec", "2020-01-03", ""),
+    ])
+    with pytest.raises(ValueError, match="4 invalid rows: unknown location \\(1\\), unknown measure \\(1\\), "
+                                         "date in the future \\(1\\), missing value \\(1\\)"):
+        ClimateFileImporter().import_file(path, db=import_db)
+
+    summary = ClimateFileImporter(on_error="skip").import_file(path, db=import_db)
+    assert summary == {"batches": 1, "rows": 1, "rejected": 4}
+
+def test_import_resumes_from_checkpoint(import_db, tmp_path):
+    """Test para retomar la importación desde el último lote confirmado"""
+    days = [date(2020, 1, 1) + timedelta(days=i) for i in range(6)]
+    path = tmp_path / "daily.parquet"
+    pq.write_table(pa.table({
+        "location": ["loc-1"] * 6, "measure": ["prec"] * 5 + ["wind"], "date": days, "value": [1.0] * 6,
+    }), path)
+    checkpoint = tmp_path / "daily.checkpoint.json"
+
+    with pytest.raises(ValueError, match="Batch 2"):
+        ClimateFileImporter(batch_size=2).import_file(path, checkpoint=checkpoint, db=import_db)
+    assert json.loads(checkpoint.read_text())["batches"] == 2
+
+    # Resuming re-reads only the failed batch
+    summary = ClimateFileImporter(batch_size=2, on_error="skip").import_file(path, checkpoint=checkpoint, db=import_db)
+    assert summary == {"batches": 3, "rows": 5, "rejected": 1}
+    assert len(_rows(import_db)) == 5
+
+def test_import_invalid_arguments(tmp_path):
+    """Test para argumentos o archivos inválidos"""
+    with pytest.raises(ValueError, match="Invalid table"):
+        ClimateFileImporter(table="weekly")
+    with pytest.raises(ValueError, match="Invalid location_key"):
+        ClimateFileImporter(location_key="name")
+    path = tmp_path / "daily.json"
+    path.write_text("[]")
+    with pytest.raises(ValueError, match="Unsupported file type"):
+        ClimateFileImporter().import_file(path, db=object())
+
+def test_resume_skips_batch_committed_without_checkpoint(import_db, tmp_path):
+    """Test para no duplicar el lote confirmado por una ejecución que se detuvo antes de guardar el checkpoint"""
+    path = _write_csv(tmp_path / "daily.csv", [("loc-1", "prec", f"2020-01-0{day}", 1.0) for day in range(1, 5)])
+    checkpoint = tmp_path / "daily.checkpoint.json"
+
+    with patch.object(ClimateFileImporter, "_save_checkpoint", side_effect=OSError("killed")):
+        with pytest.raises(OSError):
+            ClimateFileImporter(batch_size=4).import_file(path, checkpoint=checkpoint, db=import_db)
+    assert len(_rows(import_db)) == 4
+
+    summary = ClimateFileImporter(batch_size=4).import_file(path, checkpoint=checkpoint, db=import_db)
+    assert summary["rows"] == 0
+    assert len(_rows(import_db)) == 4
+    assert import_db.query(ClimateDataAvailability.count).scalar() == 4
+
+def test_reimport_without_checkpoint_skips_stored_rows(import_db, tmp_path):
+    """Test para reimportar sin checkpoint un archivo de varios lotes que se solapa con datos guardados"""
+    days = [date(2020, 1, 1) + timedelta(days=i) for i in range(10)]
+
+    def write(path, selected):
+        pq.write_table(pa.table({
+            "location": ["loc-1"] * len(selected), "measure": ["prec"] * len(selected),
+            "date": [days[i] for i in selected], "value": [float(i) for i in selected],
+        }), path)
+        return path
+
+    overlap = write(tmp_path / "overlap.parquet", [5, 6, 7])
+    full = write(tmp_path / "full.parquet", range(10))
+    assert ClimateFileImporter(batch_size=4).import_file(overlap, db=import_db)["rows"] == 3
+
+    assert ClimateFileImporter(batch_size=4).import_file(full, db=import_db) == {"batches": 3, "rows": 7, "rejected": 0}
+    assert ClimateFileImporter(batch_size=4).import_file(full, db=import_db) == {"batches": 3, "rows": 0, "rejected": 0}
+    assert _rows(import_db) == [(1, 1, day, float(i)) for i, day in enumerate(days)]
+    assert import_db.query(ClimateDataAvailability.count).scalar() == 10
@@ -0,0 +1,162 @@
+import pytest
+import numpy as np
+from unittest.mock import patch
+from datetime import date, timedelta
+
+from aclimate_v3_orm.models import ClimateHistoricalDaily, ClimateHistoricalMonthly, Forecast, ForecastAnalogue, MngLocation
+from aclimate_v3_orm.schemas import ForecastAnalogueCreate
+from aclimate_v3_orm.services import ForecastAnalogueService
+
+
+@pytest.fixture
+def analogue_service():
+    """Fixture para el servicio de análogos de pronóstico"""
+    return ForecastAnalogueService()
+
+@pytest.fixture
+def analogue_db(table_session):
+    """Sesión SQLite con un pronóstico y dos ubicaciones"""
+    session = table_session(ForecastAnalogue, Forecast, MngLocation)
+    session.add(Forecast(id=1, country_id=1, run_date=date(2024, 3, 1)))
+    session.add_all([
+        MngLocation(id=location_id, admin_2_id=1, source_id=1, name=f"Loc {location_id}",
+                    machine_name=f"loc_{location_id}", ext_id=str(location_id),
+                    latitude=0.0, longitude=0.0, altitude=0.0)
+        for location_id in (1, 2)
+    ])
+    session.commit()
+    return session
+
+def _analogue(location_id, year, rank, similarity=0.5, forecast_id=1):
+    return ForecastAnalogueCreate(
+        forecast_id=forecast_id, location_id=location_id, forecast_source="CPT",
+        year=year, similarity_score=similarity, rank=rank
+    )
+
+@pytest.fixture
+def analogues(analogue_service, analogue_db):
+    """Cuatro análogos para la ubicación 1 y dos para la ubicación 2, insertados en desorden"""
+    return analogue_service.bulk_create([
+        _analogue(1, 1998, 3, 0.6), _analogue(1, 2010, 1, 0.9), _analogue(1, 2015, 4, 0.4),
+        _analogue(1, 2003, 2, 0.8), _analogue(2, 1987, 2, 0.7), _analogue(2, 2001, 1, 0.95),
+    ], db=analogue_db)
+
+def test_get_top_k_per_location(analogue_service, analogue_db, analogues):
+    """Test para obtener los k mejores análogos de cada ubicación"""
+    result = analogue_service.get_top_k(1, k=2, db=analogue_db)
+
+    assert [(a.location_id, a.rank, a.year) for a in result] == [
+        (1, 1, 2010), (1, 2, 2003), (2, 1, 2001), (2, 2, 1987)
+    ]
+
+def test_get_top_k_filters_locations(analogue_service, analogue_db, analogues):
+    """Test para restringir el top-k a algunas ubicaciones"""
+    result = analogue_service.get_top_k(1, location_ids=[2], k=1, db=analogue_db)
+
+    assert [(a.location_id, a.year) for a in result] == [(2, 2001)]
+
+def test_get_top_k_without_window_functions(analogue_service, analogue_db, analogues):
+    """Test para el recorte en Python cuando la base de datos no soporta funciones de ventana"""
+    expected = analogue_service.get_top_k(1, k=3, db=analogue_db)
+    with patch.object(ForecastAnalogueService, '_supports_window_functions', return_value=False):
+        result = analogue_service.get_top_k(1, k=3, db=analogue_db)
+
+    assert [a.id for a in result] == [a.id for a in expected]
+    assert len(result) == 5
+
+def test_get_top_k_invalid_k(analogue_service, analogue_db):
+    """Test para un valor de k inválido"""
+    with pytest.raises(ValueError, match="k must be at least 1"):
+        analogue_service.get_top_k(1, k=0, db=analogue_db)
+
+def test_get_by_forecast_ordered_by_location_and_rank(analogue_service, analogue_db, analogues):
+    """Test para el orden de los análogos de un pronóstico"""
+    result = analogue_service.get_by_forecast(1, db=analogue_db)
+
+    assert [(a.location_id, a.rank) for a in result] == [(1, 1), (1, 2), (1, 3), (1, 4), (2, 1), (2, 2)]
+
+def test_bulk_create_validates_batch(analogue_service, analogue_db, analogues):
+    """Test para la validación por lote de la inserción masiva"""
+    with pytest.raises(ValueError, match="Location con id '7' no existe."):
+        analogue_service.bulk_create([_analogue(7, 2000, 1)], db=analogue_db)
+    with pytest.raises(ValueError, match="Forecast con id '5' no existe."):
+        analogue_service.bulk_create([_analogue(1, 2000, 1, forecast_id=5)], db=analogue_db)
+    with pytest.raises(ValueError, match="Ya existe un registro"):
+        analogue_service.bulk_create([_analogue(1, 2010, 1)], db=analogue_db)
+    with pytest.raises(ValueError, match="repetidos"):
+        analogue_service.bulk_create([_analogue(2, 1990, 3), _analogue(2, 1990, 3)], db=analogue_db)
+
+
+# ---- Analogue series ----
+@pytest.fixture
+def analogue_history(analogue_service, analogue_db, table_session):
+    """Análogos de la temporada diciembre-enero con su historia diaria y mensual"""
+    session = table_session(ClimateHistoricalDaily, ClimateHistoricalMonthly)
+    analogue_service.bulk_create([
+        _analogue(1, 2010, 1, 3.0), _analogue(1, 2003, 2, 1.0), _analogue(2, 2001, 1, 1.0),
+    ], db=session)
+
+    record_id = 1
+    for location_id, year in ((1, 2010), (1, 2003), (2, 2001)):
+        day = date(year, 11, 1)
+        while day < date(year + 1, 3, 1):
+            # Location 1 has no January data for 2004
+            if not (year == 2003 and day.year == 2004):
+                in_season = day.month in (12, 1)
+                session.add(ClimateHistoricalDaily(
+                    id=record_id, location_id=location_id, measure_id=1, date=day,
+                    value=float(year - 2000) if in_season else 999.0
+                ))
+                record_id += 1
+            day += timedelta(days=1)
+    session.add_all([
+        ClimateHistoricalMonthly(id=1, location_id=1, measure_id=1, date=date(2010, 12, 1), value=100.0),
+        ClimateHistoricalMonthly(id=2, location_id=1, measure_id=1, date=date(2011, 1, 1), value=200.0),
+        ClimateHistoricalMonthly(id=3, location_id=1, measure_id=1, date=date(2011, 2, 1), value=999.0),
+    ])
+    session.commit()
+    return session
+
+def test_get_analogue_series_daily_wraps_year(analogue_service, analogue_history):
+    """Test para reconstruir la temporada diciembre-enero de cada año análogo"""
+    result = analogue_service.get_analogue_series(1, [1, 2], [1], [12, 1], db=analogue_history)
+
+    assert result["years"].tolist() == [[2010, 2003], [2001, 0]]
+    assert result["weights"].tolist() == [[0.75, 0.25], [1.0, 0.0]]
+    assert result["values"].shape == (2, 1, 2, 62)
+    assert np.all(result["values"][0, 0, 0] == 10.0)
+    assert np.all(result["values"][0, 0, 1, :31] == 3.0)
+    assert np.all(np.isnan(result["values"][0, 0, 1, 31:]))
+    assert np.all(np.isnan(result["values"][1, 0, 1]))
+    assert str(result["dates"][0, 0, 0]) == "2010-12-01"
+    assert str(result["dates"][0, 0, 31]) == "2011-01-01"
+
+    # Weighted by similarity where both analogues have data, the remaining one afterwards
+    assert result["weighted_mean"][0, 0, 0] == pytest.approx(8.25)
+    assert result["weighted_mean"][0, 0, 40] == pytest.approx(10.0)
+    assert np.all(result["weighted_mean"][1, 0] == 1.0)
+
+def test_get_analogue_series_monthly(analogue_service, analogue_history):
+    """Test para reconstruir la temporada con datos mensuales"""
+    result = analogue_service.get_analogue_series(1, [1], [1], [12, 1], source="monthly", max_rank=1, db=analogue_history)
+
+    assert result["years"].tolist() == [[2010]]
+    assert result["values"][0, 0, 0].tolist() == [100.0, 200.0]
+    assert result["dates"][0, 0].astype(str).tolist() == ["2010-12-01", "2011-01-01"]
+
+def test_get_analogue_series_invalid_arguments(analogue_service, analogue_db):
+    """Test para meses o fuente inválidos"""
+    with pytest.raises(ValueError, match="months must be distinct"):
+        analogue_service.get_analogue_series(1, [1], [1], [12, 13], db=analogue_db)
+    with pytest.raises(ValueError, match="months must be distinct"):
+        analogue_service.get_analogue_series(1, [1], [1], [], db=analogue_db)
+    with pytest.raises(ValueError, match="Invalid source"):
+        analogue_service.get_analogue_series(1, [1], [1], [1], source="weekly", db=analogue_db)
+
+def test_season_date_ranges():
+    """Test para los rangos de fechas de la temporada de un año análogo"""
+    offsets = ForecastAnalogueService._season_year_offsets([11, 12, 1, 3])
+
+    assert ForecastAnalogueService._season_date_ranges(offsets, 2011) == [
+        (date(2011, 11, 1), date(2012, 1, 31)), (date(2012, 3, 1), date(2012, 3, 31))
+    ]
@@ -1,4 +1,5 @@
 import pytest
+from contextlib import contextmanager
 from unittest.mock import create_autospec, MagicMock, patch
 from sqlalchemy.orm import Session
 from datetime import date, datetime, timedelta, timezone
@@ -240,4 +241,67 @@ def test_get_all_forecasts_with_filters(forecast_service, mock_db):
     result = forecast_service.get_all(db=mock_db, filters=filters)
     
     assert len(result) == 1
-    assert result[0].country_id == 1
\ No newline at end of file
+    assert result[0].country_id == 1
+
+# ---- Último pronóstico por país ----
+@pytest.fixture
+def forecast_db(table_session):
+    """Sesión SQLite con pronósticos de dos países y caché vacía"""
+    session = table_session(Forecast)
+    session.add_all([
+        Forecast(id=1, country_id=1, run_date=date(2024, 1, 1)),
+        Forecast(id=2, country_id=1, run_date=date(2024, 2, 1)),
+        Forecast(id=3, country_id=1, run_date=date(2024, 3, 1), enable=False),
+        Forecast(id=4, country_id=2, run_date=date(2024, 2, 1)),
+        Forecast(id=5, country_id=2, run_date=date(2024, 2, 1)),
+    ])
+    session.commit()
+    ForecastService.latest_cache.clear()
+    yield session
+    ForecastService.latest_cache.clear()
+
+def test_get_latest(forecast_service, forecast_db):
+    """Test para obtener el último pronóstico habilitado de un país"""
+    assert forecast_service.get_latest(1, db=forecast_db).id == 2
+    assert forecast_service.get_latest(2, db=forecast_db).id == 5
+    assert forecast_service.get_latest(9, db=forecast_db) is None
+
+def test_get_latest_all(forecast_service, forecast_db):
+    """Test para obtener el último pronóstico de cada país en una consulta"""
+    expected = [(1, 2), (2, 5)]
+    assert [(f.country_id, f.id) for f in forecast_service.get_latest_all(db=forecast_db)] == expected
+
+    ForecastService.latest_cache.clear()
+    with patch.object(ForecastService, '_supports_window_functions', return_value=False):
+        assert [(f.country_id, f.id) for f in forecast_service.get_latest_all(db=forecast_db)] == expected
+
+def test_get_latest_is_cached_and_invalidated(forecast_service, forecast_db):
+    """Test para la caché del último pronóstico y su invalidación al escribir"""
+    @contextmanager
+    def scope(self, db=None):
+        yield forecast_db
+        forecast_db.commit()
+
+    with patch.object(ForecastService, "_session_scope", scope):
+        assert forecast_service.get_latest(1).id == 2
+
+        # Writes that bypass the service are not seen until the cache is invalidated
+        forecast_db.add(Forecast(id=6, country_id=1, run_date=date(2024, 4, 1)))
+        forecast_db.commit()
+        assert forecast_service.get_latest(1).id == 2
+
+        forecast_service.update(3, {"enable": True})
+        assert forecast_service.get_latest(1).id == 6
+
+        forecast_service.delete(6)
+        assert forecast_service.get_latest(1).id == 3
+
+        created = forecast_service.create(ForecastCreate(country_id=1, run_date=date(2024, 5, 1)))
+        assert [f.id for f in forecast_service.get_latest_all()] == [created.id, 5]
+
+def test_get_latest_with_session_bypasses_cache(forecast_service, forecast_db):
+    """Test para no servir ni guardar en caché lecturas hechas con la sesión del llamador"""
+    ForecastService.latest_cache.set(("country", 1), None)
+    assert forecast_service.get_latest(1, db=forecast_db).id == 2
+    assert [f.id for f in forecast_service.get_latest_all(db=forecast_db)] == [2, 5]
+    assert "all" not in ForecastService.latest_cache
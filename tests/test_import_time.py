@@ -0,0 +1,70 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC = str(Path(__file__).resolve().parent.parent / "src")
+
+# Wall-clock budget (seconds) for importing every package of the ORM in a fresh interpreter
+STARTUP_BUDGET = 2.0
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import aclimate_v3_orm.__main__
+from aclimate_v3_orm import database, migrations, models, schemas, services, validations
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    "elapsed": elapsed,
+    "alembic": "alembic" in sys.modules,
+    "dotenv": "dotenv" in sys.modules,
+    "engine": database._engine is not None,
+    "submodules": sorted(
+        name for name in sys.modules
+        if name.split(".")[1:2] in (["models"], ["schemas"], ["services"], ["validations"]) and name.count(".") == 2
+    ),
+}))
+"""
+
+
+def _run(code, env=None):
+    env = {**os.environ, **(env or {}), "PYTHONPATH": SRC}
+    env.pop("DATABASE_URL", None)
+    output = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    return output.stdout
+
+@pytest.fixture(scope="module")
+def startup():
+    """Importación del paquete en un intérprete nuevo, sin DATABASE_URL"""
+    return json.loads(_run(PROBE))
+
+def test_import_is_lazy(startup):
+    """Test para no cargar submódulos, Alembic ni el motor al importar el paquete"""
+    assert startup["submodules"] == []
+    assert not startup["alembic"]
+    assert not startup["dotenv"]
+    assert not startup["engine"]
+
+def test_import_within_budget(startup):
+    """Test para el presupuesto de tiempo de arranque"""
+    assert startup["elapsed"] < STARTUP_BUDGET
+
+def test_lazy_names_resolve():
+    """Test para resolver nombres exportados en el primer acceso"""
+    output = _run(
+        "import sys\n"
+        "from aclimate_v3_orm.services import ForecastService\n"
+        "from aclimate_v3_orm import models\n"
+        "print(ForecastService.__name__, 'aclimate_v3_orm.models.forecast' in sys.modules, 'Forecast' in dir(models))\n"
+        "try:\n"
+        "    models.Unknown\n"
+        "except AttributeError as e:\n"
+        "    print(e)\n"
+    )
+    assert output.splitlines() == [
+        "ForecastService True True",
+        "module 'aclimate_v3_orm.models' has no attribute 'Unknown'",
+    ]
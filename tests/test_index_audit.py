@@ -0,0 +1,80 @@
+import pytest
+from datetime import date
+from sqlalchemy import Column, BigInteger, Integer, Date, Float, Index, MetaData, Table, create_engine, inspect
+
+from aclimate_v3_orm.migrations.index_audit import (
+    audit_indexes,
+    plan_index_changes,
+    render_operations,
+    apply_operations,
+    benchmark_index_changes
+)
+
+@pytest.fixture
+def legacy_metadata():
+    """Metadata con el esquema de índices anterior (cinco B-tree superpuestos)"""
+    metadata = MetaData()
+    table = Table(
+        "climate_historical_daily", metadata,
+        Column("id", BigInteger, primary_key=True),
+        Column("location_id", BigInteger, nullable=False),
+        Column("measure_id", Integer, nullable=False),
+        Column("date", Date, nullable=False),
+        Column("value", Float, nullable=False),
+    )
+    Index("ix_daily_location", table.c.location_id)
+    Index("ix_daily_location_date", table.c.location_id, table.c.date)
+    Index("ix_daily_location_measure", table.c.location_id, table.c.measure_id)
+    Index("ix_daily_location_measure_date", table.c.location_id, table.c.measure_id, table.c.date, unique=True)
+    Index("ix_daily_date", table.c.date)
+    return metadata
+
+def test_audit_finds_left_prefix_indexes(legacy_metadata):
+    """Test para detectar índices que son prefijo izquierdo del índice único"""
+    report = audit_indexes(metadata=legacy_metadata, tables=["climate_historical_daily"])
+
+    assert {f["index"] for f in report["redundant"]} == {"ix_daily_location", "ix_daily_location_measure"}
+    assert all(f["covered_by"] == "ix_daily_location_measure_date" for f in report["redundant"])
+    assert [f["index"] for f in report["overlaps"]] == ["ix_daily_location_date"]
+    assert report["unused"] == []
+
+def test_plan_swaps_date_btree_for_brin_and_covering(legacy_metadata):
+    """Test para el plan: eliminar redundantes, BRIN en fecha e índice único con INCLUDE"""
+    report = audit_indexes(metadata=legacy_metadata, tables=["climate_historical_daily"])
+    plan = plan_index_changes(report, include=["value"])
+    rendered = render_operations(plan)
+
+    assert "op.drop_index('ix_daily_location', table_name='climate_historical_daily')" in rendered["upgrades"]
+    assert "postgresql_using='brin'" in rendered["upgrades"]
+    assert "postgresql_include=['value']" in rendered["upgrades"]
+    assert "op.create_index('ix_daily_location', 'climate_historical_daily', ['location_id'], unique=False)" in rendered["downgrades"]
+
+def test_models_have_no_redundant_indexes():
+    """Test para que los modelos actuales no tengan índices redundantes"""
+    report = audit_indexes()
+
+    assert report["redundant"] == []
+    assert plan_index_changes(report) == []
+
+def test_apply_and_benchmark_on_sqlite(legacy_metadata):
+    """Test para aplicar el plan y medir antes/después sin dejar cambios"""
+    engine = create_engine("sqlite:///:memory:")
+    legacy_metadata.create_all(engine)
+    table = legacy_metadata.tables["climate_historical_daily"]
+    plan = plan_index_changes(audit_indexes(metadata=legacy_metadata, tables=["climate_historical_daily"]))
+
+    with engine.connect() as connection:
+        connection.execute(table.insert(), [
+            {"id": day, "location_id": 1, "measure_id": 1, "date": date(2023, 1, day), "value": 1.0}
+            for day in range(1, 11)
+        ])
+        connection.commit()
+
+        result = benchmark_index_changes(connection, plan, rows=20, reads=2, metadata=legacy_metadata)
+        assert set(result["before"]) == {"ingest_seconds", "series_read_seconds", "date_read_seconds"}
+        assert set(result["speedup"]) == set(result["before"])
+
+        apply_operations(connection, plan, legacy_metadata)
+        names = {index["name"] for index in inspect(connection).get_indexes("climate_historical_daily")}
+        assert "ix_daily_location" not in names
+        assert "ix_daily_date" in names
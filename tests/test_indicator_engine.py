@@ -0,0 +1,141 @@
+import pytest
+import numpy as np
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from aclimate_v3_orm.enums import IndicatorsType, Period
+from aclimate_v3_orm.indicators import IndicatorDefinition, IndicatorEngine, IndicatorRegistry, kernels
+from aclimate_v3_orm.indicators.engine import period_buckets
+from aclimate_v3_orm.models import (
+    ClimateHistoricalDaily,
+    ClimateHistoricalIndicator,
+    MngClimateMeasure,
+    MngIndicator,
+    MngLocation
+)
+
+
+# ---- Kernels ----
+def test_max_consecutive_below_counts_longest_run():
+    """Test para días secos consecutivos por fila"""
+    prec = np.array([
+        [0.0, 0.0, 5.0, 0.0, 0.0, 0.0, 2.0],
+        [3.0, 0.0, np.nan, 0.0, 0.0, 4.0, 4.0],
+    ])
+    assert kernels.max_consecutive_below(prec, 1.0).tolist() == [3.0, 2.0]
+
+def test_count_total_and_extremes_ignore_missing_days():
+    """Test para conteos, totales y extremos con días faltantes"""
+    values = np.array([[10.0, np.nan, 30.0, 5.0], [np.nan, np.nan, np.nan, np.nan]])
+    assert kernels.count_above(values, 10.0).tolist() == [1.0, 0.0]
+    assert kernels.count_above(values, 10.0, inclusive=True).tolist() == [2.0, 0.0]
+    assert kernels.total(values).tolist() == [45.0, 0.0]
+    assert kernels.maximum(values)[0] == 30.0
+    assert np.isnan(kernels.maximum(values)[1])
+
+def test_growing_degree_days():
+    """Test para grados día de crecimiento con temperatura tope"""
+    tmax = np.array([[30.0, 20.0, 40.0]])
+    tmin = np.array([[10.0, 0.0, 20.0]])
+    assert kernels.growing_degree_days(tmax, tmin, base=10.0).tolist() == [10.0 + 0.0 + 20.0]
+    assert kernels.growing_degree_days(tmax, tmin, base=10.0, cap=30.0).tolist() == [10.0 + 0.0 + 15.0]
+
+def test_period_buckets_monthly_slices():
+    """Test para la división de un rango en meses"""
+    buckets = period_buckets(date(2023, 12, 1), date(2024, 2, 29), Period.MONTHLY)
+    assert [(b[0], b[1]) for b in buckets] == [
+        (date(2023, 12, 1), date(2023, 12, 31)),
+        (date(2024, 1, 1), date(2024, 1, 31)),
+        (date(2024, 2, 1), date(2024, 2, 29)),
+    ]
+    assert buckets[1][2] == slice(31, 62)
+
+def test_registry_rejects_unknown_indicator():
+    """Test para indicadores no registrados"""
+    registry = IndicatorRegistry([IndicatorDefinition("PRCPTOT", ("prec",), kernels.total)])
+    assert "PRCPTOT" in registry
+    with pytest.raises(ValueError, match="No indicator definition registered for 'CDD'"):
+        registry.get("CDD")
+
+
+# ---- Engine ----
+@pytest.fixture
+def engine_db(table_session):
+    """Sesión SQLite con precipitación diaria de enero y febrero de 2023 para dos ubicaciones"""
+    session = table_session(ClimateHistoricalDaily, ClimateHistoricalIndicator, MngClimateMeasure, MngIndicator, MngLocation)
+    session.add_all([
+        MngClimateMeasure(id=1, name="Precipitation", short_name="prec", unit="mm"),
+        MngIndicator(id=1, type=IndicatorsType.CLIMATE, name="Total precipitation", short_name="PRCPTOT",
+                     unit="mm", temporality=Period.MONTHLY),
+        MngIndicator(id=2, type=IndicatorsType.CLIMATE, name="Consecutive dry days", short_name="CDD",
+                     unit="days", temporality=Period.MONTHLY),
+    ])
+    session.add_all([
+        MngLocation(id=location_id, admin_2_id=1, source_id=1, name=f"Loc {location_id}",
+                    machine_name=f"loc_{location_id}", ext_id=str(location_id),
+                    latitude=0.0, longitude=0.0, altitude=0.0)
+        for location_id in (1, 2)
+    ])
+    record_id = 1
+    for location_id in (1, 2):
+        day = date(2023, 1, 1)
+        while day < date(2023, 3, 1):
+            # Rain every 5th day; location 2 has no data in February
+            if location_id == 1 or day.month == 1:
+                session.add(ClimateHistoricalDaily(
+                    id=record_id, location_id=location_id, measure_id=1, date=day,
+                    value=float(location_id) * 10 if day.day % 5 == 0 else 0.0
+                ))
+                record_id += 1
+            day += timedelta(days=1)
+    session.commit()
+    return session
+
+def test_engine_computes_and_upserts_monthly_indicators(engine_db):
+    """Test para el cálculo mensual de indicadores y su escritura por upsert"""
+    engine = IndicatorEngine(chunk_size=1)
+    written = engine.run([2, 1], ["PRCPTOT", "CDD"], date(2023, 1, 15), date(2023, 2, 10),
+                         period=Period.MONTHLY, db=engine_db)
+
+    # Location 2 has no February data, so only 3 of the 4 cells per indicator are stored
+    assert written == 6
+    rows = {
+        (r.indicator_id, r.location_id, r.start_date): (r.value, r.end_date)
+        for r in engine_db.query(ClimateHistoricalIndicator).all()
+    }
+    assert rows[(1, 1, date(2023, 1, 1))] == (60.0, date(2023, 1, 31))
+    assert rows[(1, 2, date(2023, 1, 1))] == (120.0, date(2023, 1, 31))
+    assert rows[(1, 1, date(2023, 2, 1))] == (50.0, date(2023, 2, 28))
+    assert rows[(2, 1, date(2023, 1, 1))][0] == 4.0
+    assert (1, 2, date(2023, 2, 1)) not in rows
+
+    # Re-running replaces values instead of duplicating them
+    engine.run([1, 2], ["PRCPTOT", "CDD"], date(2023, 1, 1), date(2023, 2, 28), period=Period.MONTHLY, db=engine_db)
+    assert engine_db.query(ClimateHistoricalIndicator).count() == 6
+
+def test_engine_min_coverage_skips_sparse_periods(engine_db):
+    """Test para omitir periodos con pocos datos"""
+    written = IndicatorEngine().run([1, 2], ["PRCPTOT"], date(2023, 1, 1), date(2023, 12, 31),
+                                    period=Period.ANNUAL, min_coverage=0.15, db=engine_db)
+
+    # Location 1 has 59 of 365 days (16%), location 2 only 31
+    assert written == 1
+    assert engine_db.query(ClimateHistoricalIndicator.location_id).scalar() == 1
+
+def test_engine_rejects_unknown_names(engine_db):
+    """Test para indicadores o medidas inexistentes en la base de datos"""
+    with pytest.raises(ValueError, match="No indicator found with short name GDD"):
+        IndicatorEngine().run([1], ["GDD"], date(2023, 1, 1), date(2023, 1, 31), db=engine_db)
+    with pytest.raises(ValueError, match="Unsupported period"):
+        IndicatorEngine().run([1], ["CDD"], date(2023, 1, 1), date(2023, 1, 31), period=Period.DAILY, db=engine_db)
+
+def test_engine_runs_chunks_in_parallel_without_session():
+    """Test para el procesamiento paralelo por bloques de ubicaciones"""
+    engine = IndicatorEngine(chunk_size=2, max_workers=3)
+    with patch("aclimate_v3_orm.indicators.engine.resolve_ids", return_value=({}, {})), \
+         patch("aclimate_v3_orm.indicators.engine.get_db"), \
+         patch.object(IndicatorEngine, "_run_chunk", side_effect=lambda chunk, *args: len(chunk)) as run_chunk:
+        written = engine.run([5, 1, 4, 2, 3], ["CDD"], date(2023, 1, 1), date(2023, 12, 31))
+
+    assert written == 5
+    assert sorted(call.args[0] for call in run_chunk.call_args_list) == [[1, 2], [3, 4], [5]]
@@ -0,0 +1,126 @@
+import numpy as np
+import pytest
+from collections import deque
+from sqlalchemy import create_engine, text
+
+from aclimate_v3_orm.models import ClimateDataAvailability
+from aclimate_v3_orm.pipelines import IngestOrchestrator, IngestShard
+from aclimate_v3_orm.pipelines.ingest import _next_shard
+
+# Intentos de cada shard, para simular fallos transitorios
+_calls = {}
+
+
+def _load(location_id, year):
+    """Dos medidas durante los primeros cinco días del año"""
+    dates = np.arange(f"{year}-01-01", f"{year}-01-06", dtype="datetime64[D]")
+    return {
+        "measure_id": np.repeat([1, 2], len(dates)),
+        "date": np.tile(dates, 2),
+        "value": np.arange(2 * len(dates), dtype=np.float64) + location_id,
+    }
+
+def _load_flaky(location_id, year):
+    """Falla el primer intento de cada shard"""
+    _calls[(location_id, year)] = _calls.get((location_id, year), 0) + 1
+    if _calls[(location_id, year)] == 1:
+        raise RuntimeError("connection reset")
+    return _load(location_id, year)
+
+def _load_invalid(location_id, year):
+    """Incluye una fila de otro año y un valor faltante"""
+    columns = _load(location_id, year)
+    columns["date"] = columns["date"].copy()
+    columns["date"][0] = np.datetime64(f"{year - 1}-12-31")
+    columns["value"][1] = np.nan
+    return columns
+
+def _load_broken(location_id, year):
+    raise RuntimeError("source unavailable")
+
+@pytest.fixture
+def database_url(tmp_path):
+    """Archivo SQLite con la tabla diaria, su índice único y el resumen de disponibilidad"""
+    url = f"sqlite:///{tmp_path / 'ingest.db'}"
+    engine = create_engine(url)
+    with engine.begin() as connection:
+        connection.execute(text(
+            "CREATE TABLE climate_historical_daily (id INTEGER PRIMARY KEY, location_id INTEGER NOT NULL, "
+            "measure_id INTEGER NOT NULL, date DATE NOT NULL, value FLOAT NOT NULL, UNIQUE (location_id, measure_id, date))"
+        ))
+    ClimateDataAvailability.__table__.create(engine)
+    engine.dispose()
+    return url
+
+def _count(url, table="climate_historical_daily", column="COUNT(*)"):
+    engine = create_engine(url)
+    with engine.connect() as connection:
+        count = connection.execute(text(f"SELECT {column} FROM {table}")).scalar()
+    engine.dispose()
+    return count
+
+def test_deterministic_run(database_url):
+    """Test para ingerir shards en orden dentro del proceso"""
+    shards = [(2, 2020), (1, 2020), (1, 2021), (1, 2020)]
+    metrics = IngestOrchestrator(database_url=database_url, deterministic=True).run(shards, _load)
+
+    assert metrics["shards"] == 3
+    assert metrics["completed"] == 3
+    assert metrics["rows"] == 30
+    assert metrics["failed"] == []
+    assert metrics["rows_per_second"] > 0
+    assert _count(database_url) == 30
+
+def test_retries_failed_shards(database_url):
+    """Test para reintentar shards que fallan y reportar los que agotan los reintentos"""
+    _calls.clear()
+    metrics = IngestOrchestrator(database_url=database_url, retries=1, deterministic=True).run([(1, 2020)], _load_flaky)
+    assert metrics["completed"] == 1
+    assert metrics["attempts"] == 2
+
+    metrics = IngestOrchestrator(database_url=database_url, retries=2, deterministic=True).run([(2, 2020)], _load_broken)
+    assert metrics["completed"] == 0
+    assert metrics["attempts"] == 3
+    assert metrics["failed"] == [((2, 2020), "source unavailable")]
+    assert _count(database_url) == 10
+
+def test_rejects_rows_outside_the_shard(database_url):
+    """Test para descartar filas inválidas o de otro año"""
+    metrics = IngestOrchestrator(database_url=database_url, deterministic=True).run([(1, 2020)], _load_invalid)
+
+    assert metrics["rows"] == 8
+    assert metrics["rejected"] == {"date outside the shard year": 1, "missing value": 1}
+
+def test_replace_makes_reruns_idempotent(database_url):
+    """Test para reemplazar las filas de un shard al volver a ingerirlo"""
+    orchestrator = IngestOrchestrator(database_url=database_url, replace=True, deterministic=True)
+    orchestrator.run([(1, 2020)], _load)
+    orchestrator.run([(1, 2020)], _load)
+
+    assert _count(database_url) == 10
+    assert _count(database_url, "climate_data_availability", "SUM(count)") == 10
+
+def test_process_pool(database_url):
+    """Test para ingerir shards en procesos con su propio engine"""
+    shards = [(location_id, 2020) for location_id in range(1, 5)]
+    metrics = IngestOrchestrator(database_url=database_url, max_workers=2, max_in_flight=2).run(shards, _load)
+
+    assert metrics["completed"] == 4
+    assert _count(database_url) == 40
+    assert _count(database_url, "climate_data_availability", "SUM(count)") == 40
+
+def test_invalid_arguments():
+    """Test para argumentos inválidos"""
+    with pytest.raises(ValueError, match="Invalid table"):
+        IngestOrchestrator("weekly", database_url="sqlite://")
+    with pytest.raises(ValueError, match="max_workers"):
+        IngestOrchestrator(database_url="sqlite://", max_workers=0)
+
+def test_shards_of_a_location_never_overlap():
+    """Test para no enviar un shard mientras otro de la misma ubicación está en curso"""
+    queue = deque([IngestShard(1, 2020), IngestShard(1, 2021), IngestShard(2, 2020)])
+
+    assert _next_shard(queue, {1}) == (2, 2020)
+    assert _next_shard(queue, {1, 2}) is None
+    assert _next_shard(queue, set()) == (1, 2020)
+    assert list(queue) == [(1, 2021)]
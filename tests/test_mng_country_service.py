@@ -224,4 +224,51 @@ def test_partial_update(country_service, mock_db):
     # Verificar resultados
     assert result.name == update_data.name
     assert result.iso2 == existing_country.iso2  # No debería cambiar
-    assert result.enable == existing_country.enable  # No debería cambiar
\ No newline at end of file
+    assert result.enable == existing_country.enable  # No debería cambiar
+
+@pytest.fixture
+def countries_db(table_session):
+    """Sesión SQLite con cinco países registrados hace un año"""
+    session = table_session(MngCountry)
+    last_year = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    session.add_all([
+        MngCountry(id=i, name=f"Country {i}", iso2=f"C{i}", enable=True, updated=last_year) for i in range(1, 6)
+    ])
+    session.commit()
+    return session
+
+def _countries(session):
+    session.expire_all()
+    return {country.id: country for country in session.query(MngCountry)}
+
+def test_bulk_update_by_ids_and_filters(country_service, countries_db):
+    """Test para actualizar en bloque por ids (en varios lotes) o por filtros, renovando updated"""
+    assert country_service.bulk_update([1, 2, 3, 3, 99], CountryUpdate(name="Renamed"), chunk_size=2, db=countries_db) == 3
+    assert country_service.bulk_update({"name": "Renamed"}, {"iso2": "RN"}, db=countries_db) == 3
+
+    countries = _countries(countries_db)
+    assert [country.iso2 for country in countries.values()] == ["RN", "RN", "RN", "C4", "C5"]
+    assert countries[1].updated.year > 2025
+    assert countries[4].updated.year == 2025
+
+def test_bulk_delete_soft_and_hard(country_service, countries_db):
+    """Test para deshabilitar en bloque por defecto o borrar con soft=False"""
+    assert country_service.bulk_delete([1, 2], db=countries_db) == 2
+    assert country_service.bulk_delete({"enable": False}, soft=False, db=countries_db) == 2
+
+    countries = _countries(countries_db)
+    assert sorted(countries) == [3, 4, 5]
+    assert all(country.enable for country in countries.values())
+
+def test_bulk_write_invalid_arguments(country_service, countries_db):
+    """Test para rechazar columnas desconocidas, filtros vacíos y lotes vacíos"""
+    with pytest.raises(ValueError, match="Unknown columns for mng_country: color"):
+        country_service.bulk_update([1], {"color": "red"}, db=countries_db)
+    with pytest.raises(ValueError, match="chunk_size"):
+        country_service.bulk_delete([1], chunk_size=0, db=countries_db)
+    with pytest.raises(ValueError, match="Filters cannot be empty"):
+        country_service.bulk_update({}, {"name": "All"}, db=countries_db)
+    with pytest.raises(ValueError, match="Filters cannot be empty"):
+        country_service.bulk_delete({}, soft=False, db=countries_db)
+    assert len(_countries(countries_db)) == 5
+    assert country_service.bulk_update([], {"name": "None"}, db=countries_db) == 0
@@ -0,0 +1,141 @@
+import pytest
+from datetime import date
+from unittest.mock import patch
+
+pa = pytest.importorskip("pyarrow")
+ds = pytest.importorskip("pyarrow.dataset")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from aclimate_v3_orm.models import (
+    ClimateHistoricalClimatology,
+    ClimateHistoricalDaily,
+    MngAdmin1,
+    MngAdmin2,
+    MngLocation
+)
+from aclimate_v3_orm.pipelines import ParquetExporter, read_manifest
+
+
+@pytest.fixture
+def export_db(table_session):
+    """Sesión SQLite con una ubicación en cada uno de dos países y datos diarios de dos años"""
+    session = table_session(ClimateHistoricalDaily, ClimateHistoricalClimatology, MngLocation, MngAdmin2, MngAdmin1)
+    session.add_all([
+        MngAdmin1(id=1, country_id=1, name="Cauca"),
+        MngAdmin1(id=2, country_id=2, name="Loja"),
+        MngAdmin2(id=1, admin_1_id=1, name="Popayán"),
+        MngAdmin2(id=2, admin_1_id=2, name="Loja"),
+    ])
+    session.add_all([
+        MngLocation(id=location_id, admin_2_id=location_id, source_id=1, name=f"Loc {location_id}",
+                    machine_name=f"loc-{location_id}", ext_id=str(location_id),
+                    latitude=0.0, longitude=0.0, altitude=0.0)
+        for location_id in (1, 2)
+    ])
+    record_id = 1
+    for location_id in (1, 2):
+        for measure_id in (1, 2):
+            for day in (date(2020, 12, 30), date(2020, 12, 31), date(2021, 1, 1)):
+                session.add(ClimateHistoricalDaily(id=record_id, location_id=location_id, measure_id=measure_id,
+                                                   date=day, value=record_id / 10))
+                record_id += 1
+    session.add_all([
+        ClimateHistoricalClimatology(id=month, location_id=1, measure_id=1, month=month, value=float(month))
+        for month in range(1, 13)
+    ])
+    session.commit()
+    return session
+
+def _read(root):
+    return ds.dataset(root, format="parquet", partitioning="hive").to_table().sort_by("id")
+
+def test_export_partitions_by_country_year_measure(export_db, tmp_path):
+    """Test para exportar particiones país/año/medida con ubicaciones codificadas por diccionario"""
+    summary = ParquetExporter(chunk_size=5, float32=True, max_workers=2).export("daily", tmp_path, db=export_db)
+
+    assert summary["rows"] == 12
+    assert len(summary["partitions"]) == 8
+    assert "country_id=2/year=2021/measure_id=1" in summary["partitions"]
+
+    table = _read(tmp_path)
+    assert table.column("id").to_pylist() == list(range(1, 13))
+    row_group = pq.ParquetFile(next(tmp_path.rglob("*.parquet"))).metadata.row_group(0)
+    encodings = {row_group.column(i).path_in_schema: row_group.column(i).encodings for i in range(row_group.num_columns)}
+    assert "RLE_DICTIONARY" in encodings["location_id"]
+    assert "RLE_DICTIONARY" not in encodings["id"]
+    assert table.schema.field("value").type == pa.float32()
+    assert table.column("year").to_pylist()[:3] == [2020, 2020, 2021]
+    assert table.column("country_id").to_pylist()[6:] == [2] * 6
+
+    manifest = read_manifest(tmp_path)
+    assert manifest["max_id"] == 12
+    partition = manifest["partitions"]["country_id=1/year=2020/measure_id=2"]
+    assert partition == {
+        "max_id": 5, "max_date": "2020-12-31", "rows": 2, "files": partition["files"], "paths": partition["paths"]
+    }
+    assert sorted(path.name for path in (tmp_path / "country_id=1/year=2020/measure_id=2").iterdir()) == sorted(partition["paths"])
+
+def test_export_is_incremental(export_db, tmp_path):
+    """Test para exportar solo las filas nuevas en la siguiente ejecución"""
+    exporter = ParquetExporter()
+    exporter.export("daily", tmp_path, db=export_db)
+    assert exporter.export("daily", tmp_path, db=export_db)["rows"] == 0
+
+    export_db.add(ClimateHistoricalDaily(id=13, location_id=1, measure_id=1, date=date(2021, 1, 2), value=9.0))
+    export_db.commit()
+    summary = exporter.export("daily", tmp_path, db=export_db)
+
+    assert summary == {"rows": 1, "files": 1, "partitions": ["country_id=1/year=2021/measure_id=1"]}
+    assert _read(tmp_path).num_rows == 13
+    assert read_manifest(tmp_path)["partitions"]["country_id=1/year=2021/measure_id=1"]["max_date"] == "2021-01-02"
+
+def test_export_with_other_filters_uses_partition_watermarks(export_db, tmp_path):
+    """Test para no repetir filas al cambiar los filtros entre ejecuciones"""
+    exporter = ParquetExporter()
+    assert exporter.export("daily", tmp_path, country_ids=[2], db=export_db)["rows"] == 6
+    assert exporter.export("daily", tmp_path, db=export_db)["rows"] == 6
+    assert exporter.export("daily", tmp_path, incremental=False, db=export_db)["rows"] == 12
+    assert _read(tmp_path).num_rows == 12
+
+def test_interrupted_export_leaves_no_duplicates(export_db, tmp_path):
+    """Test para descartar los archivos de una exportación interrumpida antes del manifiesto"""
+    exporter = ParquetExporter(chunk_size=5)
+    exporter.export("daily", tmp_path, country_ids=[1], db=export_db)
+
+    with patch.object(ParquetExporter, "_write_manifest", side_effect=OSError("disk full")):
+        with pytest.raises(OSError):
+            exporter.export("daily", tmp_path, db=export_db)
+    # Los archivos de la ejecución interrumpida quedan ocultos para los lectores
+    assert _read(tmp_path).num_rows == 6
+
+    assert exporter.export("daily", tmp_path, db=export_db)["rows"] == 6
+    assert _read(tmp_path).column("id").to_pylist() == list(range(1, 13))
+    assert not list(tmp_path.glob("**/.part-*"))
+
+def test_export_finishes_files_listed_in_manifest(export_db, tmp_path):
+    """Test para publicar los archivos de una ejecución interrumpida después del manifiesto"""
+    exporter = ParquetExporter()
+    exporter.export("daily", tmp_path, db=export_db)
+    path = next(tmp_path.glob("country_id=1/year=2021/measure_id=1/part-*.parquet"))
+    path.rename(path.with_name(f".{path.name}.tmp"))
+
+    assert exporter.export("daily", tmp_path, db=export_db)["rows"] == 0
+    assert path.exists()
+    assert _read(tmp_path).num_rows == 12
+
+def test_export_climatology(export_db, tmp_path):
+    """Test para exportar la climatología sin nivel de año"""
+    summary = ParquetExporter().export("climatology", tmp_path, db=export_db)
+
+    assert summary["partitions"] == ["country_id=1/measure_id=1"]
+    assert _read(tmp_path).column("month").to_pylist() == list(range(1, 13))
+
+def test_export_invalid_arguments(export_db, tmp_path):
+    """Test para tablas o filtros inválidos"""
+    with pytest.raises(ValueError, match="Invalid table"):
+        ParquetExporter().export("weekly", tmp_path, db=export_db)
+    with pytest.raises(ValueError, match="no dates"):
+        ParquetExporter().export("climatology", tmp_path, start_date=date(2020, 1, 1), db=export_db)
+    ParquetExporter().export("daily", tmp_path, db=export_db)
+    with pytest.raises(ValueError, match="holds an export of 'daily'"):
+        ParquetExporter().export("climatology", tmp_path, db=export_db)
@@ -0,0 +1,63 @@
+import pytest
+from datetime import date
+from sqlalchemy import create_mock_engine, inspect
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.schema import CreateTable
+
+from aclimate_v3_orm.models import ClimateHistoricalDaily, ClimateHistoricalMonthly
+from aclimate_v3_orm.database.partitioning import (
+    create_yearly_partitions,
+    ensure_future_partitions,
+    partition_name,
+    default_partition_name
+)
+
+@pytest.mark.parametrize("model", [ClimateHistoricalDaily, ClimateHistoricalMonthly])
+def test_postgresql_ddl_is_partitioned_by_date(model):
+    """Test para que el DDL de PostgreSQL declare particionado por rango de fecha"""
+    ddl = str(CreateTable(model.__table__).compile(dialect=postgresql.dialect()))
+
+    assert "PARTITION BY RANGE (date)" in ddl
+    assert "PRIMARY KEY (id, date)" in ddl
+
+@pytest.mark.parametrize("model", [ClimateHistoricalDaily, ClimateHistoricalMonthly])
+def test_orm_identity_stays_on_id(model):
+    """Test para que el ORM siga identificando registros solo por id"""
+    assert [column.name for column in inspect(model).primary_key] == ["id"]
+
+@pytest.mark.parametrize("model", [ClimateHistoricalDaily, ClimateHistoricalMonthly])
+def test_other_dialects_keep_an_auto_increment_id(model):
+    """Test para que MySQL y SQLite sigan generando el id de los registros insertados sin id"""
+    mysql_ddl = str(CreateTable(model.__table__).compile(dialect=mysql.dialect()))
+    assert "id BIGINT NOT NULL AUTO_INCREMENT" in mysql_ddl
+    assert "PRIMARY KEY (id)" in mysql_ddl
+    assert "PARTITION" not in mysql_ddl
+
+    sqlite_ddl = str(CreateTable(model.__table__).compile(dialect=sqlite.dialect()))
+    assert "PRIMARY KEY (id)" in sqlite_ddl
+
+def test_partition_names():
+    """Test para los nombres de particiones"""
+    assert partition_name("climate_historical_daily", 2024) == "climate_historical_daily_y2024"
+    assert default_partition_name("climate_historical_monthly") == "climate_historical_monthly_default"
+
+def test_sqlite_behaviour_unchanged(table_session):
+    """Test para que en SQLite las tablas sigan siendo tablas normales"""
+    session = table_session(ClimateHistoricalDaily)
+    session.add(ClimateHistoricalDaily(id=1, location_id=1, measure_id=1, date=date(2023, 1, 1), value=1.5))
+    session.commit()
+
+    assert create_yearly_partitions(session.connection(), 2020, 2030) == []
+    assert ensure_future_partitions(session.connection(), years_ahead=2) == []
+    assert session.get(ClimateHistoricalDaily, 1).value == 1.5
+    assert inspect(session.connection()).get_table_names() == ["climate_historical_daily"]
+
+@pytest.mark.parametrize("model", [ClimateHistoricalDaily, ClimateHistoricalMonthly])
+def test_create_all_uses_sequence_default(model):
+    """Test para que create_all deje el id con DEFAULT nextval, como la migración"""
+    statements = []
+    engine = create_mock_engine("postgresql://", lambda sql, *args, **kwargs: statements.append(str(sql.compile(dialect=engine.dialect))))
+    model.metadata.create_all(engine, tables=[model.__table__], checkfirst=False)
+
+    table = model.__tablename__
+    assert f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT nextval('{table}_id_seq')" in statements
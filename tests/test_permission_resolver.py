@@ -0,0 +1,82 @@
+import pytest
+
+from aclimate_v3_orm.enums import Apps, Modules
+from aclimate_v3_orm.models import MngCountry, Role, User, UserAccess
+from aclimate_v3_orm.schemas import UserAccessCreate
+from aclimate_v3_orm.services import PermissionResolver, UserAccessService
+
+
+@pytest.fixture
+def resolver():
+    """Fixture para el resolvedor de permisos con la caché vacía"""
+    PermissionResolver.invalidate()
+    yield PermissionResolver()
+    PermissionResolver.invalidate()
+
+@pytest.fixture
+def access_db(table_session):
+    """Sesión SQLite con un usuario con accesos en dos países y un usuario deshabilitado"""
+    session = table_session(UserAccess, User, Role, MngCountry)
+    session.add_all([
+        MngCountry(id=1, name="Colombia", iso2="CO"),
+        MngCountry(id=2, name="Ecuador", iso2="EC"),
+        Role(id=1, name="Admin", app=Apps.AC_ADMIN),
+        Role(id=2, name="Viewer", app=Apps.AC_ADMIN),
+        User(id=1, keycloak_ext_id="kc-1", role_id=1),
+        User(id=2, keycloak_ext_id="kc-2", role_id=1, enable=False),
+        UserAccess(user_id=1, country_id=1, role_id=1, module=Modules.CLIMATE_DATA, read=True, update=True),
+        UserAccess(user_id=1, country_id=1, role_id=2, module=Modules.CLIMATE_DATA, create=True),
+        UserAccess(user_id=1, country_id=2, role_id=2, module=Modules.GEOGRAPHIC, read=True),
+        UserAccess(user_id=2, country_id=1, role_id=1, module=Modules.GEOGRAPHIC, read=True),
+    ])
+    session.commit()
+    return session
+
+def test_can_combines_accesses(resolver, access_db):
+    """Test para combinar los permisos de varios accesos del usuario"""
+    assert resolver.can("kc-1", 1, Modules.CLIMATE_DATA, "read", db=access_db)
+    assert resolver.can("kc-1", 1, "CLIMATE_DATA", "create", db=access_db)
+    assert not resolver.can("kc-1", 1, Modules.CLIMATE_DATA, "delete", db=access_db)
+    assert not resolver.can("kc-1", 1, Modules.GEOGRAPHIC, "read", db=access_db)
+    assert resolver.can("kc-1", 2, Modules.GEOGRAPHIC, "read", db=access_db)
+    assert not resolver.can("kc-1", 3, Modules.GEOGRAPHIC, "read", db=access_db)
+
+def test_disabled_and_unknown_users_have_no_permissions(resolver, access_db):
+    """Test para usuarios deshabilitados o inexistentes"""
+    assert resolver.get_matrix("kc-2", db=access_db) == {}
+    assert not resolver.can("kc-unknown", 1, Modules.GEOGRAPHIC, "read", db=access_db)
+
+def test_get_permissions_decodes_matrix(resolver, access_db):
+    """Test para decodificar la máscara de un país"""
+    assert resolver.get_permissions("kc-1", 1, db=access_db) == {Modules.CLIMATE_DATA: {"create", "read", "update"}}
+
+def test_bits_are_unique():
+    """Test para que cada par módulo-acción tenga un bit propio"""
+    bits = {PermissionResolver.bit(module, action) for module in Modules for action in ("create", "read", "update", "delete")}
+    assert len(bits) == len(Modules) * 4
+    with pytest.raises(ValueError, match="Invalid action"):
+        PermissionResolver.bit(Modules.GEOGRAPHIC, "execute")
+    with pytest.raises(ValueError):
+        PermissionResolver.bit("UNKNOWN", "read")
+
+def test_cache_invalidated_by_user_access_writes(resolver, access_db):
+    """Test para invalidar la caché al crear o eliminar accesos"""
+    service = UserAccessService()
+    assert not resolver.can("kc-1", 2, Modules.CROP_DATA, "delete", db=access_db)
+
+    service.create(UserAccessCreate(user_id=1, country_id=2, role_id=1, module=Modules.CROP_DATA, delete=True), db=access_db)
+    assert resolver.can("kc-1", 2, Modules.CROP_DATA, "delete", db=access_db)
+
+    service.delete_by_user_country_and_module(1, 2, Modules.CROP_DATA, db=access_db)
+    assert not resolver.can("kc-1", 2, Modules.CROP_DATA, "delete", db=access_db)
+
+    service.delete_by_user_and_country(1, 1, db=access_db)
+    assert resolver.get_matrix("kc-1", db=access_db) == {2: PermissionResolver.bit(Modules.GEOGRAPHIC, "read")}
+
+def test_cache_invalidated_when_user_disabled(resolver, access_db):
+    """Test para invalidar la caché al deshabilitar un usuario"""
+    from aclimate_v3_orm.services import UserService
+
+    assert resolver.can(" kc-1 ", 2, Modules.GEOGRAPHIC, "read", db=access_db)
+    UserService().delete(1, db=access_db)
+    assert not resolver.can("kc-1", 2, Modules.GEOGRAPHIC, "read", db=access_db)
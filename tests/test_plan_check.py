@@ -0,0 +1,107 @@
+import json
+import pytest
+from contextlib import contextmanager
+from unittest.mock import MagicMock, patch
+
+from aclimate_v3_orm.__main__ import main
+from aclimate_v3_orm.migrations import plan_check
+from aclimate_v3_orm.migrations.plan_check import PlanQuery, _postgresql_nodes, _sqlite_node, check_plans
+from aclimate_v3_orm.models import ClimateHistoricalClimatology, MngAdmin2, MngClimateMeasure, MngLocation, MngSource
+from aclimate_v3_orm.services import ClimateHistoricalClimatologyService
+
+
+@pytest.fixture
+def seeded_db(table_session):
+    """Sesión SQLite con la climatología de una ubicación"""
+    session = table_session(MngAdmin2, MngSource, MngLocation, MngClimateMeasure, ClimateHistoricalClimatology)
+    session.add(MngLocation(id=1, admin_2_id=1, source_id=1, name="Loc 1", machine_name="loc-1", ext_id="E1",
+                            latitude=0.0, longitude=0.0, altitude=0.0))
+    session.add(MngClimateMeasure(id=1, name="Precipitation", short_name="prec", unit="mm"))
+    session.add_all([ClimateHistoricalClimatology(location_id=1, measure_id=1, month=month, value=1.0) for month in range(1, 13)])
+    session.commit()
+    return session
+
+def _queries(allow_seq_scan=False):
+    service = ClimateHistoricalClimatologyService()
+    return {
+        "climatology.get_date_range_by_location_id": PlanQuery(
+            "climatology.get_date_range_by_location_id", service.get_date_range_by_location_id,
+            lambda session: {"location_id": 1}, False
+        ),
+        "climatology.get_by_month": PlanQuery(
+            "climatology.get_by_month", service.get_by_month, lambda session: {"month": 1}, allow_seq_scan
+        ),
+        "climatology.empty": PlanQuery("climatology.empty", service.get_by_month, lambda session: None, False),
+    }
+
+def test_collects_indexes_and_seq_scans(seeded_db):
+    """Test para registrar los índices usados y marcar lecturas secuenciales de tablas grandes"""
+    report = check_plans(seeded_db, queries=_queries(), large_table_rows=10)
+    plans = report["plans"]
+
+    date_range = plans["climatology.get_date_range_by_location_id"]["statements"]
+    assert len(date_range) == 1
+    assert date_range[0]["indexes"] == ["ix_climatology_location_measure_month"]
+    assert plans["climatology.empty"]["skipped"]
+    assert report["failures"] == ["climatology.get_by_month: sequential scan on large table climate_historical_climatology"]
+
+    # Tablas pequeñas o lecturas completas a propósito no fallan
+    assert check_plans(seeded_db, queries=_queries(), large_table_rows=100)["failures"] == []
+    assert check_plans(seeded_db, queries=_queries(allow_seq_scan=True), large_table_rows=10)["failures"] == []
+
+def test_baseline_detects_plan_changes(seeded_db, tmp_path):
+    """Test para fallar cuando un plan cambia respecto a la línea base guardada"""
+    baseline = str(tmp_path / "plans.json")
+    report = check_plans(seeded_db, baseline, queries=_queries(), update_baseline=True)
+    assert report["new_queries"] == ["climatology.get_by_month", "climatology.get_date_range_by_location_id"]
+    assert check_plans(seeded_db, baseline, queries=_queries())["failures"] == []
+
+    # Línea base de un plan anterior que usaba otro índice
+    with open(baseline) as file:
+        stored = json.load(file)
+    stored["climatology.get_date_range_by_location_id"] = [["SEARCH climate_historical_climatology ix_old"]]
+    with open(baseline, "w") as file:
+        json.dump(stored, file)
+    failures = check_plans(seeded_db, baseline, queries=_queries())["failures"]
+
+    assert len(failures) == 1
+    assert failures[0].startswith("climatology.get_date_range_by_location_id: plan changed")
+
+def test_parse_plan_nodes():
+    """Test para normalizar los nodos de EXPLAIN en PostgreSQL y SQLite"""
+    plan = {
+        "Node Type": "Nested Loop", "Actual Rows": 3,
+        "Plans": [
+            {"Node Type": "Seq Scan", "Relation Name": "mng_location", "Actual Rows": 1, "Shared Hit Blocks": 2},
+            {"Node Type": "Index Only Scan", "Relation Name": "climate_historical_daily_2020",
+             "Index Name": "climate_historical_daily_2020_location_id_measure_id_date_key", "Actual Rows": 3},
+        ]
+    }
+    nodes = _postgresql_nodes(plan)
+    assert [(node["operation"], node["table"], node["seq_scan"]) for node in nodes] == [
+        ("Nested Loop", None, False), ("Seq Scan", "mng_location", True),
+        ("Index Only Scan", "climate_historical_daily_2020", False),
+    ]
+    assert nodes[1]["buffers"] == 2
+
+    assert _sqlite_node("SCAN TABLE t")["seq_scan"]
+    assert _sqlite_node("SEARCH t USING COVERING INDEX ix (a=?)")["index"] == "ix"
+    assert _sqlite_node("SEARCH t USING INTEGER PRIMARY KEY (rowid=?)") == {
+        "operation": "SEARCH PRIMARY KEY", "table": "t", "index": None, "seq_scan": False
+    }
+    assert _sqlite_node("USE TEMP B-TREE FOR ORDER BY")["table"] is None
+
+def test_check_plans_command(tmp_path):
+    """Test para que el comando check-plans termine con error ante regresiones"""
+    report = {"plans": {}, "failures": ["q: plan changed"], "new_queries": []}
+
+    @contextmanager
+    def get_db():
+        yield MagicMock()
+
+    with patch("aclimate_v3_orm.__main__.get_db", get_db), \
+         patch.object(plan_check, "check_plans", return_value=report):
+        with pytest.raises(SystemExit) as exit_info:
+            main(["check-plans", "--baseline", str(tmp_path / "plans.json")])
+
+    assert exit_info.value.code == 1
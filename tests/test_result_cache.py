@@ -0,0 +1,112 @@
+import pytest
+from contextlib import contextmanager
+from unittest.mock import patch
+
+from aclimate_v3_orm.cache import LRUBackend, ResultCache
+from aclimate_v3_orm.models import ClimateHistoricalClimatology, MngAdmin2, MngClimateMeasure, MngLocation, MngSource
+from aclimate_v3_orm.schemas import ClimateHistoricalClimatologyCreate
+from aclimate_v3_orm.services import ClimateHistoricalClimatologyService
+from aclimate_v3_orm.validations import ClimateHistoricalClimatologyValidator
+
+
+def test_lru_backend_evicts_by_size():
+    """Test para desalojar las entradas menos usadas al superar el tamaño máximo en bytes"""
+    backend = LRUBackend(max_bytes=25)
+    backend.set("a", b"x" * 9)
+    backend.set("b", b"x" * 9)
+    assert backend.size == 20
+
+    backend.get("a")
+    backend.set("c", b"x" * 9)
+    assert backend.get("b") is None
+    assert backend.get("a") is not None
+    assert backend.size == 20
+
+    backend.set("d", b"x" * 40)
+    assert backend.get("d") is None
+    assert len(backend) == 2
+
+def test_lru_backend_keeps_counters():
+    """Test para que los contadores no se desalojen"""
+    backend = LRUBackend(max_bytes=10)
+    assert backend.incr("generation") == 1
+    backend.set("a", b"x" * 9)
+    backend.set("b", b"x" * 9)
+    assert backend.counter("generation") == 1
+    assert backend.counter("other") == 0
+
+def test_invalidate_by_location_and_table():
+    """Test para invalidar las entradas de una ubicación o de toda la tabla"""
+    cache = ResultCache()
+    loads = []
+
+    def loader(value):
+        return lambda: loads.append(value) or [value]
+
+    assert cache.get_or_load("daily", "get", (1,), 1, loader(1)) == [1]
+    assert cache.get_or_load("daily", "get", (1,), 1, loader(1)) == [1]
+    cache.get_or_load("daily", "get", (2,), 2, loader(2))
+    assert loads == [1, 2]
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    cache.invalidate("daily", [1])
+    cache.get_or_load("daily", "get", (1,), 1, loader(1))
+    cache.get_or_load("daily", "get", (2,), 2, loader(2))
+    assert loads == [1, 2, 1]
+
+    cache.invalidate("daily")
+    cache.get_or_load("daily", "get", (2,), 2, loader(2))
+    assert loads == [1, 2, 1, 2]
+
+def test_results_are_copies():
+    """Test para que cada llamada reciba su propia copia"""
+    cache = ResultCache()
+    first = cache.get_or_load("daily", "get", (1,), 1, lambda: {"values": [1]})
+    first["values"].append(2)
+
+    assert cache.get_or_load("daily", "get", (1,), 1, lambda: None) == {"values": [1]}
+
+@pytest.fixture
+def climatology_db(table_session):
+    """Sesión SQLite con una ubicación, una medida y su climatología"""
+    session = table_session(MngAdmin2, MngSource, MngLocation, MngClimateMeasure, ClimateHistoricalClimatology)
+    session.add(MngLocation(id=1, admin_2_id=1, source_id=1, name="Loc 1", machine_name="loc-1", ext_id="E1",
+                            latitude=0.0, longitude=0.0, altitude=0.0))
+    session.add(MngClimateMeasure(id=1, name="Precipitation", short_name="prec", unit="mm"))
+    session.add(ClimateHistoricalClimatology(location_id=1, measure_id=1, month=1, value=10.0))
+    session.commit()
+    return session
+
+@pytest.fixture
+def cached_service(climatology_db):
+    """Servicio de climatología con un caché propio que usa la sesión de prueba"""
+    @contextmanager
+    def scope(self, db=None):
+        yield climatology_db
+        climatology_db.commit()
+
+    service = ClimateHistoricalClimatologyService()
+    service.result_cache = ResultCache()
+    with patch.object(ClimateHistoricalClimatologyService, "_session_scope", scope), \
+         patch.object(ClimateHistoricalClimatologyValidator, "create_validate"):
+        yield service
+
+def test_service_reads_are_cached_until_a_write(cached_service):
+    """Test para servir lecturas del caché hasta que se escribe en la ubicación"""
+    assert cached_service.get_max_min_by_location_id(1)[0]["max_value"] == 10.0
+    assert cached_service.get_date_range_by_location_id(1)["max_month"] == 1
+    cached_service.get_max_min_by_location_id(1)
+    assert cached_service.result_cache.hits == 1
+
+    cached_service.create(ClimateHistoricalClimatologyCreate(location_id=1, measure_id=1, month=2, value=20.0))
+
+    assert cached_service.get_max_min_by_location_id(1)[0]["max_value"] == 20.0
+    assert cached_service.get_date_range_by_location_id(1)["max_month"] == 2
+    assert cached_service.result_cache.hits == 1
+
+def test_service_reads_with_session_bypass_cache(cached_service, climatology_db):
+    """Test para no usar el caché en lecturas hechas con una sesión"""
+    cached_service.get_date_range_by_location_id(1, db=climatology_db)
+    cached_service.get_date_range_by_location_id(1, db=climatology_db)
+
+    assert cached_service.result_cache.misses == 0
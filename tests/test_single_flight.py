@@ -0,0 +1,120 @@
+import threading
+import time
+import pytest
+
+from aclimate_v3_orm.cache import SingleFlight, single_flight
+
+
+def _run_concurrently(target, count=5):
+    results = [None] * count
+
+    def run(i):
+        try:
+            results[i] = target()
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+class FakeService:
+    def __init__(self):
+        self.calls = 0
+        self.release = threading.Event()
+
+    @single_flight()
+    def get_range(self, location_id, days=1, db=None):
+        self.calls += 1
+        self.release.wait(5)
+        return {"location_id": location_id, "days": days}
+
+    @single_flight(ttl=60)
+    def get_list(self, country_id, db=None):
+        self.calls += 1
+        return [country_id]
+
+
+def test_concurrent_calls_share_one_execution():
+    """Test para que llamadas concurrentes con la misma clave ejecuten una sola consulta"""
+    flight = SingleFlight()
+    calls = []
+    release = threading.Event()
+
+    def load():
+        calls.append(1)
+        release.wait(5)
+        return "value"
+
+    threads, results = _run_concurrently(lambda: flight.do("key", load))
+    time.sleep(0.1)
+    assert flight.in_flight() == 1
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [1]
+    assert results == ["value"] * 5
+    assert flight.in_flight() == 0
+
+def test_errors_are_shared_but_not_kept():
+    """Test para propagar el error a todos los que esperan sin guardarlo"""
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def fail():
+        release.wait(5)
+        raise RuntimeError("database unavailable")
+
+    threads, results = _run_concurrently(lambda: flight.do("key", fail), count=3)
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert flight.do("key", lambda: "retry") == "retry"
+
+def test_decorator_shares_calls_with_the_same_arguments():
+    """Test para compartir llamadas con los mismos argumentos, también pasados por nombre"""
+    service = FakeService()
+    threads, results = _run_concurrently(lambda: service.get_range(1), count=2)
+    more, other = _run_concurrently(lambda: service.get_range(location_id=1, days=1), count=2)
+    time.sleep(0.1)
+    service.release.set()
+    for thread in threads + more:
+        thread.join()
+
+    assert service.calls == 1
+    assert results + other == [{"location_id": 1, "days": 1}] * 4
+    assert results[0] is not results[1]
+
+def test_decorator_skips_calls_with_session():
+    """Test para no compartir llamadas hechas dentro de una sesión"""
+    service = FakeService()
+    service.release.set()
+    service.get_range(1, db=object())
+    service.get_range(1, 1, object())
+
+    assert service.calls == 2
+
+def test_decorator_ttl_cache():
+    """Test para reutilizar resultados durante el TTL y limpiarlos"""
+    service = FakeService()
+    assert service.get_list(1) == [1]
+    assert service.get_list(1) == [1]
+    assert service.calls == 1
+
+    FakeService.get_list.cache.clear()
+    service.get_list(1)
+    assert service.calls == 2
+    FakeService.get_list.cache.clear()
+
+def test_decorator_unhashable_arguments():
+    """Test para ejecutar normalmente llamadas con argumentos no hashables"""
+    service = FakeService()
+    service.get_list([1, 2])
+    service.get_list([1, 2])
+
+    assert service.calls == 2
@@ -0,0 +1,85 @@
+import threading
+import pytest
+
+from aclimate_v3_orm.cache import TTLCache
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_ttl():
+    """Test para la expiración de entradas"""
+    timer = FakeTimer()
+    cache = TTLCache(ttl=10, timer=timer)
+    cache.set("a", 1)
+
+    timer.now = 9.9
+    assert cache.get("a") == 1
+    timer.now = 10.0
+    assert cache.get("a") is None
+    assert "a" not in cache
+
+def test_get_or_set_caches_none():
+    """Test para que get_or_set guarde también resultados vacíos"""
+    cache = TTLCache(ttl=10)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return None
+
+    assert cache.get_or_set("missing", loader) is None
+    assert cache.get_or_set("missing", loader) is None
+    assert len(calls) == 1
+
+def test_maxsize_evicts_oldest_and_invalidate():
+    """Test para el límite de tamaño y la invalidación"""
+    cache = TTLCache(ttl=10, maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)
+    assert "a" not in cache and len(cache) == 2
+
+    cache.invalidate("b")
+    assert cache.get("b") is None
+    cache.clear()
+    assert len(cache) == 0
+
+def test_concurrent_access():
+    """Test para el acceso concurrente desde varios hilos"""
+    cache = TTLCache(ttl=60, maxsize=50)
+
+    def worker(offset):
+        for i in range(200):
+            cache.set((offset, i % 60), i)
+            cache.get((offset, (i + 1) % 60))
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(cache) == 50
+
+def test_invalid_ttl():
+    """Test para un ttl inválido"""
+    with pytest.raises(ValueError, match="ttl must be positive"):
+        TTLCache(ttl=0)
+
+def test_load_interrupted_by_clear_is_not_stored():
+    """Test para no guardar un valor cargado antes de una invalidación concurrente"""
+    cache = TTLCache(ttl=60)
+
+    def stale_load():
+        cache.clear()  # una escritura invalida mientras se carga el valor
+        return "stale"
+
+    assert cache.get_or_set("a", stale_load) == "stale"
+    assert "a" not in cache
+    assert cache.get_or_set("a", lambda: "fresh") == "fresh"
+    assert cache.get("a") == "fresh"
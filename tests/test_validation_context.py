@@ -0,0 +1,81 @@
+import pytest
+from unittest.mock import create_autospec
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from aclimate_v3_orm.models import MngAdmin1, MngAdmin2, MngCountry
+from aclimate_v3_orm.schemas import Admin2Create
+from aclimate_v3_orm.services import MngAdmin2Service
+from aclimate_v3_orm.validations import ValidationContext
+
+
+@pytest.fixture
+def geo_db(table_session):
+    """Sesión SQLite con un país y dos Admin1"""
+    session = table_session(MngAdmin2, MngAdmin1, MngCountry)
+    session.add_all([
+        MngCountry(id=1, name="Colombia", iso2="CO"),
+        MngAdmin1(id=1, country_id=1, name="Cauca", ext_id="19"),
+        MngAdmin1(id=2, country_id=1, name="Valle", ext_id="76"),
+    ])
+    session.commit()
+    return session
+
+@pytest.fixture
+def statements(geo_db):
+    """Sentencias SELECT sobre mng_admin_1 ejecutadas por la sesión"""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("SELECT") and "FROM mng_admin_1" in statement:
+            executed.append(statement)
+
+    engine = geo_db.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", record)
+
+def test_exists_is_memoized_within_transaction(geo_db, statements):
+    """Test para consultar una sola vez cada fila padre dentro de la transacción"""
+    context = ValidationContext.for_session(geo_db)
+
+    assert context.exists(MngAdmin1, 1)
+    assert context.exists(MngAdmin1, 1)
+    assert not context.exists(MngAdmin1, 9)
+    assert ValidationContext.for_session(geo_db) is context
+    assert len(statements) == 2
+    assert "mng_admin_1.name" not in statements[0]
+
+def test_missing_checks_ids_in_one_query(geo_db, statements):
+    """Test para verificar varios IDs con una sola consulta"""
+    context = ValidationContext.for_session(geo_db)
+    context.exists(MngAdmin1, 1)
+
+    assert context.missing(MngAdmin1, {1, 2, 3}) == {3}
+    assert context.missing(MngAdmin1, [1, 2]) == set()
+    assert len(statements) == 2
+
+def test_context_discarded_when_transaction_ends(geo_db):
+    """Test para olvidar los IDs verificados al terminar la transacción"""
+    context = ValidationContext.for_session(geo_db)
+    context.exists(MngAdmin1, 1)
+    geo_db.commit()
+
+    assert ValidationContext.for_session(geo_db) is not context
+
+def test_context_without_session_info():
+    """Test para sesiones simuladas sin diccionario info"""
+    mock_db = create_autospec(Session, instance=True)
+    mock_db.query.return_value.filter.return_value.first.return_value = None
+
+    assert ValidationContext.for_session(mock_db) is not ValidationContext.for_session(mock_db)
+    assert not ValidationContext.for_session(mock_db).exists(MngAdmin1, 1)
+
+def test_bulk_create_checks_parent_once(geo_db, statements):
+    """Test para verificar el Admin1 padre una sola vez en una inserción masiva"""
+    MngAdmin2Service().bulk_create([
+        Admin2Create(admin_1_id=1, name=f"Municipio {i}", ext_id="") for i in range(5)
+    ], db=geo_db)
+
+    assert sum("mng_admin_1.name" not in statement for statement in statements) == 1
+    assert geo_db.query(MngAdmin2).count() == 5